@@ -0,0 +1,246 @@
+# Analysis and plots of real simulation runs
+#
+# The three report charts (docs/graphs) used to be drawn at import time of main.py from hardcoded numbers.
+# Here the numbers come from simulations run on demand, wear leveling is computed with NumPy straight from
+# the recorded per-disk counters, and the figures are written to files with the headless Agg backend.
+# matplotlib is only imported when a figure is drawn, so importing this module stays cheap.
+#
+#   collect_write_distribution  ->  per-disk writes for every layout and size (sweep.run_task)
+#   collect_reads               ->  disk reads of random reads with and without Hamming ECC
+#   wear_leveling_cov           ->  coefficient of variation (%) of the per-disk writes (calculate_wear_leveling
+#                                   for the old per-disk dicts)
+#   plot_*                      ->  one PNG each
+#
+# Run from SW_simulation/:
+#   python analysis.py --sizes 10 100 1000 10000 100000 --out-dir ../docs/graphs
+import argparse
+import os
+import random
+
+import numpy as np
+
+import sim_logging as log
+from raid_array import RaidArray, PARITY_LAYOUTS, ROUND_ROBIN, FIXED_PARITY
+from sweep import make_tasks, run_task
+
+SIZES = (10, 100, 1000, 10000, 100000)
+LAYOUT_NAMES = {ROUND_ROBIN: "Round Robin", FIXED_PARITY: "Fixed Parity"}
+WRITE_DISTRIBUTION_FILE = "Write Distribution.png"
+WEAR_LEVELING_FILE = "Wear Leveling.png"
+READS_FILE = "Read with and without ECC.png"
+
+
+def load_pyplot():
+    """
+    Imports matplotlib on first use, with the Agg backend: figures go to files, no GUI windows.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def wear_leveling_cov(disk_writes):
+    """
+    Wear leveling as the coefficient of variation of the per-disk writes (std / mean, in %).
+    Args:
+        disk_writes: write counts with the disks on the last axis, e.g. write_count_per_disk or
+            a (sizes, disks) array of them
+    Returns:
+        np.ndarray: CoV in % per row (0 where nothing was written)
+    """
+    writes = np.asarray(disk_writes, dtype=np.float64)
+    mean = writes.mean(axis=-1)
+    std = writes.std(axis=-1)
+    return np.divide(std, mean, out=np.zeros_like(mean), where=mean > 0) * 100
+
+def calculate_wear_leveling(disk_writes):
+    """
+    wear_leveling_cov for the report's {"Disk 0": [writes per size], ...} format.
+    Returns:
+        list: CoV in % per size
+    """
+    return wear_leveling_cov(np.array(list(disk_writes.values())).T).tolist()
+
+def collect_write_distribution(sizes=SIZES, layouts=PARITY_LAYOUTS, rewrite_ratio=0.25, seed=0):
+    """
+    Runs simulate_mixed_write_distribution for every layout and size.
+    Returns:
+        dict: layout -> (len(sizes), num_disks) array of writes per disk
+    """
+    results = {}
+    for task in make_tasks(sizes, layouts, [rewrite_ratio], 1, base_seed=seed):
+        results.setdefault(task["layout"], {})[task["size"]] = run_task(task)["writes_per_disk"]
+    return {layout: np.array([by_size[size] for size in sizes]) for layout, by_size in results.items()}
+
+def collect_reads(sizes=SIZES, seed=0):
+    """
+    Issues random reads to a fully written array, once with the Hamming ECC check of D0 and D1 alone and
+    once verifying every read against the whole stripe (what RAID 5 without ECC must do to detect errors).
+    Returns:
+        tuple: (reads without ECC, reads with ECC) disk reads per size, as arrays
+    """
+    reads = {False: [], True: []}
+    previous_level = log.set_level(log.QUIET)
+    try:
+        for verify_parity_on_read in (True, False):
+            for size in sizes:
+                rng = random.Random(seed)
+                array = RaidArray(rng=rng, verify_parity_on_read=verify_parity_on_read)
+                array.write_sys_is_ready = 1
+                array.read_sys_is_ready = 1
+                for address in range(array.capacity):
+                    array.add_write_request(address, rng.getrandbits(16))
+                while len(array.write_buffer) > 0:
+                    array.handle_write_request()
+                array.reset_write_counters()
+                for _ in range(size):
+                    array.add_read_request(rng.randrange(array.capacity))
+                    array.handle_read_request()
+                reads[not verify_parity_on_read].append(sum(array.read_count_per_disk))
+    finally:
+        log.set_level(previous_level)
+    return np.array(reads[False]), np.array(reads[True])
+
+def size_labels(sizes):
+    return [f"$10^{{{int(np.log10(size))}}}$" for size in sizes]
+
+def plot_write_distribution(sizes, writes_by_layout, path):
+    """
+    Grouped bars of the writes per disk, one plain and one hatched bar per disk for the two layouts.
+    """
+    plt = load_pyplot()
+    from matplotlib.patches import Patch
+
+    round_robin = writes_by_layout[ROUND_ROBIN]
+    fixed_parity = writes_by_layout[FIXED_PARITY]
+    num_disks = round_robin.shape[1]
+    colors = plt.get_cmap("tab10").colors
+    bar_width = 0.45 / num_disks
+    x = np.arange(len(sizes))
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    legend_patches = []
+    for disk in range(num_disks):
+        color = colors[disk % len(colors)]
+        ax.bar(x + disk * (bar_width * 2) - bar_width, round_robin[:, disk], bar_width,
+               color=color, edgecolor='black', linewidth=0.8)
+        ax.bar(x + disk * (bar_width * 2), fixed_parity[:, disk], bar_width,
+               color=color, hatch='//', edgecolor='black', linewidth=0.8)
+        legend_patches.append(Patch(facecolor=color, edgecolor='black', linewidth=0.8,
+                                    label=f'Disk {disk} (Round Robin)'))
+        legend_patches.append(Patch(facecolor=color, edgecolor='black', hatch='//', linewidth=0.8,
+                                    label=f'Disk {disk} (Fixed Parity)'))
+
+    ax.set_xticks(x + bar_width * (num_disks - 1) - bar_width / 2)
+    ax.set_xticklabels(size_labels(sizes), fontsize=11)
+    ax.yaxis.grid(True, which='both', linestyle='--', color='gray', alpha=0.5)
+    ax.set_title("Comparison of Write Distribution Between Round Robin and Fixed Parity in RAID-5",
+                 fontsize=14, fontweight='bold')
+    ax.set_xlabel("Simulation Size", fontsize=12)
+    ax.set_ylabel("Number of Writes (Log Scale)", fontsize=12)
+    ax.set_yscale('log')
+    ax.legend(handles=legend_patches, loc='upper left', fontsize=10)
+    fig.text(
+        0.5, -0.1,
+        ("In the traditional Fixed Parity RAID-5 system, the Parity disk experiences disproportionate wear because "
+         "every data update requires a corresponding Parity block update. In contrast, the Round Robin distribution "
+         "balances the writes across all disks, reducing wear on any single disk and extending overall system longevity."),
+        wrap=True, horizontalalignment='center', fontsize=10
+    )
+    save_figure(plt, fig, path)
+
+def plot_wear_leveling(sizes, cov_by_layout, path):
+    plt = load_pyplot()
+    x = np.arange(len(sizes))
+    bar_width = 0.35
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    ax.bar(x - bar_width / 2, cov_by_layout[ROUND_ROBIN], bar_width, color='#1f77b4', edgecolor='black',
+           label=LAYOUT_NAMES[ROUND_ROBIN])
+    ax.bar(x + bar_width / 2, cov_by_layout[FIXED_PARITY], bar_width, color='#ff7f0e', edgecolor='black',
+           label=LAYOUT_NAMES[FIXED_PARITY])
+    ax.set_xticks(x)
+    ax.set_xticklabels(size_labels(sizes), fontsize=11)
+    ax.set_title("Wear Leveling Comparison Between Round Robin and Fixed Parity in RAID-5",
+                 fontsize=14, fontweight='bold')
+    ax.set_xlabel("Simulation Size", fontsize=12)
+    ax.set_ylabel("Wear Leveling (Coefficient of Variation %)", fontsize=12)
+    ax.legend(loc='upper left', fontsize=10)
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.7)
+    fig.text(
+        0.5, -0.1,
+        ("Wear leveling measures the distribution of writes across disks. Lower percentage indicates more balanced writes, "
+         "while higher percentage indicates uneven write distribution. Round Robin aims to balance writes more effectively."),
+        wrap=True, horizontalalignment='center', fontsize=10
+    )
+    save_figure(plt, fig, path)
+
+def plot_reads(sizes, reads_without_ecc, reads_with_ecc, path):
+    plt = load_pyplot()
+    x = np.arange(len(sizes))
+    bar_width = 0.35
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    ax.bar(x - bar_width / 2, reads_without_ecc, bar_width, color='#1f77b4', edgecolor='black',
+           label='RAID 5 without Hamming ECC')
+    ax.bar(x + bar_width / 2, reads_with_ecc, bar_width, color='#ff7f0e', edgecolor='black',
+           label='RAID 5 with Hamming ECC')
+    ax.set_title("Comparison of Read Operations Between RAID 5 with and without Hamming ECC",
+                 fontsize=14, fontweight='bold')
+    ax.set_xlabel("Simulation Size", fontsize=12)
+    ax.set_ylabel("Number of Read Operations (Log Scale)", fontsize=12)
+    ax.set_yscale('log')
+    ax.set_xticks(x)
+    ax.set_xticklabels(size_labels(sizes), fontsize=11)
+    ax.legend(loc='upper left', fontsize=10)
+    fig.text(
+        0.5, -0.1,
+        ("In the traditional RAID 5 (Fixed Parity) system, each read operation requires reading all three blocks (D0, D1, and Parity) "
+         "to detect and correct errors. In contrast, RAID 5 with Hamming ECC only requires reading D0 and D1 for most operations, "
+         "reducing the overall number of read operations significantly."),
+        wrap=True, horizontalalignment='center', fontsize=10
+    )
+    save_figure(plt, fig, path)
+
+def save_figure(plt, fig, path):
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+    if log.level >= log.SUMMARY:
+        print(f"🖼️ Saved {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the report simulations and write their charts as PNG files.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--out-dir", default=".", help="directory for the PNG files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-plots", action="store_true", help="only print the numbers")
+    args = parser.parse_args(argv)
+    if any(size < 1 for size in args.sizes):
+        parser.error("sizes must be at least 1")
+
+    log.set_level(log.SUMMARY)
+    writes_by_layout = collect_write_distribution(args.sizes, seed=args.seed)
+    cov_by_layout = {layout: wear_leveling_cov(writes) for layout, writes in writes_by_layout.items()}
+    reads_without_ecc, reads_with_ecc = collect_reads(args.sizes, seed=args.seed)
+
+    print(f"\n{'size':>9} | {'layout':<13}| {'writes per disk':<40}| {'CoV':>7}")
+    print("-" * 76)
+    for i, size in enumerate(args.sizes):
+        for layout, writes in writes_by_layout.items():
+            print(f"{size:>9} | {LAYOUT_NAMES[layout]:<13}| {str(writes[i].tolist()):<40}| "
+                  f"{cov_by_layout[layout][i]:>6.2f}%")
+    print(f"\nDisk reads without ECC: {reads_without_ecc.tolist()}")
+    print(f"Disk reads with ECC:    {reads_with_ecc.tolist()}")
+
+    if args.no_plots:
+        return
+    os.makedirs(args.out_dir, exist_ok=True)
+    plot_write_distribution(args.sizes, writes_by_layout, os.path.join(args.out_dir, WRITE_DISTRIBUTION_FILE))
+    plot_wear_leveling(args.sizes, cov_by_layout, os.path.join(args.out_dir, WEAR_LEVELING_FILE))
+    plot_reads(args.sizes, reads_without_ecc, reads_with_ecc, os.path.join(args.out_dir, READS_FILE))
+
+
+if __name__ == "__main__":
+    main()
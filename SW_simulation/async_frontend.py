@@ -0,0 +1,205 @@
+# asyncio front end with independent read and write pipelines
+#
+# The hardware controller (rtl/controller.sv) has separate read and write engines behind one arbiter,
+# which write_sys_is_ready / read_sys_is_ready stand for in RaidArray. Here client coroutines submit
+# requests and get a future back; dedicated read and write worker tasks drain their own queues
+# concurrently. A per-stripe lock stands for the arbiter: each request holds the lock of its stripe for
+# service_time seconds to model the disk latency, so requests to the same stripe queue up while requests to
+# different stripes overlap, and the achieved concurrency can be measured.
+#
+# The front end owns the array's buffers: every request is pushed and handled in one synchronous step, which
+# the single event loop (and the GIL) never interleaves with another. The locks are not what keeps the array
+# consistent: they only serialize the modelled service_time sleeps, i.e. the timing, not the data accesses.
+# Reads resolve to None when the data was lost.
+#
+# Usage:
+#   async with AsyncFrontEnd(array, read_workers=2, write_workers=2, service_time=1e-4) as frontend:
+#       await frontend.write(3, 0xBEEF)
+#       data = await frontend.read(3)
+#   frontend.print_report()
+# Run from SW_simulation/:  python async_frontend.py  (8 random clients on a 5-disk array)
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import sim_logging as log
+from raid_array import RaidArray
+
+READ = "read"
+WRITE = "write"
+
+
+class AsyncFrontEnd:
+    """
+    Args:
+        array (RaidArray): the array behind the front end
+        read_workers (int): worker tasks draining the read queue
+        write_workers (int): worker tasks draining the write queue
+        service_time (float): seconds each request holds its stripe lock (0 = no modelled latency)
+    """
+
+    def __init__(self, array, read_workers=1, write_workers=1, service_time=0.0):
+        if read_workers < 1 or write_workers < 1:
+            raise ValueError("read_workers and write_workers must be at least 1.")
+        self.array = array
+        self.read_workers = read_workers
+        self.write_workers = write_workers
+        self.service_time = service_time
+        self.queues = {}
+        self.workers = []
+        self.stripe_locks = defaultdict(asyncio.Lock)  # Created on first use, only for the stripes touched
+
+        self.completed = {READ: 0, WRITE: 0}
+        self.in_flight = {READ: 0, WRITE: 0}
+        self.max_in_flight = 0
+        self.overlapped = {READ: 0, WRITE: 0}  # Requests started while the other pipeline was busy
+        self.lock_waits = 0  # Requests that found their stripe locked
+        self.lock_wait_time = 0.0
+        self.busy_time = 0.0  # Integral of the in-flight count over time
+        self.elapsed = 0.0
+        self.started_at = None
+        self.last_change = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self):
+        self.array.write_sys_is_ready = 1
+        self.array.read_sys_is_ready = 1
+        self.queues = {READ: asyncio.Queue(), WRITE: asyncio.Queue()}
+        self.workers = ([asyncio.create_task(self.worker(READ)) for _ in range(self.read_workers)]
+                        + [asyncio.create_task(self.worker(WRITE)) for _ in range(self.write_workers)])
+        self.started_at = self.last_change = time.perf_counter()
+
+    async def stop(self):
+        """
+        Waits for the queued requests and stops the workers.
+        """
+        for queue in self.queues.values():
+            await queue.join()
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.elapsed = time.perf_counter() - self.started_at
+
+    async def write(self, address, data):
+        """
+        Submits a write and waits until it is on the disks.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queues[WRITE].put_nowait((address, data, future))
+        return await future
+
+    async def read(self, address):
+        """
+        Submits a read and waits for it.
+        Returns:
+            int: the 16-bit word, or None if the data was lost
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queues[READ].put_nowait((address, None, future))
+        return await future
+
+    async def worker(self, kind):
+        queue = self.queues[kind]
+        other = WRITE if kind == READ else READ
+        array = self.array
+        while True:
+            address, data, future = await queue.get()
+            try:
+                lock = self.stripe_locks[array.locate(address)[0]]
+                if lock.locked():
+                    self.lock_waits += 1
+                wait_start = time.perf_counter()
+                async with lock:
+                    self.lock_wait_time += time.perf_counter() - wait_start
+                    self.enter(kind)
+                    if self.in_flight[other]:
+                        self.overlapped[kind] += 1
+                    try:
+                        if kind == WRITE:
+                            array.add_write_request(address, data)
+                            array.handle_write_request()
+                            result = None
+                        else:
+                            array.add_read_request(address)
+                            result = array.handle_read_request()
+                        if self.service_time:
+                            await asyncio.sleep(self.service_time)
+                    finally:
+                        self.leave(kind)
+                self.completed[kind] += 1
+                if not future.done():
+                    future.set_result(result)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            finally:
+                queue.task_done()
+
+    def enter(self, kind):
+        self.account()
+        self.in_flight[kind] += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight[READ] + self.in_flight[WRITE])
+
+    def leave(self, kind):
+        self.account()
+        self.in_flight[kind] -= 1
+
+    def account(self):
+        now = time.perf_counter()
+        self.busy_time += (self.in_flight[READ] + self.in_flight[WRITE]) * (now - self.last_change)
+        self.last_change = now
+
+    def concurrency(self):
+        """
+        Average number of requests in flight over the run.
+        """
+        return self.busy_time / self.elapsed if self.elapsed else 0.0
+
+    def print_report(self):
+        if log.level < log.SUMMARY:
+            return
+        total = self.completed[READ] + self.completed[WRITE]
+        print(f"\n⚙️ Async Front End Summary ({self.read_workers} read / {self.write_workers} write workers):")
+        print(f"Requests completed: {total} ({self.completed[READ]} reads, {self.completed[WRITE]} writes) "
+              f"in {self.elapsed * 1e3:.2f} ms")
+        print(f"Concurrency: {self.concurrency():.2f} average, {self.max_in_flight} max in flight")
+        print(f"Overlapped with the other pipeline: {self.overlapped[READ]} reads, {self.overlapped[WRITE]} writes")
+        print(f"Stripe lock waits: {self.lock_waits} ({self.lock_wait_time * 1e3:.2f} ms total)")
+
+
+async def run_clients(frontend, num_clients=8, requests_per_client=100, read_ratio=0.5, rng=None):
+    """
+    Random clients, each issuing its requests one after the other.
+    """
+    rng = rng or random.Random()
+    max_address = frontend.array.capacity - 1
+
+    async def client():
+        for _ in range(requests_per_client):
+            address = rng.randint(0, max_address)
+            if rng.random() < read_ratio:
+                await frontend.read(address)
+            else:
+                await frontend.write(address, rng.randint(0, 0xFFFF))
+
+    await asyncio.gather(*(client() for _ in range(num_clients)))
+
+
+async def main():
+    log.set_level(log.SUMMARY)
+    array = RaidArray(num_disks=5, num_stripes=64, rng=random.Random(0))
+    async with AsyncFrontEnd(array, read_workers=4, write_workers=4, service_time=1e-4) as frontend:
+        await run_clients(frontend, rng=random.Random(0))
+    frontend.print_report()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
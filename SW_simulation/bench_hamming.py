@@ -0,0 +1,72 @@
+# Microbenchmark: per-bit Hamming (12,8) functions vs. the lookup tables
+#
+# Run from SW_simulation/:  python bench_hamming.py
+import timeit
+
+from hamming import (hamming_encode_bitwise, Hamming_syndrome_bitwise, Hamming_fix_bitwise, Hamming_decode,
+                     hamming_encode, Hamming_check, Hamming_fix, Hamming_lookup)
+
+DATA = list(range(256))
+CODEWORDS = list(range(4096))
+
+
+def read_path_bitwise(codewords):
+    # check, fix (recomputing the syndrome) and decode, the way the read path used to do it
+    for codeword in codewords:
+        if Hamming_syndrome_bitwise(codeword) != 0:
+            codeword = Hamming_fix_bitwise(codeword)
+        Hamming_decode(codeword)
+
+def read_path_table(codewords):
+    for codeword in codewords:
+        Hamming_lookup(codeword)
+
+CASES = [
+    ("encode", lambda: [hamming_encode_bitwise(d) for d in DATA], lambda: [hamming_encode(d) for d in DATA], len(DATA)),
+    ("check", lambda: [Hamming_syndrome_bitwise(c) for c in CODEWORDS], lambda: [Hamming_check(c) for c in CODEWORDS],
+     len(CODEWORDS)),
+    ("fix", lambda: [Hamming_fix_bitwise(c) for c in CODEWORDS], lambda: [Hamming_fix(c) for c in CODEWORDS],
+     len(CODEWORDS)),
+    ("check+fix+decode", lambda: read_path_bitwise(CODEWORDS), lambda: read_path_table(CODEWORDS), len(CODEWORDS)),
+]
+
+
+def run_batch(num_words=1_000_000, repeat=5):
+    """
+    Throughput of the NumPy batch API in millions of words per second.
+    """
+    try:
+        import numpy as np
+        from hamming_batch import encode_batch, check_batch, fix_batch, read_batch
+    except ImportError:
+        print("NumPy not installed, skipping the batch benchmark.")
+        return
+
+    rng = np.random.default_rng(0)
+    words = rng.integers(0, 1 << 16, num_words, dtype=np.uint16)
+    D0_enc, D1_enc, P = encode_batch(words)
+
+    batch_cases = [
+        ("encode_batch", lambda: encode_batch(words)),
+        ("check_batch", lambda: check_batch(D0_enc)),
+        ("fix_batch", lambda: fix_batch(D0_enc)),
+        ("read_batch", lambda: read_batch(D0_enc, D1_enc)),
+    ]
+    print(f"\n{'batch operation':<18}| {'Mwords/s':>10}  ({num_words} words)")
+    print("-" * 42)
+    for name, case in batch_cases:
+        t = min(timeit.repeat(case, repeat=repeat, number=1))
+        print(f"{name:<18}| {num_words / t / 1e6:>10.1f}")
+
+def run(repeat=5, number=50):
+    print(f"{'operation':<18}| {'per-bit ns/op':>14} | {'table ns/op':>12} | {'speedup':>7}")
+    print("-" * 62)
+    for name, bitwise, table, ops in CASES:
+        t_bitwise = min(timeit.repeat(bitwise, repeat=repeat, number=number)) / (number * ops) * 1e9
+        t_table = min(timeit.repeat(table, repeat=repeat, number=number)) / (number * ops) * 1e9
+        print(f"{name:<18}| {t_bitwise:>14.1f} | {t_table:>12.1f} | {t_bitwise / t_table:>6.2f}x")
+
+
+if __name__ == "__main__":
+    run()
+    run_batch()
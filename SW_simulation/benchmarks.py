@@ -0,0 +1,212 @@
+# Benchmark suite for the hot paths, with stored JSON baselines
+#
+# Every benchmark runs at several sizes (items per timed call) and reports the best time per item over
+# `repeat` runs. Results can be saved as a baseline and later runs compared against it: a result slower
+# than the baseline by more than the threshold is a regression and makes the run exit with status 1.
+# Only the standard library is needed (NumPy, when installed, speeds up RAID5_recovery).
+#
+# Run from SW_simulation/:
+#   python benchmarks.py --save baseline.json                 # record a baseline
+#   python benchmarks.py --compare baseline.json              # fail on a >25% regression
+#   python benchmarks.py --quick --only hamming_encode xor_blocks --compare baseline.json --threshold 0.5
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+import sim_logging as log
+import raid_array
+from raid_array import RaidArray, xor_blocks, WRITE_BUFFER_SIZE
+from hamming import hamming_encode, Hamming_check, Hamming_fix, Hamming_decode, BLOCK_MASK
+
+SIZES = (10, 1000, 100_000, 1_000_000)
+QUICK_SIZES = (10, 1000)
+THRESHOLD = 0.25  # Allowed slowdown before a result counts as a regression (0.25 = 25%)
+MIN_ITEMS = 100_000  # Small sizes are called repeatedly until each timing covers at least this many items
+
+
+def random_bytes(size, rng):
+    return [rng.randint(0, 0xFF) for _ in range(size)]
+
+def random_codewords(size, rng):
+    return [rng.randint(0, BLOCK_MASK) for _ in range(size)]
+
+# Each setup function prepares its inputs outside the timing and returns the function to time.
+
+def setup_hamming_encode(size, rng):
+    data = random_bytes(size, rng)
+    return lambda: [hamming_encode(d) for d in data]
+
+def setup_hamming_check(size, rng):
+    codewords = random_codewords(size, rng)
+    return lambda: [Hamming_check(c) for c in codewords]
+
+def setup_hamming_fix(size, rng):
+    codewords = random_codewords(size, rng)
+    return lambda: [Hamming_fix(c) for c in codewords]
+
+def setup_hamming_decode(size, rng):
+    codewords = random_codewords(size, rng)
+    return lambda: [Hamming_decode(c) for c in codewords]
+
+def setup_xor_blocks(size, rng):
+    pairs = list(zip(random_codewords(size, rng), random_codewords(size, rng)))
+    return lambda: [xor_blocks(a, b) for a, b in pairs]
+
+def setup_handle_write_request(size, rng):
+    array = RaidArray(rng=random.Random(0))
+    array.write_sys_is_ready = 1
+    requests = [(rng.randint(0, array.capacity - 1), rng.randint(0, 0xFFFF)) for _ in range(size)]
+
+    def run():
+        for address, data in requests:
+            array.add_write_request(address, data)
+            array.handle_write_request()
+    return run
+
+def setup_handle_read_request(size, rng):
+    array = RaidArray(rng=random.Random(0))
+    array.write_sys_is_ready = 1
+    for address in range(array.capacity):
+        array.add_write_request(address, rng.randint(0, 0xFFFF))
+        array.handle_write_request()
+    addresses = [rng.randint(0, array.capacity - 1) for _ in range(size)]
+
+    def run():
+        for address in addresses:
+            array.add_read_request(address)
+            array.handle_read_request()
+    return run
+
+def setup_raid5_recovery(size, rng):
+    # size = stripes rebuilt per call
+    array = RaidArray(num_stripes=size, rng=random.Random(0))
+    for disk in array.disks:
+        for stripe_num in range(size):
+            disk[stripe_num] = rng.randint(0, BLOCK_MASK)
+
+    def run():
+        array.disk_status[0] = 0
+        array.RAID5_recovery()
+    return run
+
+def setup_simulate_mixed_write_distribution(size, rng):
+    array = RaidArray(write_buffer_size=max(size, WRITE_BUFFER_SIZE), rng=random.Random(0))
+    array.write_sys_is_ready = 1
+    return lambda: array.simulate_mixed_write_distribution(size, log_level=log.QUIET)
+
+BENCHMARKS = {
+    "hamming_encode": setup_hamming_encode,
+    "Hamming_check": setup_hamming_check,
+    "Hamming_fix": setup_hamming_fix,
+    "Hamming_decode": setup_hamming_decode,
+    "xor_blocks": setup_xor_blocks,
+    "handle_write_request": setup_handle_write_request,
+    "handle_read_request": setup_handle_read_request,
+    "RAID5_recovery": setup_raid5_recovery,
+    "simulate_mixed_write_distribution": setup_simulate_mixed_write_distribution,
+}
+
+
+def measure(setup, size, repeat):
+    """
+    Returns:
+        float: best time per item in nanoseconds
+    """
+    run = setup(size, random.Random(size))
+    number = max(1, MIN_ITEMS // size)
+    best = min(timeit.repeat(run, repeat=repeat, number=number))
+    return best / (number * size) * 1e9
+
+def run_benchmarks(names, sizes, repeat):
+    """
+    Returns:
+        dict: benchmark name -> {str(size): ns per item}
+    """
+    previous_level = log.set_level(log.QUIET)
+    try:
+        results = {}
+        for name in names:
+            results[name] = {}
+            for size in sizes:
+                results[name][str(size)] = measure(BENCHMARKS[name], size, repeat)
+                print(f"{name:<34}| {size:>9} | {results[name][str(size)]:>12.1f} ns/item", flush=True)
+        return results
+    finally:
+        log.set_level(previous_level)
+
+def machine_info():
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system(),
+            "numpy": raid_array.np is not None}
+
+def find_regressions(results, baseline, threshold):
+    """
+    Returns:
+        list: (name, size, ns per item, baseline ns per item) for every result slower than the
+        baseline by more than threshold. Benchmarks or sizes missing from the baseline are not compared.
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, value in by_size.items():
+            old = baseline.get(name, {}).get(size)
+            if old is not None and value > old * (1 + threshold):
+                regressions.append((name, size, value, old))
+    return regressions
+
+def print_comparison(results, baseline):
+    print(f"\n{'benchmark':<34}| {'size':>9} | {'ns/item':>10} | {'baseline':>10} | {'change':>8}")
+    print("-" * 84)
+    for name, by_size in results.items():
+        for size, value in by_size.items():
+            old = baseline.get(name, {}).get(size)
+            if old is None:
+                print(f"{name:<34}| {size:>9} | {value:>10.1f} | {'-':>10} | {'-':>8}")
+            else:
+                print(f"{name:<34}| {size:>9} | {value:>10.1f} | {old:>10.1f} | {(value / old - 1) * 100:>+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulator hot paths against a stored baseline.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, help=f"items per timed call (default: {list(SIZES)})")
+    parser.add_argument("--quick", action="store_true", help=f"small sizes only: {list(QUICK_SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per result, the best one is kept")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"allowed slowdown as a fraction (default: {THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    if any(size < 1 for size in sizes):
+        parser.error("sizes must be at least 1")
+
+    results = run_benchmarks(names, sizes, args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"machine": machine_info(), "results": results}, file, indent=1)
+        print(f"\n💾 Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            saved = json.load(file)
+        if saved.get("machine") != machine_info():
+            print(f"⚠️ Baseline recorded on a different setup: {saved.get('machine')}")
+        print_comparison(results, saved["results"])
+        regressions = find_regressions(results, saved["results"], args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions beyond {args.threshold * 100:g}%:")
+            for name, size, value, old in regressions:
+                print(f"  {name} at size {size}: {value:.1f} ns/item vs {old:.1f} ns/item")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold * 100:g}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# Discrete-event timing model: IOPS, latency percentiles and disk utilization
+#
+# RaidArray has no notion of time, it only counts disk reads and writes. The EventSimulator puts a clock
+# around it: requests arrive (Poisson, evenly spaced or from a closed loop of clients), up to queue_depth
+# are in service at once and the rest wait in arrival order. A dispatched request runs through the
+# array's own read/write logic right away, and the per-disk reads and writes it did are then timed:
+#   1. its disk reads, on each disk after the work already queued there (FIFO, one I/O at a time per disk)
+#   2. ECC compute: ecc_latency per block read or written (check/fix on reads, encode on writes)
+#   3. its disk writes, again queued per disk
+# The request completes when its last I/O does. Disk failures and RAID5_recovery() can be scheduled too;
+# the rebuild occupies every disk for its reads and writes, so the requests behind it see the delay.
+#
+# Events live in one heapq of (time, kind, sequence, payload) tuples, O(log n) per event. Every request is an
+# arrival and a completion event: python event_sim.py 500000 processes 10^6 events at ~90-110k events/s
+# (about 10 s, CPython 3.11, x86-64); the report prints the rate of each run.
+#
+# Usage:
+#   sim = EventSimulator(array, read_latency=80e-6, write_latency=200e-6, arrival_rate=20000)
+#   sim.run(100000, fail_disk=1, fail_at=1.0, recover_at=2.0)
+#   sim.print_report()
+# Run from SW_simulation/:  python event_sim.py [num_requests]
+import heapq
+import math
+import random
+import sys
+import time
+from collections import deque
+
+import sim_logging as log
+from raid_array import RaidArray
+
+# Arrival processes
+POISSON = "poisson"  # Exponential inter-arrival times at arrival_rate
+UNIFORM = "uniform"  # One request every 1 / arrival_rate seconds
+CLOSED = "closed"  # queue_depth clients, each issuing its next request when the previous one completes
+ARRIVAL_PROCESSES = (POISSON, UNIFORM, CLOSED)
+
+# Event kinds (also the tie-break order of simultaneous events)
+COMPLETION = 0
+ARRIVAL = 1
+FAILURE = 2
+RECOVERY = 3
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class EventSimulator:
+    """
+    Args:
+        array (RaidArray): the array whose logic serves the requests
+        read_latency (float): seconds per block read on a disk
+        write_latency (float): seconds per block write on a disk
+        ecc_latency (float): seconds of ECC compute per block read or written
+        queue_depth (int): requests in service at once (clients, for the closed arrival process)
+        arrival (str): one of ARRIVAL_PROCESSES
+        arrival_rate (float): requests per second (open arrival processes)
+        read_ratio (float): fraction of the requests that are reads
+        rng (random.Random): source of arrivals, addresses and data
+    """
+    __slots__ = ("array", "read_latency", "write_latency", "ecc_latency", "queue_depth", "arrival", "arrival_rate",
+                 "read_ratio", "rng", "now", "events", "sequence", "backlog", "in_flight", "issued", "disk_free",
+                 "disk_busy", "read_latencies", "write_latencies", "events_processed", "wall_time", "makespan",
+                 "recovery_time")
+
+    def __init__(self, array, read_latency=80e-6, write_latency=200e-6, ecc_latency=1e-6, queue_depth=32,
+                 arrival=POISSON, arrival_rate=10000.0, read_ratio=0.5, rng=None):
+        if arrival not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Invalid arrival process: {arrival!r}. Use one of {', '.join(ARRIVAL_PROCESSES)}.")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1.")
+        if arrival != CLOSED and arrival_rate <= 0:
+            raise ValueError("arrival_rate must be positive.")
+        self.array = array
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.ecc_latency = ecc_latency
+        self.queue_depth = queue_depth
+        self.arrival = arrival
+        self.arrival_rate = arrival_rate
+        self.read_ratio = read_ratio
+        self.rng = rng if rng is not None else random.Random()
+        self.reset()
+
+    def reset(self):
+        self.now = 0.0
+        self.events = []
+        self.sequence = 0
+        self.backlog = deque()  # Arrived requests waiting for a free queue slot
+        self.in_flight = 0
+        self.issued = 0
+        self.disk_free = [0.0] * self.array.num_disks  # Time at which each disk finishes its queued I/O
+        self.disk_busy = [0.0] * self.array.num_disks
+        self.read_latencies = []
+        self.write_latencies = []
+        self.events_processed = 0
+        self.wall_time = 0.0
+        self.makespan = 0.0
+        self.recovery_time = None
+
+    def schedule(self, at, kind, payload=None):
+        self.sequence += 1
+        heapq.heappush(self.events, (at, kind, self.sequence, payload))
+
+    def new_request(self):
+        """
+        Returns:
+            tuple: (is_read, address, data, arrival time)
+        """
+        rng = self.rng
+        self.issued += 1
+        return (rng.random() < self.read_ratio, rng.randrange(self.array.capacity), rng.getrandbits(16), self.now)
+
+    def run(self, num_requests, fail_disk=None, fail_at=None, recover_at=None):
+        """
+        Simulates num_requests requests, optionally failing a disk at fail_at and running RAID5_recovery()
+        at recover_at (simulated seconds).
+        """
+        self.reset()
+        array = self.array
+        array.write_sys_is_ready = 1
+        array.read_sys_is_ready = 1
+        if fail_disk is not None:
+            self.schedule(fail_at or 0.0, FAILURE, fail_disk)
+            if recover_at is not None:
+                self.schedule(recover_at, RECOVERY)
+
+        if self.arrival == CLOSED:
+            for _ in range(min(self.queue_depth, num_requests)):
+                self.schedule(0.0, ARRIVAL)
+        elif num_requests:
+            self.schedule(0.0, ARRIVAL)
+
+        start = time.perf_counter()
+        events = self.events
+        heappop = heapq.heappop
+        while events:
+            self.now, kind, _, payload = heappop(events)
+            self.events_processed += 1
+            if kind == COMPLETION:
+                self.complete(payload)
+                if self.backlog:
+                    self.dispatch(self.backlog.popleft())
+                elif self.arrival == CLOSED and self.issued < num_requests:
+                    self.dispatch(self.new_request())
+            elif kind == ARRIVAL:
+                request = self.new_request()
+                if self.in_flight < self.queue_depth:
+                    self.dispatch(request)
+                else:
+                    self.backlog.append(request)
+                if self.arrival != CLOSED and self.issued < num_requests:
+                    if self.arrival == POISSON:
+                        gap = self.rng.expovariate(self.arrival_rate)
+                    else:
+                        gap = 1.0 / self.arrival_rate
+                    self.schedule(self.now + gap, ARRIVAL)
+            elif kind == FAILURE:
+                array.disk_status[payload] = 0
+                array.storage.reset_disk(payload)
+                array.read_cache.clear()
+            else:
+                self.recover()
+        self.wall_time = time.perf_counter() - start
+        self.makespan = self.now
+        return self.results()
+
+    def dispatch(self, request):
+        is_read, address, data, _ = request
+        array = self.array
+        reads_before = array.read_count_per_disk[:]
+        writes_before = array.write_count_per_disk[:]
+        if is_read:
+            array.add_read_request(address)
+            array.handle_read_request()
+        else:
+            array.add_write_request(address, data)
+            array.handle_write_request()
+        reads = [after - before for after, before in zip(array.read_count_per_disk, reads_before)]
+        writes = [after - before for after, before in zip(array.write_count_per_disk, writes_before)]
+        self.in_flight += 1
+        self.schedule(self.occupy_disks(reads, writes), COMPLETION, request)
+
+    def occupy_disks(self, reads, writes):
+        """
+        Queues the reads, then the writes, on their disks.
+        Returns:
+            float: the time the last of them completes
+        """
+        done = self.now
+        for disk, count in enumerate(reads):
+            if count:
+                busy = count * self.read_latency
+                end = max(self.now, self.disk_free[disk]) + busy
+                self.disk_free[disk] = end
+                self.disk_busy[disk] += busy
+                done = max(done, end)
+        done += (sum(reads) + sum(writes)) * self.ecc_latency
+        write_start = done
+        for disk, count in enumerate(writes):
+            if count:
+                busy = count * self.write_latency
+                end = max(write_start, self.disk_free[disk]) + busy
+                self.disk_free[disk] = end
+                self.disk_busy[disk] += busy
+                done = max(done, end)
+        return done
+
+    def complete(self, request):
+        self.in_flight -= 1
+        latency = self.now - request[3]
+        if request[0]:
+            self.read_latencies.append(latency)
+        else:
+            self.write_latencies.append(latency)
+
+    def recover(self):
+        array = self.array
+        failed_disks = [i for i, status in enumerate(array.disk_status) if status == 0]
+        reads_before = array.read_count_per_disk[:]
+        array.RAID5_recovery()
+        if len(failed_disks) != 1 or array.disk_status[failed_disks[0]] == 0:
+            return
+        reads = [after - before for after, before in zip(array.read_count_per_disk, reads_before)]
+        writes = [0] * array.num_disks
+        writes[failed_disks[0]] = array.num_stripes  # RAID5_recovery writes the disk outside write_block
+        self.recovery_time = self.occupy_disks(reads, writes) - self.now
+
+    def results(self):
+        """
+        Returns:
+            dict: IOPS, latency percentiles (seconds), per-disk utilization and event loop speed
+        """
+        latencies = sorted(self.read_latencies + self.write_latencies)
+        read_latencies = sorted(self.read_latencies)
+        write_latencies = sorted(self.write_latencies)
+        makespan = self.makespan
+        return {
+            "requests": len(latencies),
+            "makespan": makespan,
+            "iops": len(latencies) / makespan if makespan else 0.0,
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "read_p99": percentile(read_latencies, 0.99),
+            "write_p99": percentile(write_latencies, 0.99),
+            "utilization": [busy / makespan if makespan else 0.0 for busy in self.disk_busy],
+            "recovery_time": self.recovery_time,
+            "events": self.events_processed,
+            "events_per_second": self.events_processed / self.wall_time if self.wall_time else 0.0,
+        }
+
+    def print_report(self):
+        if log.level < log.SUMMARY:
+            return
+        results = self.results()
+        print(f"\n⏱️ Timing Model Summary ({self.arrival} arrivals, queue depth {self.queue_depth}):")
+        print(f"Requests: {results['requests']} in {results['makespan'] * 1e3:.2f} ms simulated, "
+              f"{results['iops']:,.0f} IOPS")
+        print(f"Latency: mean {results['mean'] * 1e6:.1f} µs, p50 {results['p50'] * 1e6:.1f} µs, "
+              f"p99 {results['p99'] * 1e6:.1f} µs, p999 {results['p999'] * 1e6:.1f} µs")
+        print(f"p99 by type: reads {results['read_p99'] * 1e6:.1f} µs, writes {results['write_p99'] * 1e6:.1f} µs")
+        for disk, utilization in enumerate(results["utilization"]):
+            print(f"Disk {disk}: {utilization * 100:.1f}% utilized")
+        if results["recovery_time"] is not None:
+            print(f"Recovery: {results['recovery_time'] * 1e3:.2f} ms of disk time")
+        print(f"Event loop: {results['events']} events at {results['events_per_second']:,.0f} events/s")
+
+
+def main():
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    log.set_level(log.QUIET)
+    array = RaidArray(num_disks=5, num_stripes=4096, rng=random.Random(0))
+    sim = EventSimulator(array, arrival_rate=4000, rng=random.Random(0))
+    duration = num_requests / sim.arrival_rate
+    sim.run(num_requests, fail_disk=2, fail_at=duration / 3, recover_at=2 * duration / 3)
+    log.set_level(log.SUMMARY)
+    sim.print_report()
+
+
+if __name__ == "__main__":
+    main()
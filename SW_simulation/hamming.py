@@ -0,0 +1,115 @@
+# Hamming (12,8) ECC on packed 12-bit codewords
+#
+# Bit i of the hardware bit list (index 0 = MSB, Hamming position i + 1) is bit (11 - i) of the int.
+# The per-bit functions below are the reference implementation; the lookup tables are built from them
+# once at import, and the public functions used by the simulator are plain table lookups.
+
+BLOCK_SIZE = 12  # Size of each block in 12 bits
+BLOCK_MASK = (1 << BLOCK_SIZE) - 1  # All 12 bits of a packed codeword
+
+# Parity coverage masks over the packed codeword (positions 1..12 of the Hamming code map to bits 11..0)
+P1_MASK = 0b101010101010  # positions 1, 3, 5, 7, 9, 11
+P2_MASK = 0b011001100110  # positions 2, 3, 6, 7, 10, 11
+P4_MASK = 0b000111100001  # positions 4, 5, 6, 7, 12
+P8_MASK = 0b000000011111  # positions 8, 9, 10, 11, 12
+
+NO_ERROR = "No Error"
+SBE = "SBE"
+DBE = "DBE"  # Syndromes 13..15 name no bit: a multi-bit error, detected but not correctable
+
+
+def block_to_bits(block):
+    """
+    Debug view of a packed codeword as a list of 12 bits (index 0 = MSB).
+    """
+    return [(block >> (BLOCK_SIZE - 1 - i)) & 1 for i in range(BLOCK_SIZE)]
+
+def bits_to_block(bits):
+    """
+    Packs a list of 12 bits (index 0 = MSB) back into a codeword int.
+    """
+    block = 0
+    for bit in bits:
+        block = (block << 1) | bit
+    return block
+
+# Reference (per-bit) implementation
+
+def hamming_encode_bitwise(data):
+    # Place the data bits at positions 3, 5, 6, 7, 9, 10, 11, 12 (bits 9, 7, 6, 5, 3, 2, 1, 0)
+    encoded = ((data >> 7) & 1) << 9 | ((data >> 4) & 0x7) << 5 | (data & 0xF)
+
+    encoded |= ((encoded & P1_MASK).bit_count() & 1) << 11
+    encoded |= ((encoded & P2_MASK).bit_count() & 1) << 10
+    encoded |= ((encoded & P4_MASK).bit_count() & 1) << 8
+    encoded |= ((encoded & P8_MASK).bit_count() & 1) << 4
+
+    return encoded
+
+def Hamming_syndrome_bitwise(encoded_block):
+    # Calculate parity bits
+    P1 = (encoded_block & P1_MASK).bit_count() & 1
+    P2 = (encoded_block & P2_MASK).bit_count() & 1
+    P4 = (encoded_block & P4_MASK).bit_count() & 1
+    P8 = (encoded_block & P8_MASK).bit_count() & 1
+
+    # Calculate the syndrome
+    return (P1 * 1) + (P2 * 2) + (P4 * 4) + (P8 * 8)
+
+def Hamming_fix_bitwise(encoded_block):
+    S = Hamming_syndrome_bitwise(encoded_block)
+
+    # Syndrome S points at position S (1-based), which is bit (12 - S) of the packed codeword.
+    # Syndromes 13..15 do not name a bit (multi-bit error), the block is returned unchanged.
+    if 0 < S <= BLOCK_SIZE:
+        encoded_block ^= 1 << (BLOCK_SIZE - S)
+
+    return encoded_block
+
+def Hamming_decode(encoded_block):
+    # Extract original 8 bits (positions: 2, 4, 5, 6, 8, 9, 10, 11 of the bit list)
+    return ((encoded_block >> 9) & 1) << 7 | ((encoded_block >> 5) & 0x7) << 4 | (encoded_block & 0xF)
+
+# Lookup tables, built once at import
+
+def build_tables():
+    """
+    Builds the encode table (256 entries, data byte -> codeword), the syndrome table (4096 entries)
+    and the decode table (4096 entries, codeword -> (status, corrected codeword, decoded byte)).
+    A DBE codeword is left as it is: its decoded byte is not the data.
+    """
+    encode_table = tuple(hamming_encode_bitwise(data) for data in range(256))
+    syndrome_table = bytes(Hamming_syndrome_bitwise(codeword) for codeword in range(1 << BLOCK_SIZE))
+
+    decode_table = []
+    for codeword in range(1 << BLOCK_SIZE):
+        corrected = Hamming_fix_bitwise(codeword)
+        syndrome = syndrome_table[codeword]
+        status = NO_ERROR if syndrome == 0 else (SBE if syndrome <= BLOCK_SIZE else DBE)
+        decode_table.append((status, corrected, Hamming_decode(corrected)))
+
+    return encode_table, syndrome_table, tuple(decode_table)
+
+ENCODE_TABLE, SYNDROME_TABLE, DECODE_TABLE = build_tables()
+
+# Table-driven API used by the simulator
+
+def hamming_encode(data):
+    return ENCODE_TABLE[data]
+
+def Hamming_syndrome(encoded_block):
+    return SYNDROME_TABLE[encoded_block]
+
+def Hamming_check(encoded_block):
+    return DECODE_TABLE[encoded_block][0]
+
+def Hamming_fix(encoded_block):
+    return DECODE_TABLE[encoded_block][1]
+
+def Hamming_lookup(encoded_block):
+    """
+    Check, fix and decode in one lookup.
+    Returns:
+        tuple: (status, corrected codeword, decoded byte)
+    """
+    return DECODE_TABLE[encoded_block]
@@ -0,0 +1,76 @@
+# Vectorized Hamming (12,8) + RAID 5 parity for NumPy arrays of 16-bit words
+#
+# Same bit layout as hamming.py: every function indexes NumPy copies of the scalar lookup tables,
+# so the results are bit-exact with hamming_encode / Hamming_check / Hamming_fix / Hamming_decode.
+# Like the scalar table lookups, they reject values that do not fit (ValueError instead of IndexError):
+# words above 16 bits, codewords above BLOCK_MASK. decode_batch, like Hamming_decode, only extracts the data bits.
+import numpy as np
+
+from hamming import BLOCK_MASK, ENCODE_TABLE, SYNDROME_TABLE, DECODE_TABLE, Hamming_decode
+
+ENCODE = np.array(ENCODE_TABLE, dtype=np.uint16)  # data byte -> codeword
+SYNDROME = np.frombuffer(SYNDROME_TABLE, dtype=np.uint8)  # codeword -> syndrome
+CORRECTED = np.array([entry[1] for entry in DECODE_TABLE], dtype=np.uint16)  # codeword -> corrected codeword
+DECODED = np.array([entry[2] for entry in DECODE_TABLE], dtype=np.uint8)  # codeword -> decoded byte (after fix)
+RAW_DECODED = np.array([Hamming_decode(c) for c in range(BLOCK_MASK + 1)], dtype=np.uint8)  # no correction
+
+
+def as_codewords(codewords):
+    """
+    Returns the codewords as a uint16 array.
+    Raises:
+        ValueError: if a codeword has bits set above BLOCK_MASK
+    """
+    codewords = np.asarray(codewords)
+    if ((codewords < 0) | (codewords > BLOCK_MASK)).any():
+        raise ValueError(f"Codewords must fit in 12 bits (0..{BLOCK_MASK}).")
+    return codewords.astype(np.uint16, copy=False)
+
+def encode_batch(words):
+    """
+    Encodes 16-bit words into their RAID 5 stripe blocks.
+    Args:
+        words (np.ndarray): uint16 words, upper byte -> D0, lower byte -> D1
+    Returns:
+        tuple: (D0_enc, D1_enc, P) uint16 codeword arrays, P = D0_enc ^ D1_enc
+    """
+    words = np.asarray(words)
+    if words.dtype != np.uint16:
+        if ((words < 0) | (words > 0xFFFF)).any():
+            raise ValueError("Words must fit in 16 bits (0..65535).")
+        words = words.astype(np.uint16)
+    D0_enc = ENCODE[words >> 8]
+    D1_enc = ENCODE[words & 0xFF]
+    return D0_enc, D1_enc, D0_enc ^ D1_enc
+
+def check_batch(codewords):
+    """
+    Returns the uint8 syndrome of every codeword (0 = No Error, above BLOCK_SIZE = DBE, uncorrectable).
+    """
+    return SYNDROME[as_codewords(codewords)]
+
+def fix_batch(codewords):
+    """
+    Corrects single-bit errors (DBE codewords, syndrome above BLOCK_SIZE, are returned unchanged).
+    Returns:
+        tuple: (corrected uint16 codewords, uint8 syndromes before correction)
+    """
+    codewords = as_codewords(codewords)
+    return CORRECTED[codewords], SYNDROME[codewords]
+
+def decode_batch(codewords):
+    """
+    Extracts the 8 data bits of every codeword as stored (like Hamming_decode, no correction).
+    """
+    return RAW_DECODED[np.asarray(codewords, dtype=np.uint16) & BLOCK_MASK]
+
+def read_batch(D0_enc, D1_enc):
+    """
+    The read path for whole arrays: check, fix and decode D0/D1 and rebuild the 16-bit words.
+    Returns:
+        tuple: (uint16 words, D0 syndromes, D1 syndromes)
+    """
+    D0_enc = as_codewords(D0_enc)
+    D1_enc = as_codewords(D1_enc)
+    words = (DECODED[D0_enc].astype(np.uint16) << 8) | DECODED[D1_enc]
+    return words, SYNDROME[D0_enc], SYNDROME[D1_enc]
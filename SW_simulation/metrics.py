@@ -0,0 +1,148 @@
+# Metrics registry: I/O and ECC event counters per disk and per stripe, and request timings
+#
+# Every RaidArray owns one registry (array.metrics). Events are counted per disk, and per stripe too when
+# the array is created with per_stripe_metrics=True (one array('I') per event, allocated on first use).
+# The array's own read_count_per_disk and write_count_per_disk lists ARE the registry's disk_read and
+# disk_write rows, so the hot paths keep their plain list increments and the registry costs nothing there.
+# Per stripe, disk writes come from the storage's per-block write counters and disk reads from stripe_reads,
+# an array('I') the array bumps next to read_count_per_disk (None without per_stripe, so the check is all it costs).
+#
+# Usage:
+#   before = array.metrics.snapshot()
+#   ... run the workload ...
+#   delta = MetricsRegistry.delta(array.metrics.snapshot(), before)
+#   MetricsRegistry.to_json(delta, "run.json"); MetricsRegistry.to_csv(delta, "run.csv")
+import csv
+import json
+from array import array
+
+# Events, all counted per disk
+DISK_READ = "disk_read"  # Block read from a disk
+DISK_WRITE = "disk_write"  # Block written to a disk (data or parity)
+PARITY_WRITE = "parity_write"  # The parity part of disk_write
+ECC_CORRECTION = "ecc_correction"  # Single-bit error corrected and written back
+SKIPPED_WRITE = "skipped_write"  # Data block write skipped because the block already held the data
+DEGRADED_READ = "degraded_read"  # Read served while the disk was failed
+DEGRADED_WRITE = "degraded_write"  # Write committed while the disk was failed
+RECONSTRUCTED_BLOCK = "reconstructed_block"  # Block of the failed disk rebuilt on the fly
+UNCORRECTABLE_ERROR = "uncorrectable_error"  # Multi-bit error (DBE) found, beyond what the Hamming code corrects
+EVENTS = (DISK_READ, DISK_WRITE, PARITY_WRITE, ECC_CORRECTION, SKIPPED_WRITE, DEGRADED_READ, DEGRADED_WRITE,
+          RECONSTRUCTED_BLOCK, UNCORRECTABLE_ERROR)
+
+# Timings
+WRITE_REQUEST = "write_request"
+READ_REQUEST = "read_request"
+RECOVERY = "recovery"
+
+
+class MetricsRegistry:
+    """
+    Args:
+        num_disks (int):
+        num_stripes (int):
+        per_stripe (bool): also count every event per stripe
+        block_writes (list): the storage's write_count_per_block, reported as the per-stripe disk_write row
+    """
+    __slots__ = ("num_disks", "num_stripes", "per_stripe", "disk_counts", "stripe_counts", "block_writes",
+                 "stripe_reads", "timings")
+
+    def __init__(self, num_disks, num_stripes, per_stripe=False, block_writes=None):
+        self.num_disks = num_disks
+        self.num_stripes = num_stripes
+        self.per_stripe = per_stripe
+        self.disk_counts = {event: [0] * num_disks for event in EVENTS}
+        self.stripe_counts = {}  # event -> array('I') indexed by stripe, only with per_stripe
+        self.block_writes = block_writes
+        self.stripe_reads = array('I', [0]) * num_stripes if per_stripe else None  # The per-stripe disk_read row
+        self.timings = {}  # name -> [count, seconds]
+
+    def record(self, event, disk, stripe_num, count=1):
+        self.disk_counts[event][disk] += count
+        if self.per_stripe:
+            counts = self.stripe_counts.get(event)
+            if counts is None:
+                counts = self.stripe_counts[event] = array('I', [0]) * self.num_stripes
+            counts[stripe_num] += count
+
+    def record_time(self, name, seconds):
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [1, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+
+    def total(self, event):
+        return sum(self.disk_counts[event])
+
+    def reset(self):
+        """
+        Zeroes every counter in place, so the array's aliases of the disk rows stay valid.
+        """
+        for counts in self.disk_counts.values():
+            counts[:] = [0] * self.num_disks
+        self.stripe_counts.clear()
+        if self.stripe_reads is not None:
+            self.stripe_reads[:] = array('I', [0]) * self.num_stripes
+        self.timings.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: a copy of every counter: totals, per_disk and per_stripe by event, and timings
+        """
+        per_stripe = {event: counts.tolist() for event, counts in self.stripe_counts.items()}
+        if self.per_stripe and self.block_writes is not None:
+            per_stripe[DISK_WRITE] = [sum(stripe_writes) for stripe_writes in zip(*self.block_writes)]
+        if self.stripe_reads is not None:
+            per_stripe[DISK_READ] = self.stripe_reads.tolist()
+        return {
+            "totals": {event: sum(counts) for event, counts in self.disk_counts.items()},
+            "per_disk": {event: counts[:] for event, counts in self.disk_counts.items()},
+            "per_stripe": per_stripe,
+            "timings": {name: {"count": count, "seconds": seconds} for name, (count, seconds) in self.timings.items()},
+        }
+
+    @staticmethod
+    def delta(after, before):
+        """
+        The difference of two snapshots (after - before), in the snapshot format.
+        """
+        def minus(new, old):
+            return [a - b for a, b in zip(new, old)] if old is not None else new[:]
+
+        zeros = {}
+        return {
+            "totals": {event: value - before["totals"].get(event, 0) for event, value in after["totals"].items()},
+            "per_disk": {event: minus(counts, before["per_disk"].get(event))
+                         for event, counts in after["per_disk"].items()},
+            "per_stripe": {event: minus(counts, before["per_stripe"].get(event))
+                           for event, counts in after["per_stripe"].items()},
+            "timings": {name: {"count": timing["count"] - before["timings"].get(name, zeros).get("count", 0),
+                               "seconds": timing["seconds"] - before["timings"].get(name, zeros).get("seconds", 0.0)}
+                        for name, timing in after["timings"].items()},
+        }
+
+    @staticmethod
+    def to_json(snapshot, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, indent=1)
+
+    @staticmethod
+    def to_csv(snapshot, path):
+        """
+        One row per value: scope (total, disk, stripe or timing), event, index (disk/stripe number or
+        count/seconds for timings) and value.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["scope", "event", "index", "value"])
+            for event, value in snapshot["totals"].items():
+                writer.writerow(["total", event, "", value])
+            for event, counts in snapshot["per_disk"].items():
+                writer.writerows(["disk", event, disk, value] for disk, value in enumerate(counts))
+            for event, counts in snapshot["per_stripe"].items():
+                writer.writerows(["stripe", event, stripe_num, value] for stripe_num, value in enumerate(counts) if value)
+            for name, timing in snapshot["timings"].items():
+                writer.writerow(["timing", name, "count", timing["count"]])
+                writer.writerow(["timing", name, "seconds", timing["seconds"]])
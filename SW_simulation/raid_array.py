@@ -0,0 +1,1345 @@
+# RAID 5 array with Hamming ECC and Write/Read Buffers
+#
+# All state of one simulated array lives in a RaidArray instance, so a process can hold any number
+# of independent arrays (e.g. one per worker in a pool). main.py keeps the original module-level API
+# as a thin shim over a default instance.
+import sys
+import time
+import random
+from array import array
+from collections import deque, OrderedDict
+
+import sim_logging as log
+from sim_logging import format_block, format_address, format_data
+from ring_buffer import RingBuffer
+from hamming import BLOCK_SIZE, DECODE_TABLE, NO_ERROR, SBE, DBE, hamming_encode, Hamming_lookup
+from storage import MemoryStorage
+from run_log import (FLAG_D0_CORRECTED, FLAG_D1_CORRECTED, FLAG_SKIPPED, FLAG_DEGRADED, FLAG_FAILED, FLAG_BUFFER_HIT,
+                     FLAG_CACHE_HIT, FLAG_FULL_STRIPE, FLAG_READ_MODIFY_WRITE, FLAG_RECONSTRUCTED,
+                     FLAG_PARITY_MISMATCH, FLAG_DROPPED, FLAG_D0_UNCORRECTABLE, FLAG_D1_UNCORRECTABLE, WROTE_P,
+                     WROTE_D0, WROTE_D1)
+from metrics import (MetricsRegistry, DISK_READ, DISK_WRITE, PARITY_WRITE, ECC_CORRECTION, SKIPPED_WRITE,
+                     DEGRADED_READ, DEGRADED_WRITE, RECONSTRUCTED_BLOCK, UNCORRECTABLE_ERROR, WRITE_REQUEST,
+                     READ_REQUEST, RECOVERY)
+
+try:
+    import numpy as np
+    from hamming_batch import fix_batch
+except ImportError:  # Bulk recovery falls back to packed Python ints
+    np = None
+
+# Default geometry
+NUM_DISKS = 3  # Number of disks
+NUM_STRIPES = 6  # Number of stripes
+ADDRESS_BITS = 8  # Minimum width of a request address
+WRITE_BUFFER_SIZE = 100000  # Write buffer size
+READ_BUFFER_SIZE = 100000  # Read buffer size
+READ_CACHE_SIZE = 0  # Decoded words kept by the LRU read cache (0 = no cache)
+RECOVERY_CHUNK_STRIPES = 1 << 16  # Stripes rebuilt per chunk by RAID5_recovery (bounds memory on mmap disks)
+
+# Packed-int recovery without NumPy: codeword -> corrected codeword, the codewords that need it (a chunk without
+# any is packed as it is) and those no correction can fix
+CORRECTED_TABLE = tuple(entry[1] for entry in DECODE_TABLE)
+ERROR_CODEWORDS = frozenset(codeword for codeword, entry in enumerate(DECODE_TABLE) if entry[0] != NO_ERROR)
+DBE_CODEWORDS = frozenset(codeword for codeword, entry in enumerate(DECODE_TABLE) if entry[0] == DBE)
+
+# Parity placement
+ROUND_ROBIN = "round_robin"  # Parity rotates across the disks: stripe s -> disk (s - 1) % num_disks
+FIXED_PARITY = "fixed_parity"  # Traditional layout: parity always on the last disk
+PARITY_LAYOUTS = (ROUND_ROBIN, FIXED_PARITY)
+
+# Parity update for a small write to a valid stripe (the old data blocks are always read first, to skip redundant writes)
+AUTO_WRITE = "auto"  # Per request, whichever of the two below needs fewer disk reads
+READ_MODIFY_WRITE = "read_modify_write"  # P_new = P_old ^ D_old ^ D_new: reads the old parity block
+RECONSTRUCT_WRITE = "reconstruct_write"  # P_new = XOR of all new data blocks: reads the stripe's other data blocks
+WRITE_MODES = (AUTO_WRITE, READ_MODIFY_WRITE, RECONSTRUCT_WRITE)
+
+
+def xor_blocks(block1, block2):
+    return block1 ^ block2
+
+def calculate_p0_new(D0_enc, D1_enc):
+    return xor_blocks(D0_enc, D1_enc)
+
+def word_write_cost(old_data, new_data):
+    """
+    Block writes needed to replace one 16-bit word with another on a valid stripe.
+    Returns:
+        tuple: (data block writes 0-2, parity block writes 0-1)
+    """
+    changed = old_data ^ new_data
+    data_writes = (changed >> 8 != 0) + (changed & 0xFF != 0)
+    return data_writes, 1 if data_writes else 0
+
+
+class RaidArray:
+    """
+    One RAID 5 array: its disks, stripe validity, request buffers, counters and failure state.
+
+    Geometry: every stripe has one parity block and num_disks - 1 data blocks. A 16-bit word takes two
+    data blocks (D0 = upper byte, D1 = lower byte), so a stripe holds up to (num_disks - 1) // 2 words.
+    When that leaves data blocks unused (an even num_disks, or fewer words_per_stripe), the word slots rotate
+    over the stripe's data disks by one disk per stripe, so the unused blocks, and the wear they save, are
+    spread evenly instead of always landing on the same disk.
+    Addresses map to words with the low part of the word index selecting the stripe and the high part the
+    word slot inside it. Addresses past the capacity (num_stripes * words_per_stripe) wrap onto it modulo
+    the capacity, with a warning the first time, unless wrap_addresses is False.
+    Args:
+        num_disks (int): number of disks, at least 3
+        num_stripes (int): number of stripes per disk
+        words_per_stripe (int): 16-bit words stored per stripe; defaults to the most that fit, (num_disks - 1) // 2
+        address_bits (int): width of a valid address; defaults to ADDRESS_BITS, or more if the capacity needs it
+        wrap_addresses (bool): accept addresses past the capacity and wrap them onto it (default True, as the
+                               original 3-bit stripe field did); False rejects them
+        write_buffer_size (int): capacity of the write request buffer
+        read_buffer_size (int): capacity of the read request buffer
+        parity_layout (str): ROUND_ROBIN (default) or FIXED_PARITY
+        write_mode (str): parity update of small writes, AUTO_WRITE (default), READ_MODIFY_WRITE or RECONSTRUCT_WRITE
+        coalesce_writes (bool): merge a new write into the pending write to the same word, if there is one
+                                (last writer wins). A read enqueued to the word closes it to later merges.
+        forward_reads (bool): serve a read from the newest pending write to its word issued before it,
+                              instead of from the disks (default True)
+        read_cache_size (int): capacity of the LRU cache of decoded words in front of the disks (0 = off).
+                               A cache hit skips the disk reads and the Hamming check, so single-bit errors
+                               are then only corrected on a miss.
+        storage: backend holding the disks, validity map and block counters (see storage.py);
+                 defaults to an in-memory MemoryStorage. With a backend, its geometry wins over num_disks and num_stripes.
+        rng: random source used by the simulate_* workloads (random.Random instance); defaults to the random module
+    """
+    __slots__ = ("num_disks", "num_stripes", "words_per_stripe", "capacity", "address_bits", "data_disk_map", "disks", "stripe_valid", "write_buffer", "read_buffer",
+                 "write_sys_is_ready", "read_sys_is_ready", "disk_status", "num_of_fail_disks",
+                 "write_count_per_disk", "write_count_per_block", "redundant_write_skips", "partial_write_skips",
+                 "read_count_per_disk", "read_count_per_stripe", "read_modify_writes", "reconstruct_writes", "write_mode",
+                 "coalesce_writes", "pending_writes", "coalesced_writes", "coalesced_disk_writes_avoided",
+                 "coalesced_parity_writes_avoided", "forward_reads", "pending_by_word", "request_seq",
+                 "read_buffer_hits", "read_cache_size", "read_cache", "read_cache_hits", "read_cache_misses",
+                 "read_cache_evictions", "background_tasks", "degraded_reads", "degraded_writes", "failed_reads",
+                 "failed_writes", "degraded_write_skips", "reconstructed_blocks", "lost_blocks", "lost_reads", "degraded_read_ios", "degraded_time",
+                 "rebuild_disk", "rebuild_watermark", "metrics", "request_started", "verify_parity_on_read",
+                 "parity_mismatches", "run_log", "slot_rotations", "wrap_addresses", "wrapped_addresses",
+                 "enable_print_write_buffer", "enable_print_read_buffer", "enable_print_disk_state", "rng",
+                 "parity_layout", "storage")
+
+    def __init__(self, num_disks=NUM_DISKS, num_stripes=NUM_STRIPES, words_per_stripe=None, address_bits=None,
+                 write_buffer_size=WRITE_BUFFER_SIZE, read_buffer_size=READ_BUFFER_SIZE, rng=None,
+                 parity_layout=ROUND_ROBIN, storage=None, write_mode=AUTO_WRITE, coalesce_writes=False,
+                 forward_reads=True, read_cache_size=READ_CACHE_SIZE, per_stripe_metrics=False,
+                 verify_parity_on_read=False, wrap_addresses=True):
+        if parity_layout not in PARITY_LAYOUTS:
+            raise ValueError(f"Invalid parity layout: {parity_layout!r}. Use one of {', '.join(PARITY_LAYOUTS)}.")
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"Invalid write mode: {write_mode!r}. Use one of {', '.join(WRITE_MODES)}.")
+
+        if storage is None:
+            storage = MemoryStorage(num_disks, num_stripes)
+        num_disks = storage.num_disks
+        num_stripes = storage.num_stripes
+        if num_disks < 3:
+            raise ValueError(f"RAID 5 needs at least 3 disks, got {num_disks}.")
+        if num_stripes < 1:
+            raise ValueError(f"Invalid number of stripes: {num_stripes}.")
+        max_words = (num_disks - 1) // 2
+        if words_per_stripe is None:
+            words_per_stripe = max_words
+        elif not 1 <= words_per_stripe <= max_words:
+            raise ValueError(f"words_per_stripe must be 1-{max_words} with {num_disks} disks, got {words_per_stripe}.")
+
+        self.storage = storage
+        self.num_disks = num_disks
+        self.num_stripes = num_stripes
+        self.words_per_stripe = words_per_stripe
+        self.capacity = num_stripes * words_per_stripe  # Number of addressable 16-bit words
+        if address_bits is None:
+            address_bits = max(ADDRESS_BITS, (self.capacity - 1).bit_length())
+        self.address_bits = address_bits
+        self.parity_layout = parity_layout
+        self.write_mode = write_mode
+
+        # Data disks of a stripe in order (D0 and D1 of word slot w are entries 2w and 2w + 1),
+        # by parity disk and then by rotation (stripe_num % slot_rotations, see data_disks_of)
+        self.slot_rotations = num_disks - 1 if 2 * words_per_stripe < num_disks - 1 else 1
+        self.data_disk_map = []
+        for parity_disk in range(num_disks):
+            data_disks = tuple(d for d in range(num_disks) if d != parity_disk)
+            self.data_disk_map.append([data_disks[r:] + data_disks[:r] for r in range(self.slot_rotations)])
+        self.wrap_addresses = wrap_addresses
+        self.wrapped_addresses = 0  # Accepted requests whose address wrapped onto the capacity
+
+        # Each block is a packed 12-bit codeword: bit list index i of the old list form is bit (11 - i) of the int,
+        # so the int value is exactly int(''.join(map(str, bits)), 2). One uint16 slot per stripe on every disk.
+        self.disks = storage.disks
+
+        # Stripe validity map, one byte per stripe (1 = written, 0 = never written: the first write is a full-stripe write)
+        self.stripe_valid = storage.stripe_valid
+
+        # Write and Read Buffers (FIFO ring buffers, O(1) enqueue and dequeue)
+        self.write_buffer = RingBuffer(write_buffer_size)
+        self.read_buffer = RingBuffer(read_buffer_size)
+
+        # Write coalescing: word index -> the newest pending write entry that later writes may merge into
+        self.coalesce_writes = coalesce_writes
+        self.pending_writes = {}
+
+        # Read forwarding: word index -> its pending write entries, oldest first (the FIFO order of the write buffer).
+        # Every accepted request gets a sequence number, so a read only sees writes issued before it.
+        self.forward_reads = forward_reads
+        self.pending_by_word = {}
+        self.request_seq = 0
+
+        # LRU read cache: word index -> decoded 16-bit data, least recently used first
+        self.read_cache_size = read_cache_size
+        self.read_cache = OrderedDict()
+
+        # Counters for degraded mode (one failed disk) and for requests failed by more than one failed disk
+        self.degraded_reads = 0  # Reads served while a disk was failed
+        self.degraded_writes = 0  # Writes committed while a disk was failed
+        self.failed_reads = 0
+        self.failed_writes = 0
+        self.degraded_write_skips = 0  # Block writes dropped because their disk has failed (parity keeps the data)
+        self.reconstructed_blocks = 0  # Blocks of a failed disk rebuilt on the fly from the rest of their stripe
+        self.lost_blocks = 0  # Blocks neither the Hamming code nor the rest of their stripe could recover
+        self.lost_reads = 0  # Reads that returned None because of a lost block
+        self.degraded_read_ios = 0  # Disk reads done by degraded reads
+        self.degraded_time = 0.0  # Seconds spent handling degraded requests
+
+        # Background work (e.g. scrubber.PatrolScrubber) run after every foreground request: objects with on_request()
+        self.background_tasks = []
+
+        # Binary record of every handled request (run_log.RunLog attaches itself here), None = off
+        self.run_log = None
+
+        self.write_sys_is_ready = 0  # Is the write system ready for operation
+        self.read_sys_is_ready = 1  # System is initially ready for read requests
+        self.disk_status = [1] * self.num_disks  # Disk health status array: 1 = Healthy, 0 = Failed
+        self.num_of_fail_disks = 0  # Number of failed disks
+        # Disk being rebuilt (see rebuild.py): its stripes below the watermark are rebuilt and used again
+        self.rebuild_disk = None
+        self.rebuild_watermark = 0
+
+        # Metrics registry (metrics.py); its disk_write and disk_read rows are the per-disk counters below
+        self.metrics = MetricsRegistry(num_disks, num_stripes, per_stripe_metrics, storage.write_count_per_block)
+        self.request_started = 0.0
+
+        # Counters for writes per disk and per block
+        self.write_count_per_disk = self.metrics.disk_counts[DISK_WRITE]  # Counter per disk
+        self.write_count_per_block = storage.write_count_per_block  # Counter per block in each disk
+        self.redundant_write_skips = 0  # Requests skipped because the data was identical
+        self.partial_write_skips = 0  # Requests that wrote only D0 or only D1 (one data block write skipped)
+
+        # Counters for reads per disk and for the parity update method of small writes
+        self.read_count_per_disk = self.metrics.disk_counts[DISK_READ]
+        self.read_count_per_stripe = self.metrics.stripe_reads  # None unless per_stripe_metrics
+        self.read_modify_writes = 0
+        self.reconstruct_writes = 0
+
+        # Counters for write coalescing
+        self.coalesced_writes = 0  # Requests merged into a pending write instead of being queued
+        self.coalesced_disk_writes_avoided = 0  # Data and parity block writes the merged requests would have cost
+        self.coalesced_parity_writes_avoided = 0  # The parity part of the above
+        self.read_buffer_hits = 0  # Reads served from a pending write instead of the disks
+
+        # RAID 5 without per-block ECC has to read the whole stripe and check the parity to detect corruption;
+        # verify_parity_on_read does that on every healthy read, for comparison runs
+        self.verify_parity_on_read = verify_parity_on_read
+        self.parity_mismatches = 0
+
+        # Counters for the read cache
+        self.read_cache_hits = 0
+        self.read_cache_misses = 0
+        self.read_cache_evictions = 0
+
+        # Debug dumps, printed only when enabled and the log level is TRACE (see sim_logging.py)
+        self.enable_print_write_buffer = 0
+        self.enable_print_read_buffer = 0
+        self.enable_print_disk_state = 0
+
+        self.rng = rng if rng is not None else random
+
+    def flush(self):
+        self.storage.flush()
+
+    def close(self):
+        self.storage.close()
+
+    def parity_disk_of(self, stripe_num):
+        if self.parity_layout == FIXED_PARITY:
+            return self.num_disks - 1
+        return (stripe_num - 1) % self.num_disks  # Cyclic parity disk calculation
+
+    def locate(self, address):
+        """
+        Maps an address to the blocks holding its word.
+        Returns:
+            tuple: (stripe_num, D0_disk, D1_disk, parity_disk)
+        """
+        word_index = address % self.capacity
+        stripe_num = word_index % self.num_stripes
+        slot = word_index // self.num_stripes
+        parity_disk = self.parity_disk_of(stripe_num)
+        data_disks = self.data_disk_map[parity_disk][stripe_num % self.slot_rotations]
+        return stripe_num, data_disks[2 * slot], data_disks[2 * slot + 1], parity_disk
+
+    def data_disks_of(self, stripe_num):
+        """
+        The data disks of a stripe in word slot order: D0 and D1 of slot w are entries 2w and 2w + 1.
+        """
+        return self.data_disk_map[self.parity_disk_of(stripe_num)][stripe_num % self.slot_rotations]
+
+    def rest_of_stripe_parity(self, stripe_num, parity_disk, D0_disk, D1_disk):
+        """
+        XOR of the stripe's Hamming-corrected data blocks outside the word at (D0_disk, D1_disk).
+        New parity = D0_enc ^ D1_enc ^ this (0 with 3 disks, where the word fills the stripe).
+        """
+        parity = 0
+        for disk in self.data_disk_map[parity_disk][0]:
+            if disk != D0_disk and disk != D1_disk:
+                parity ^= DECODE_TABLE[self.read_block(disk, stripe_num)][1]
+        return parity
+
+    def read_block(self, disk, stripe_num):
+        """
+        Reads one block and counts the read. A block of a failed disk is reconstructed from the rest of its stripe.
+        """
+        if self.block_available(disk, stripe_num):
+            self.read_count_per_disk[disk] += 1
+            if self.read_count_per_stripe is not None:
+                self.read_count_per_stripe[stripe_num] += 1
+            return self.disks[disk][stripe_num]
+        return self.reconstruct_block(disk, stripe_num)
+
+    def block_available(self, disk, stripe_num):
+        """
+        False for a block of a failed disk, unless the rebuild has already passed its stripe.
+        """
+        return self.disk_status[disk] == 1 or (disk == self.rebuild_disk and stripe_num < self.rebuild_watermark)
+
+    def stripe_xor(self, disk, stripe_num):
+        """
+        The block of disk in a stripe as the XOR of the Hamming-corrected blocks of all the other disks
+        (data and parity blocks are all codewords, so a single-bit error on a survivor does not leak into it).
+        Reads every other disk, which must all be healthy.
+        Returns:
+            int: the block, or None if a survivor has an uncorrectable error (recorded per disk)
+        """
+        block = 0
+        lost = False
+        for other in range(self.num_disks):
+            if other != disk:
+                status, corrected, _ = Hamming_lookup(self.disks[other][stripe_num])
+                self.read_count_per_disk[other] += 1
+                if status == DBE:
+                    self.metrics.record(UNCORRECTABLE_ERROR, other, stripe_num)
+                    lost = True
+                block ^= corrected
+        if self.read_count_per_stripe is not None:
+            self.read_count_per_stripe[stripe_num] += self.num_disks - 1
+        return None if lost else block
+
+    def reconstruct_block(self, failed_disk, stripe_num):
+        """
+        The block of failed_disk in a stripe, rebuilt from all the other disks (see stripe_xor).
+        A block that cannot be rebuilt is counted as lost and read as 0.
+        """
+        block = self.stripe_xor(failed_disk, stripe_num)
+        self.reconstructed_blocks += 1
+        self.metrics.record(RECONSTRUCTED_BLOCK, failed_disk, stripe_num)
+        if block is None:
+            self.lost_blocks += 1
+            return 0
+        return block
+
+    def repair_block(self, disk, stripe_num):
+        """
+        Rebuilds a block with an uncorrectable error (DBE) from the rest of its stripe and writes it back.
+        Returns:
+            int: the rebuilt codeword, or None if the block is lost (another block of the stripe is unavailable
+            or uncorrectable too)
+        """
+        self.metrics.record(UNCORRECTABLE_ERROR, disk, stripe_num)
+        if all(self.block_available(other, stripe_num) for other in range(self.num_disks) if other != disk):
+            block = self.stripe_xor(disk, stripe_num)
+            if block is not None:
+                self.disks[disk][stripe_num] = block
+                return block
+        self.lost_blocks += 1
+        return None
+
+    def use_read_modify_write(self):
+        """
+        Parity update method for a small write to a valid stripe whose old data blocks were already read.
+        Read-modify-write reads 1 block (the old parity), reconstruct-write reads the num_disks - 3 other
+        data blocks, so AUTO_WRITE picks reconstruct-write for 3 and 4 disks and read-modify-write above that.
+        """
+        if self.write_mode == AUTO_WRITE:
+            # Degraded: a lost data block would have to be reconstructed from the whole stripe
+            return 1 < self.num_disks - 3 or self.num_of_fail_disks > 0
+        return self.write_mode == READ_MODIFY_WRITE
+
+    def write_block(self, disk, stripe_num, block, parity=False):
+        """
+        Returns:
+            bool: False if the block was dropped because its disk has failed
+        """
+        if self.disk_status[disk] == 0 and not self.block_available(disk, stripe_num):
+            self.degraded_write_skips += 1  # Lost with the disk; the stripe's parity still holds it
+            return False
+        self.disks[disk][stripe_num] = block
+        self.write_count_per_disk[disk] += 1
+        self.write_count_per_block[disk][stripe_num] += 1
+        if parity:
+            self.metrics.record(PARITY_WRITE, disk, stripe_num)
+        return True
+
+    def cache_read(self, word_index, data):
+        self.read_cache[word_index] = data
+        if len(self.read_cache) > self.read_cache_size:
+            self.read_cache.popitem(last=False)  # Evict the least recently used word
+            self.read_cache_evictions += 1
+
+    def invalidate_stripe(self, stripe_num):
+        """
+        Drops the cached words of a stripe whose blocks changed outside the write path (fault injection).
+        """
+        if self.read_cache:
+            for slot in range(self.words_per_stripe):
+                self.read_cache.pop(stripe_num + slot * self.num_stripes, None)
+
+    def print_disk_state(self):
+        if self.enable_print_disk_state==0 or log.level < log.TRACE:
+            return
+        print("\n💾 Disk State:")
+        print("Stripe |" + "|".join(f"{f'Disk {disk}':^15}" for disk in range(self.num_disks)).rstrip())
+        print("-" * (2 + 16 * self.num_disks))
+        for stripe in range(self.num_stripes):
+            row = f"{stripe:^6}|"
+            for disk in range(self.num_disks):
+                block = self.disks[disk][stripe]
+                formatted_block = format_block(block)
+                row += f" {formatted_block:^14}|"
+            print(row)
+        print("-" * (2 + 16 * self.num_disks))
+
+    def print_write_buffer(self):
+        if self.enable_print_write_buffer==0 or log.level < log.TRACE:
+            return
+        print("\n📝 Write Buffer:")
+        print("Index |   Address   |       Data")
+        print("-" * 35)
+        for i, entry in enumerate(self.write_buffer):
+            addr = format_address(entry['address'], self.address_bits)
+            data = format_data(entry['data'])
+            print(f"{i:^5}| {addr:^12} | {data:^18}")
+        print("-" * 35)
+        print(f"🟦 Write Buffer Count: {len(self.write_buffer)}/{self.write_buffer.capacity}")
+        print("-" * 35)
+
+    def accept_address(self, address, request):
+        """
+        Checks the address of a new request. An address past the capacity wraps onto it when wrap_addresses is
+        set (with a warning the first time, then only counted); otherwise it is rejected.
+        Args:
+            request (str): "Write" or "Read", for the messages
+        Returns:
+            bool: True if the request may be queued
+        """
+        if not 0 <= address < 1 << self.address_bits:
+            if log.level >= log.SUMMARY:
+                print(f"❌ Invalid address {address} ({self.address_bits}-bit address space). {request} request REJECTED.")
+            return False
+        if address >= self.capacity:
+            if not self.wrap_addresses:
+                if log.level >= log.SUMMARY:
+                    print(f"❌ Address {address} is past the capacity of {self.capacity} words. {request} request REJECTED.")
+                return False
+            self.wrapped_addresses += 1
+            if self.wrapped_addresses == 1 and log.level >= log.SUMMARY:
+                print(f"⚠️ Address {address} is past the capacity of {self.capacity} words and wraps to word "
+                      f"{address % self.capacity} (further wraps are only counted)")
+        return True
+
+    def add_write_request(self, address, data):
+        new_write_request = {"address": address, "data": data}
+
+        if not self.accept_address(address, "Write"):
+            pass  # Rejected
+        elif self.coalesce_writes and address % self.capacity in self.pending_writes:
+            self.merge_write_request(address, data)
+        elif self.write_buffer.is_full():
+            # Buffer is full, reject the new request
+            if log.level >= log.SUMMARY:
+                print("❌ Write Buffer FULL. Write request REJECTED.")
+        else:
+            # Add new request at the tail of the buffer
+            self.request_seq += 1
+            new_write_request['seq'] = self.request_seq
+            self.write_buffer.push(new_write_request)
+            if self.coalesce_writes:
+                self.pending_writes[address % self.capacity] = new_write_request
+            if self.forward_reads:
+                word_index = address % self.capacity
+                pending = self.pending_by_word.get(word_index)
+                if pending is None:
+                    self.pending_by_word[word_index] = deque((new_write_request,))
+                else:
+                    pending.append(new_write_request)
+            if log.level >= log.REQUEST:
+                print("✅ Write request added to buffer.")
+
+        self.print_write_buffer()
+
+    def merge_write_request(self, address, data):
+        """
+        Coalesces a write into the pending write to the same word: the entry keeps its place in the buffer
+        and takes the new data. The entry remembers its first data and what committing every merged value
+        in turn would have cost, so handle_write_request can count the disk writes avoided.
+        """
+        entry = self.pending_writes[address % self.capacity]
+        if 'first_data' not in entry:
+            entry['first_data'] = entry['data']
+            entry['chain_data_writes'] = 0
+            entry['chain_parity_writes'] = 0
+        data_writes, parity_writes = word_write_cost(entry['data'], data)
+        entry['chain_data_writes'] += data_writes
+        entry['chain_parity_writes'] += parity_writes
+        entry['address'] = address
+        entry['data'] = data
+        self.coalesced_writes += 1
+        if log.level >= log.REQUEST:
+            print("🔗 Write request coalesced with the pending write to the same address.")
+
+    def count_coalescing_savings(self, req, D0_enc, D1_enc, D0_enc_old=None, D1_enc_old=None):
+        """
+        Counts the disk writes a coalesced entry avoided: committing its first value and then every merged
+        value in turn, against committing only the newest value. The old blocks are None for an invalid
+        stripe, which takes a full-stripe write either way.
+        """
+        data_writes = req['chain_data_writes']
+        parity_writes = req['chain_parity_writes']
+        if D0_enc_old is not None:
+            first = req['first_data']
+            first_changes = ((hamming_encode((first >> 8) & 0xFF) != D0_enc_old)
+                             + (hamming_encode(first & 0xFF) != D1_enc_old))
+            final_changes = (D0_enc != D0_enc_old) + (D1_enc != D1_enc_old)
+            data_writes += first_changes - final_changes
+            parity_writes += (first_changes > 0) - (final_changes > 0)
+        self.coalesced_disk_writes_avoided += data_writes + parity_writes
+        self.coalesced_parity_writes_avoided += parity_writes
+
+    def handle_write_request(self):
+        if len(self.write_buffer) > 0 and self.write_sys_is_ready == 1:
+            self.write_sys_is_ready = 0  # write_sys is busy
+            self.request_started = time.perf_counter()
+
+            level = log.level
+            req = self.write_buffer.peek()  # always the first request (FIFO)
+            if level >= log.REQUEST:
+                print(f"\n🔄 Handling Write Request: Address: {format_address(req['address'], self.address_bits)}, "
+                      f"Data: {format_data(req['data'])} ({req['data']})")
+
+            # Check how many disks are healthy
+            self.num_of_fail_disks = self.disk_status.count(0)
+            if self.num_of_fail_disks > 1:
+                self.failed_writes += 1
+                if level >= log.SUMMARY:
+                    print("❌ ERROR: Too many disk failures. Write request FAILED.")
+                if self.run_log is not None:
+                    self.run_log.log_failed_write(req)
+                self.complete_write_request(req)
+                return
+            if self.num_of_fail_disks:
+                start = time.perf_counter()
+
+            D0 = int((req['data'] >> 8) & 0xFF)
+            D1 = int(req['data'] & 0xFF)
+
+            D0_enc = hamming_encode(D0)
+            D1_enc = hamming_encode(D1)
+
+            if level >= log.TRACE:
+                print(f"🔹 D0 (Upper 8 bits): {format_address(D0)} ({D0})")
+                print(f"🔹 D1 (Lower 8 bits): {format_address(D1)} ({D1})")
+                print(f"🔹 D0_enc: {format_block(D0_enc)} ({D0_enc})")
+                print(f"🔹 D1_enc: {format_block(D1_enc)} ({D1_enc})")
+
+            stripe_num, D0_disk, D1_disk, parity_disk = self.locate(req['address'])
+            # What the write did, for the run log: (FLAG_* bits, WROTE_* bits, parity block)
+            outcome = (FLAG_SKIPPED, 0, 0)
+            D0_enc_old = D1_enc_old = 0
+
+            if self.stripe_valid[stripe_num] == 1:
+                if self.num_of_fail_disks:
+                    D0_enc_old = self.read_block(D0_disk, stripe_num)
+                    D1_enc_old = self.read_block(D1_disk, stripe_num)
+                else:
+                    D0_enc_old = self.disks[D0_disk][stripe_num]
+                    D1_enc_old = self.disks[D1_disk][stripe_num]
+                    self.read_count_per_disk[D0_disk] += 1
+                    self.read_count_per_disk[D1_disk] += 1
+                    if self.read_count_per_stripe is not None:
+                        self.read_count_per_stripe[stripe_num] += 2
+
+                if level >= log.TRACE:
+                    print(f"🔹 D0_enc_old: {format_block(D0_enc_old)} ({D0_enc_old})")
+                    print(f"🔹 D1_enc_old: {format_block(D1_enc_old)} ({D1_enc_old})")
+                if 'first_data' in req:
+                    self.count_coalescing_savings(req, D0_enc, D1_enc, D0_enc_old, D1_enc_old)
+
+                if D0_enc == D0_enc_old and D1_enc == D1_enc_old:
+                    self.redundant_write_skips += 1
+                    self.metrics.record(SKIPPED_WRITE, D0_disk, stripe_num)
+                    self.metrics.record(SKIPPED_WRITE, D1_disk, stripe_num)
+                    if level >= log.REQUEST:
+                        print("✅ Data is identical. Skipping redundant write.")
+                else:
+                    if self.num_of_fail_disks > 0:
+                        self.handle_system_failure()
+                    outcome = self.selective_write_to_disks(req['address'], D0_enc, D1_enc, D0_enc_old, D1_enc_old)
+            else:
+                if 'first_data' in req:
+                    self.count_coalescing_savings(req, D0_enc, D1_enc)
+                if self.num_of_fail_disks > 0:
+                    self.handle_system_failure()
+                outcome = self.write_to_disks(req['address'], D0_enc, D1_enc)
+
+            if self.num_of_fail_disks:
+                self.degraded_writes += 1
+                self.metrics.record(DEGRADED_WRITE, self.disk_status.index(0), stripe_num)
+                self.degraded_time += time.perf_counter() - start
+            if self.run_log is not None:
+                flags, written, parity = outcome
+                self.run_log.log_write(req, flags | (FLAG_DEGRADED if self.num_of_fail_disks else 0), written,
+                                       stripe_num, D0_disk, D1_disk, parity_disk, D0_enc, D1_enc, parity,
+                                       D0_enc_old, D1_enc_old)
+            self.complete_write_request(req)
+
+    def complete_write_request(self, req):
+        self.write_buffer.pop()
+        word_index = req['address'] % self.capacity
+        if self.coalesce_writes and self.pending_writes.get(word_index) is req:
+            del self.pending_writes[word_index]
+        if self.forward_reads:
+            # The buffer is FIFO, so the committed entry is the oldest pending write to its word
+            pending = self.pending_by_word[word_index]
+            pending.popleft()
+            if not pending:
+                del self.pending_by_word[word_index]
+        self.write_sys_is_ready = 1  # write_sys is free
+        self.metrics.record_time(WRITE_REQUEST, time.perf_counter() - self.request_started)
+        if self.background_tasks:
+            self.run_background_tasks()
+
+    def write_to_disks(self, address, D0_enc, D1_enc):
+        """
+        Full-stripe write of a stripe that is not valid yet.
+        Returns:
+            tuple: (FLAG_* bits, WROTE_* bits of the blocks written, parity block), as recorded by the run log
+        """
+        stripe_num, D0_disk, D1_disk, parity_disk = self.locate(address)
+        if self.read_cache:
+            self.read_cache.pop(address % self.capacity, None)
+
+        level = log.level
+        if level >= log.REQUEST:
+            print(f"\n🔄 Writing Data to Stripe {stripe_num}:")
+        if level >= log.TRACE:
+            print(f"🔹 D0_enc: {format_block(D0_enc)} ({D0_enc})")
+            print(f"🔹 D1_enc: {format_block(D1_enc)} ({D1_enc})")
+
+        if self.stripe_valid[stripe_num] == 0:
+            if not self.block_available(parity_disk, stripe_num):
+                P0 = 0  # The parity disk has failed: nothing to compute, the parity write is dropped
+            else:
+                P0 = xor_blocks(D0_enc, D1_enc) ^ self.rest_of_stripe_parity(stripe_num, parity_disk, D0_disk, D1_disk)
+            if level >= log.TRACE:
+                print("🛡️ Stripe is INVALID. Calculating Parity (P0)...")
+                print(f"🔄 Parity (P0): {format_block(P0)} ({P0})")
+
+            written = self.write_block(parity_disk, stripe_num, P0, parity=True)
+            written &= self.write_block(D0_disk, stripe_num, D0_enc)
+            written &= self.write_block(D1_disk, stripe_num, D1_enc)
+
+            self.stripe_valid[stripe_num] = 1
+            if level >= log.REQUEST:
+                print(f"✅ Stripe {stripe_num} marked as VALID.")
+            self.print_disk_state()
+            return FLAG_FULL_STRIPE | (0 if written else FLAG_DROPPED), WROTE_P | WROTE_D0 | WROTE_D1, P0
+
+        self.print_disk_state()
+        return FLAG_SKIPPED, 0, 0
+
+    def handle_system_failure(self):
+        """
+        A write found a failed disk: it goes ahead in degraded mode. Blocks of the failed disk are not
+        written; the stripe's parity is updated so that they can still be reconstructed.
+        """
+        if log.level >= log.REQUEST:
+            failed_disks = [i for i, status in enumerate(self.disk_status) if status == 0]
+            print(f"🛡️ Disk {', '.join(map(str, failed_disks))} failed. Writing in degraded mode...")
+
+    def selective_write_to_disks(self, address, D0_enc, D1_enc, D0_enc_old, D1_enc_old):
+        """
+        Small write to a valid stripe: new parity, then only the data blocks that changed.
+        Returns:
+            tuple: (FLAG_* bits, WROTE_* bits of the blocks written, parity block), as recorded by the run log
+        """
+        stripe_num, D0_disk, D1_disk, parity_disk = self.locate(address)
+        if self.read_cache:
+            self.read_cache.pop(address % self.capacity, None)
+
+        # Calculate new parity
+        level = log.level
+        flags = 0
+        read_modify_write = self.block_available(parity_disk, stripe_num) and self.use_read_modify_write()
+        if read_modify_write:
+            # The old blocks come straight off the disks: correct them first, or a latent single-bit error
+            # in any of them would end up in the new parity
+            P0_status, P0_old, _ = DECODE_TABLE[self.disks[parity_disk][stripe_num]]
+            self.read_count_per_disk[parity_disk] += 1
+            if self.read_count_per_stripe is not None:
+                self.read_count_per_stripe[stripe_num] += 1
+            D0_status, D0_fixed, _ = DECODE_TABLE[D0_enc_old]
+            D1_status, D1_fixed, _ = DECODE_TABLE[D1_enc_old]
+            # An uncorrectable old block cannot be taken out of the parity: rebuild it from the stripe instead
+            read_modify_write = DBE not in (P0_status, D0_status, D1_status)
+        if not self.block_available(parity_disk, stripe_num):
+            P0_new = 0  # The parity disk has failed: nothing to compute, the parity write is dropped
+        elif read_modify_write:
+            P0_new = P0_old ^ D0_fixed ^ D0_enc ^ D1_fixed ^ D1_enc
+            self.read_modify_writes += 1
+            flags = FLAG_READ_MODIFY_WRITE
+            if level >= log.TRACE:
+                print(f"🔹 P0_old (read-modify-write): {format_block(P0_old)} ({P0_old})")
+        else:
+            P0_new = calculate_p0_new(D0_enc, D1_enc) ^ self.rest_of_stripe_parity(stripe_num, parity_disk, D0_disk, D1_disk)
+            self.reconstruct_writes += 1
+        if level >= log.TRACE:
+            print(f"🔄 Calculated New Parity (P0_new): {format_block(P0_new)} ({P0_new})")
+
+        # Comparison between current and old values
+        if D0_enc == D0_enc_old and D1_enc != D1_enc_old:
+            self.partial_write_skips += 1
+            self.metrics.record(SKIPPED_WRITE, D0_disk, stripe_num)
+            if level >= log.REQUEST:
+                print(f"✍️ Writing Only: P0_new ({P0_new}), D1_enc ({D1_enc})")
+            written = WROTE_P | WROTE_D1
+            complete = self.write_block(parity_disk, stripe_num, P0_new, parity=True)
+            complete &= self.write_block(D1_disk, stripe_num, D1_enc)
+
+        elif D1_enc == D1_enc_old and D0_enc != D0_enc_old:
+            self.partial_write_skips += 1
+            self.metrics.record(SKIPPED_WRITE, D1_disk, stripe_num)
+            if level >= log.REQUEST:
+                print(f"✍️ Writing Only: P0_new ({P0_new}), D0_enc ({D0_enc})")
+            written = WROTE_P | WROTE_D0
+            complete = self.write_block(parity_disk, stripe_num, P0_new, parity=True)
+            complete &= self.write_block(D0_disk, stripe_num, D0_enc)
+
+        else:
+            if level >= log.REQUEST:
+                print(f"✍️ Writing All: P0_new ({P0_new}), "
+                      f"D0_enc ({D0_enc}), D1_enc ({D1_enc})")
+            written = WROTE_P | WROTE_D0 | WROTE_D1
+            complete = self.write_block(parity_disk, stripe_num, P0_new, parity=True)
+            complete &= self.write_block(D0_disk, stripe_num, D0_enc)
+            complete &= self.write_block(D1_disk, stripe_num, D1_enc)
+
+        # Mark stripe as valid
+        self.stripe_valid[stripe_num] = 1
+        self.print_disk_state()
+        return flags | (0 if complete else FLAG_DROPPED), written, P0_new
+
+    def add_read_request(self, address):
+        new_read_request = {"address": address}
+
+        if not self.accept_address(address, "Read"):
+            pass  # Rejected
+        elif self.read_buffer.is_full():
+            if log.level >= log.SUMMARY:
+                print("❌ Read Buffer FULL. Read request REJECTED.")
+        else:
+            self.request_seq += 1
+            new_read_request['seq'] = self.request_seq
+            self.read_buffer.push(new_read_request)
+            if self.coalesce_writes:
+                # Later writes must not merge into a write queued before this read
+                self.pending_writes.pop(address % self.capacity, None)
+            if log.level >= log.REQUEST:
+                print(f"✅ Read request added to buffer. Address: {format_address(address, self.address_bits)}")
+
+        self.print_read_buffer()
+
+    def print_read_buffer(self):
+        if self.enable_print_read_buffer==0 or log.level < log.TRACE:
+            return
+        print("\n📖 Read Buffer:")
+        print("Index |   Address")
+        print("-" * 25)
+        for i, entry in enumerate(self.read_buffer):
+            addr = format_address(entry['address'], self.address_bits)
+            print(f"{i:^5}| {addr:^12}")
+        print("-" * 25)
+        print(f"🟦 Read Buffer Count: {len(self.read_buffer)}/{self.read_buffer.capacity}")
+        print("-" * 25)
+
+    def bulk_reconstruct(self, failed_disk, chunk_stripes=RECOVERY_CHUNK_STRIPES):
+        """
+        Rebuilds every block of a disk as the XOR of the Hamming-corrected blocks of the other disks (like
+        reconstruct_block), a chunk of stripes at a time: whole uint16 arrays with NumPy, otherwise each
+        chunk of each disk corrected through the table and packed into one Python int.
+        Args:
+            failed_disk (int): the disk to overwrite
+            chunk_stripes (int): stripes per chunk
+        Returns:
+            int: blocks lost because a survivor of their stripe has an uncorrectable error (written as 0)
+        """
+        healthy_disks = [i for i in range(self.num_disks) if i != failed_disk]
+        target = self.disks[failed_disk]
+        lost_blocks = 0
+        for start in range(0, self.num_stripes, chunk_stripes):
+            end = min(start + chunk_stripes, self.num_stripes)
+            lost_stripes = set()
+            if np is not None:
+                count = end - start
+                rebuilt = np.zeros(count, dtype=np.uint16)
+                for disk in healthy_disks:
+                    corrected, syndromes = fix_batch(np.frombuffer(self.disks[disk], dtype=np.uint16,
+                                                                   count=count, offset=2 * start))
+                    rebuilt ^= corrected
+                    for offset in np.flatnonzero(syndromes > BLOCK_SIZE).tolist():
+                        self.metrics.record(UNCORRECTABLE_ERROR, disk, start + offset)
+                        lost_stripes.add(offset)
+                if lost_stripes:
+                    rebuilt[list(lost_stripes)] = 0
+                view = np.frombuffer(target, dtype=np.uint16, count=count, offset=2 * start)
+                view[:] = rebuilt
+                del view  # Release the export, so an mmap disk can still be closed
+            else:
+                packed = 0
+                for disk in healthy_disks:
+                    blocks = self.disks[disk][start:end]
+                    if not ERROR_CODEWORDS.isdisjoint(blocks):
+                        for offset, block in enumerate(blocks):
+                            if block in DBE_CODEWORDS:
+                                self.metrics.record(UNCORRECTABLE_ERROR, disk, start + offset)
+                                lost_stripes.add(offset)
+                        blocks = array('H', map(CORRECTED_TABLE.__getitem__, blocks))
+                    packed ^= int.from_bytes(bytes(blocks), sys.byteorder)
+                rebuilt = array('H', packed.to_bytes(2 * (end - start), sys.byteorder))
+                for offset in lost_stripes:
+                    rebuilt[offset] = 0
+                target[start:end] = rebuilt
+            lost_blocks += len(lost_stripes)
+        self.lost_blocks += lost_blocks
+        return lost_blocks
+
+    def RAID5_recovery(self):
+        level = log.level
+        if level >= log.SUMMARY:
+            print("\n🛠️ Starting RAID5 Disk Recovery...")
+
+        # Identify the failed disk
+        failed_disks = [i for i, status in enumerate(self.disk_status) if status == 0]
+
+        if len(failed_disks) > 1:
+            if level >= log.SUMMARY:
+                print("❌ ERROR: More than one disk has failed. Recovery is impossible!")
+            return
+        if not failed_disks:
+            if level >= log.SUMMARY:
+                print("✅ No failed disk. Nothing to recover.")
+            return
+
+        failed_disk = failed_disks[0]
+        if level >= log.SUMMARY:
+            print(f"🔄 Recovering Disk {failed_disk}...")
+
+        # Recover each stripe on the failed disk: its block is the XOR of the corrected blocks on all the other disks
+        start = time.perf_counter()
+        lost_blocks = self.bulk_reconstruct(failed_disk)
+        elapsed = time.perf_counter() - start
+        self.metrics.record_time(RECOVERY, elapsed)
+        if level >= log.TRACE:
+            for stripe_num in range(self.num_stripes):
+                print(f"✅ Recovered Stripe {stripe_num} on Disk {failed_disk}")
+        for i in range(self.num_disks):
+            if i != failed_disk:
+                self.read_count_per_disk[i] += self.num_stripes
+        if self.read_count_per_stripe is not None:
+            for stripe_num in range(self.num_stripes):
+                self.read_count_per_stripe[stripe_num] += self.num_disks - 1
+
+        self.disk_status[failed_disk] = 1  # Mark the disk as healthy after recovery
+        if self.rebuild_disk == failed_disk:
+            self.rebuild_disk = None  # Supersedes a throttled rebuild of the same disk
+            self.rebuild_watermark = 0
+        self.read_cache.clear()
+        self.num_of_fail_disks = self.disk_status.count(0)
+        if level >= log.SUMMARY:
+            print(f"✅ Disk {failed_disk} successfully recovered.")
+            rate = self.num_stripes / elapsed if elapsed > 0 else float("inf")
+            print(f"⚡ Rebuilt {self.num_stripes} stripes in {elapsed * 1e3:.2f} ms ({rate:,.0f} stripes/s, "
+                  f"{'NumPy' if np is not None else 'packed ints'})")
+            if lost_blocks:
+                print(f"❌ {lost_blocks} blocks lost to uncorrectable errors on the other disks")
+        self.print_disk_state()
+        if level >= log.SUMMARY:
+            print("\n✅ RAID 5 System is Stable.")
+
+    def handle_read_request(self):
+        """
+        Serves the read at the head of the read buffer.
+        Returns:
+            int: the 16-bit word read, or None if there was nothing to read or the data was lost
+        """
+        if len(self.read_buffer) > 0 and self.read_sys_is_ready == 1:
+            self.read_sys_is_ready = 0  # System is busy with a read operation
+            self.request_started = time.perf_counter()
+
+            req = self.read_buffer.peek()  # Dequeue the first request
+            address = req['address']
+            # Identify disk positions
+            stripe_num, D0_disk, D1_disk, P0_disk = self.locate(address)
+
+            level = log.level
+            if level >= log.REQUEST:
+                print(f"\n📖 Processing Read Request at Address: {format_address(address, self.address_bits)} "
+                      f"(Stripe {stripe_num})")
+
+            if self.forward_reads and address % self.capacity in self.pending_by_word:
+                # Newest write to this word issued before the read and not yet on the disks
+                for entry in reversed(self.pending_by_word[address % self.capacity]):
+                    if entry['seq'] < req['seq']:
+                        self.read_buffer_hits += 1
+                        if level >= log.REQUEST:
+                            print(f"✅ Read Complete (write buffer hit). Data at Address "
+                                  f"{format_address(address, self.address_bits)}: {format_data(entry['data'])}")
+                        if self.run_log is not None:
+                            self.run_log.log_read(address, entry['data'], FLAG_BUFFER_HIT, stripe_num, D0_disk,
+                                                  D1_disk, P0_disk)
+                        self.complete_read_request()
+                        return entry['data']
+
+            if self.read_cache_size:
+                data = self.read_cache.get(address % self.capacity)
+                if data is not None:
+                    self.read_cache.move_to_end(address % self.capacity)
+                    self.read_cache_hits += 1
+                    if level >= log.REQUEST:
+                        print(f"✅ Read Complete (cache hit). Data at Address "
+                              f"{format_address(address, self.address_bits)}: {format_data(data)}")
+                    if self.run_log is not None:
+                        self.run_log.log_read(address, data, FLAG_CACHE_HIT, stripe_num, D0_disk, D1_disk, P0_disk)
+                    self.complete_read_request()
+                    return data
+                self.read_cache_misses += 1
+
+            # Check how many disks are healthy
+            self.num_of_fail_disks = self.disk_status.count(0)
+
+            if self.num_of_fail_disks > 1:
+                self.failed_reads += 1
+                if level >= log.SUMMARY:
+                    print("❌ ERROR: Too many disk failures. System cannot recover data.")
+
+                    # Identify and print all failed disks
+                    failed_disks = [i for i, status in enumerate(self.disk_status) if status == 0]
+                    print(f"💥 Failed Disks: {', '.join(map(str, failed_disks))}")
+                if self.run_log is not None:
+                    self.run_log.log_read(address, None, FLAG_FAILED, stripe_num, D0_disk, D1_disk, P0_disk)
+                self.complete_read_request()
+                return
+
+            read_flags = 0  # For the run log
+            if self.num_of_fail_disks == 0:
+                if level >= log.TRACE:
+                    print("✅ All disks are healthy. Performing Hamming ECC check...")
+                D0_block = self.disks[D0_disk][stripe_num]
+                D1_block = self.disks[D1_disk][stripe_num]
+                self.read_count_per_disk[D0_disk] += 1
+                self.read_count_per_disk[D1_disk] += 1
+                if self.verify_parity_on_read:
+                    parity = D0_block ^ D1_block
+                    for disk in range(self.num_disks):
+                        if disk != D0_disk and disk != D1_disk:
+                            parity ^= self.disks[disk][stripe_num]
+                            self.read_count_per_disk[disk] += 1
+                    if parity:
+                        self.parity_mismatches += 1
+                        read_flags = FLAG_PARITY_MISMATCH
+                        if level >= log.REQUEST:
+                            print(f"⚠️ Parity mismatch in Stripe {stripe_num}")
+                if self.read_count_per_stripe is not None:
+                    self.read_count_per_stripe[stripe_num] += self.num_disks if self.verify_parity_on_read else 2
+            else:
+                # Degraded read: a block on the failed disk is reconstructed from the other blocks and the parity
+                start = time.perf_counter()
+                reads_before = sum(self.read_count_per_disk)
+                if level >= log.REQUEST:
+                    print("🛡️ One disk failure detected. Reading in degraded mode...")
+                read_flags = FLAG_DEGRADED
+                lost_before = self.lost_blocks
+                D0_block = self.read_block(D0_disk, stripe_num)
+                if self.lost_blocks != lost_before:
+                    read_flags |= FLAG_D0_UNCORRECTABLE  # Reconstructed from a survivor with a DBE
+                lost_before = self.lost_blocks
+                D1_block = self.read_block(D1_disk, stripe_num)
+                if self.lost_blocks != lost_before:
+                    read_flags |= FLAG_D1_UNCORRECTABLE
+                if not (self.block_available(D0_disk, stripe_num) and self.block_available(D1_disk, stripe_num)):
+                    read_flags |= FLAG_RECONSTRUCTED
+                    if level >= log.TRACE:
+                        print(f"🔹 Reconstructed from the surviving blocks and parity: "
+                              f"D0_enc {format_block(D0_block)}, D1_enc {format_block(D1_block)}")
+
+            # Normal ECC check and decoding
+            # One table lookup per block gives the check result, the corrected codeword and the decoded byte
+            D0_status, D0_enc, D0_dec = Hamming_lookup(D0_block)
+            D1_status, D1_enc, D1_dec = Hamming_lookup(D1_block)
+
+            if D0_status == SBE and self.block_available(D0_disk, stripe_num):
+                read_flags |= FLAG_D0_CORRECTED
+                self.disks[D0_disk][stripe_num] = D0_enc
+                self.metrics.record(ECC_CORRECTION, D0_disk, stripe_num)
+                if level >= log.REQUEST:
+                    print("⚠️ Single-Bit Error detected in D0_enc. Correcting...")
+                    print("🛠️ Fixing single-bit error...")
+                    print("✅ D0_enc corrected and written back.")
+            elif D0_status == DBE and self.block_available(D0_disk, stripe_num):
+                # The Hamming code cannot correct it: rebuild the block from the rest of the stripe
+                read_flags |= FLAG_D0_UNCORRECTABLE
+                repaired = self.repair_block(D0_disk, stripe_num)
+                if repaired is not None:
+                    read_flags |= FLAG_D0_CORRECTED
+                    D0_status, D0_enc, D0_dec = Hamming_lookup(repaired)
+            if read_flags & FLAG_D0_UNCORRECTABLE and level >= log.REQUEST:
+                if read_flags & FLAG_D0_CORRECTED:
+                    print("❌ Uncorrectable error detected in D0_enc. Rebuilding it from the rest of the stripe...")
+                    print("✅ D0_enc rebuilt and written back.")
+                else:
+                    print("❌ Uncorrectable error detected in D0_enc. The data is lost.")
+
+            if D1_status == SBE and self.block_available(D1_disk, stripe_num):
+                read_flags |= FLAG_D1_CORRECTED
+                self.disks[D1_disk][stripe_num] = D1_enc
+                self.metrics.record(ECC_CORRECTION, D1_disk, stripe_num)
+                if level >= log.REQUEST:
+                    print("⚠️ Single-Bit Error detected in D1_enc. Correcting...")
+                    print("🛠️ Fixing single-bit error...")
+                    print("✅ D1_enc corrected and written back.")
+            elif D1_status == DBE and self.block_available(D1_disk, stripe_num):
+                read_flags |= FLAG_D1_UNCORRECTABLE
+                repaired = self.repair_block(D1_disk, stripe_num)
+                if repaired is not None:
+                    read_flags |= FLAG_D1_CORRECTED
+                    D1_status, D1_enc, D1_dec = Hamming_lookup(repaired)
+            if read_flags & FLAG_D1_UNCORRECTABLE and level >= log.REQUEST:
+                if read_flags & FLAG_D1_CORRECTED:
+                    print("❌ Uncorrectable error detected in D1_enc. Rebuilding it from the rest of the stripe...")
+                    print("✅ D1_enc rebuilt and written back.")
+                else:
+                    print("❌ Uncorrectable error detected in D1_enc. The data is lost.")
+
+            if self.num_of_fail_disks:
+                self.degraded_reads += 1
+                self.metrics.record(DEGRADED_READ, self.disk_status.index(0), stripe_num)
+                self.degraded_read_ios += sum(self.read_count_per_disk) - reads_before
+                self.degraded_time += time.perf_counter() - start
+
+            lost = (read_flags & FLAG_D0_UNCORRECTABLE and not read_flags & FLAG_D0_CORRECTED
+                    or read_flags & FLAG_D1_UNCORRECTABLE and not read_flags & FLAG_D1_CORRECTED)
+            if lost:
+                data = None  # Whatever the blocks decode to now is not what was written
+                self.lost_reads += 1
+                if level >= log.REQUEST:
+                    print(f"❌ Read Failed. Data at Address {format_address(address, self.address_bits)} is lost.")
+            else:
+                data = (D0_dec << 8) | D1_dec
+                if self.read_cache_size:
+                    self.cache_read(address % self.capacity, data)
+                if level >= log.REQUEST:
+                    print(f"✅ Read Complete. Data at Address {format_address(address, self.address_bits)}: "
+                          f"{format_data(data)}")
+
+            if self.run_log is not None:
+                self.run_log.log_read(address, data, read_flags, stripe_num, D0_disk, D1_disk, P0_disk,
+                                      D0_block, D1_block)
+            self.complete_read_request()
+            return data
+
+    def complete_read_request(self):
+        self.read_buffer.pop()
+        self.read_sys_is_ready = 1
+        self.metrics.record_time(READ_REQUEST, time.perf_counter() - self.request_started)
+        if self.background_tasks:
+            self.run_background_tasks()
+
+    def run_background_tasks(self):
+        for task in self.background_tasks:
+            task.on_request()
+
+    def reset_disk(self, disk_index):
+        """
+        Resets all blocks on a specific disk.
+        Args:
+            disk_index (int):
+        """
+
+        if 0 <= disk_index < self.num_disks:
+            self.storage.reset_disk(disk_index)
+            self.read_cache.clear()
+            if log.level >= log.REQUEST:
+                print(f"🔄 Disk {disk_index} has been reset. All blocks are now zero.")
+            self.print_disk_state()
+        else:
+            if log.level >= log.SUMMARY:
+                print(f"❌ Invalid disk index: {disk_index}. Please provide a valid disk index (0-{self.num_disks - 1}).")
+
+    def simulate_single_bit_error(self):
+        """
+        Simulate a Single Bit Error (SBE) in each stripe with varying bit positions.
+        """
+        error_bit_position = 0  # # We will start from bit 0 and continue through each strip
+
+        level = log.level
+        if level >= log.SUMMARY:
+            print("\n🛠️ Simulating Single Bit Error in each Stripe:")
+        for stripe_num in range(self.num_stripes):
+            data_disks = self.data_disks_of(stripe_num)[:2 * self.words_per_stripe]
+
+            # # Select data disk circularly
+            error_disk = data_disks[stripe_num % len(data_disks)]
+
+            if level >= log.REQUEST:
+                print(f"\n🔄 Stripe {stripe_num}: Injecting Error in Disk {error_disk}, Bit Position {error_bit_position}")
+            if level >= log.TRACE:
+                print(f"🔹 Before Error: {format_block(self.disks[error_disk][stripe_num])}")
+
+            # Flip the corresponded bit (bit list position p is bit 11 - p of the packed codeword).
+            self.disks[error_disk][stripe_num] ^= 1 << (BLOCK_SIZE - 1 - error_bit_position % BLOCK_SIZE)
+            self.invalidate_stripe(stripe_num)
+
+            if level >= log.TRACE:
+                print(f"🔹 After Error:  {format_block(self.disks[error_disk][stripe_num])}")
+
+            # Update the bit position for the next error
+            error_bit_position = (error_bit_position + 1) % BLOCK_SIZE
+
+        if level >= log.SUMMARY:
+            print("\n✅ Single Bit Error Simulation Completed.")
+
+    def simulate_single_bit_error_D0_D1(self):
+        """
+        Simulate a Single Bit Error (SBE) in both D0_enc and D1_enc for each stripe.
+        """
+        error_bit_position_D0 = 0  # Error bit position for D0
+        error_bit_position_D1 = 1  # Error bit position for D1 (different from D0)
+
+        level = log.level
+        if level >= log.SUMMARY:
+            print("\n🛠️ Simulating Single Bit Error in D0_enc and D1_enc for each Stripe:")
+        for stripe_num in range(self.num_stripes):
+            # Data disks of the stripe, in word slot order
+            data_disks = self.data_disks_of(stripe_num)
+
+            if level >= log.REQUEST:
+                print(f"\n🔄 Stripe {stripe_num}:")
+
+            # Every word of the stripe: D0 and D1 are its two data blocks
+            for slot in range(self.words_per_stripe):
+                D0_disk = data_disks[2 * slot]
+                D1_disk = data_disks[2 * slot + 1]
+
+                # Creating an error in D0
+                if level >= log.REQUEST:
+                    print(f"🔹 Injecting Error in Disk {D0_disk} (D0_enc), Bit Position {error_bit_position_D0}")
+                if level >= log.TRACE:
+                    print(f"   Before Error (D0): {format_block(self.disks[D0_disk][stripe_num])}")
+                self.disks[D0_disk][stripe_num] ^= 1 << (BLOCK_SIZE - 1 - error_bit_position_D0 % BLOCK_SIZE)  # Toggle the bit
+                if level >= log.TRACE:
+                    print(f"   After Error (D0):  {format_block(self.disks[D0_disk][stripe_num])}")
+
+                # Creating an error in D1
+                if level >= log.REQUEST:
+                    print(f"🔹 Injecting Error in Disk {D1_disk} (D1_enc), Bit Position {error_bit_position_D1}")
+                if level >= log.TRACE:
+                    print(f"   Before Error (D1): {format_block(self.disks[D1_disk][stripe_num])}")
+                self.disks[D1_disk][stripe_num] ^= 1 << (BLOCK_SIZE - 1 - error_bit_position_D1 % BLOCK_SIZE)  # Toggle the bit
+                if level >= log.TRACE:
+                    print(f"   After Error (D1):  {format_block(self.disks[D1_disk][stripe_num])}")
+
+            self.invalidate_stripe(stripe_num)
+
+            # Updating bit positions
+            error_bit_position_D0 = (error_bit_position_D0 + 1) % BLOCK_SIZE
+            error_bit_position_D1 = (error_bit_position_D1 + 1) % BLOCK_SIZE
+
+        if level >= log.SUMMARY:
+            print("\n✅ Single Bit Error Simulation for D0_enc and D1_enc Completed.")
+
+    def simulate_random_write_requests(self, num_requests, log_level=None):
+        """
+        Args:
+            log_level: verbosity for this run (see sim_logging.py). Defaults to QUIET for large runs.
+        """
+
+        previous_level = log.set_level(log.level_for_simulation(num_requests, log_level))
+        try:
+            for disk_index in range(self.num_disks):
+                self.reset_disk(disk_index)
+            self.write_buffer.clear()
+            self.pending_writes.clear()
+            self.pending_by_word.clear()
+
+            for i in range(num_requests):
+                address = self.rng.randint(0, self.capacity - 1)
+                data = self.rng.randint(0, 0xFFFF)
+
+                self.add_write_request(address, data)
+
+            while len(self.write_buffer) > 0:
+                self.handle_write_request()
+
+            if log.level >= log.SUMMARY:
+                print("✅ Dynamic Write Simulation Completed.")
+        finally:
+            log.set_level(previous_level)
+
+    def print_write_counters(self):
+        if log.level < log.SUMMARY:
+            return
+        print("\n📊 Write Counters Summary:")
+        print("Disk Write Counts:")
+        for i, count in enumerate(self.write_count_per_disk):
+            print(f"Disk {i}: {count} writes")
+
+        print("\nBlock Write Counts per Disk:")
+        for i, block_counts in enumerate(self.write_count_per_block):
+            print(f"Disk {i}: {list(block_counts)}")
+
+        print("\nDisk Read Counts:")
+        for i, count in enumerate(self.read_count_per_disk):
+            print(f"Disk {i}: {count} reads")
+        print(f"\nSmall-write parity updates: {self.read_modify_writes} read-modify-write, "
+              f"{self.reconstruct_writes} reconstruct-write")
+        print(f"Parity block writes: {self.metrics.total(PARITY_WRITE)}, "
+              f"data block writes skipped: {self.metrics.total(SKIPPED_WRITE)}, "
+              f"ECC corrections: {self.metrics.total(ECC_CORRECTION)}")
+        if self.metrics.total(UNCORRECTABLE_ERROR) or self.lost_blocks:
+            print(f"❌ Uncorrectable errors: {self.metrics.total(UNCORRECTABLE_ERROR)}, blocks lost: {self.lost_blocks}, "
+                  f"reads failed: {self.lost_reads}")
+        if self.verify_parity_on_read:
+            print(f"Parity mismatches found on read: {self.parity_mismatches}")
+        if self.wrapped_addresses:
+            print(f"⚠️ Requests whose address wrapped onto the capacity: {self.wrapped_addresses}")
+        if self.read_buffer_hits:
+            print(f"\n📖 Reads served from the write buffer: {self.read_buffer_hits}")
+        if self.degraded_reads or self.degraded_writes or self.failed_reads or self.failed_writes:
+            degraded_requests = self.degraded_reads + self.degraded_writes
+            print(f"\n🛡️ Degraded mode: {self.degraded_reads} reads, {self.degraded_writes} writes, "
+                  f"{self.reconstructed_blocks} blocks reconstructed, {self.degraded_write_skips} block writes dropped")
+            if self.degraded_reads:
+                print(f"Disk reads per degraded read: {self.degraded_read_ios / self.degraded_reads:.2f}")
+            if degraded_requests:
+                print(f"Average degraded request latency: {self.degraded_time / degraded_requests * 1e6:.2f} µs")
+            if self.failed_reads or self.failed_writes:
+                print(f"❌ Failed with more than one disk down: {self.failed_reads} reads, {self.failed_writes} writes")
+        if self.read_cache_size:
+            print(f"\n🗃️ Read cache ({len(self.read_cache)}/{self.read_cache_size} words): {self.read_cache_hits} hits, "
+                  f"{self.read_cache_misses} misses, {self.read_cache_evictions} evictions")
+        if self.coalesce_writes:
+            print(f"\n🔗 Coalesced writes: {self.coalesced_writes} requests merged, "
+                  f"{self.coalesced_disk_writes_avoided} disk writes avoided "
+                  f"({self.coalesced_parity_writes_avoided} parity writes)")
+
+    def reset_write_counters(self):
+        """
+        Reset the write counters for disks and blocks and the read counters (in place, so aliases stay valid).
+        """
+
+        self.metrics.reset()  # Includes write_count_per_disk and read_count_per_disk
+
+        self.storage.reset_block_counters()
+        self.redundant_write_skips = 0
+        self.partial_write_skips = 0
+        self.parity_mismatches = 0
+        self.wrapped_addresses = 0
+        self.read_modify_writes = 0
+        self.reconstruct_writes = 0
+        self.coalesced_writes = 0
+        self.coalesced_disk_writes_avoided = 0
+        self.coalesced_parity_writes_avoided = 0
+        self.read_buffer_hits = 0
+        self.read_cache_hits = 0
+        self.read_cache_misses = 0
+        self.read_cache_evictions = 0
+        self.degraded_reads = 0
+        self.degraded_writes = 0
+        self.failed_reads = 0
+        self.failed_writes = 0
+        self.degraded_write_skips = 0
+        self.reconstructed_blocks = 0
+        self.lost_blocks = 0
+        self.lost_reads = 0
+        self.degraded_read_ios = 0
+        self.degraded_time = 0.0
+
+        if log.level >= log.SUMMARY:
+            print("🔄 Write counters have been reset.")
+
+    def simulate_mixed_write_distribution(self, num_requests, log_level=None, rewrite_ratio=0.25):
+        """
+        Simulation of writes that are 75% writes with new information and 25% of the writes are repeated writes in block D0 or block D1 randomly.
+        Args:
+            log_level: verbosity for this run (see sim_logging.py). Defaults to QUIET for large runs.
+            rewrite_ratio (float): fraction of repeated writes, spread evenly (0.25 = every 4th request)
+        """
+
+        previous_level = log.set_level(log.level_for_simulation(num_requests, log_level))
+        level = log.level
+        try:
+            for disk_index in range(self.num_disks):
+                self.reset_disk(disk_index)
+            self.write_buffer.clear()
+            self.pending_writes.clear()
+            self.pending_by_word.clear()
+
+            previous_D0 = self.rng.randint(0, 0xFF)
+            previous_D1 = self.rng.randint(0, 0xFF)
+            previous_address = self.rng.randint(0, self.capacity - 1)
+
+            if level >= log.SUMMARY:
+                print(f"\n📝 Simulating Mixed Write Distribution ({100 - rewrite_ratio * 100:g}% Random, "
+                      f"{rewrite_ratio * 100:g}% Pattern-Based Repeated)...")
+
+            for i in range(1, num_requests + 1):
+                # Request i is a rewrite whenever i * rewrite_ratio crosses an integer
+                if int(i * rewrite_ratio) > int((i - 1) * rewrite_ratio):
+                    # Rewrite request
+                    address = previous_address
+                    if self.rng.random() < 0.5:
+                        # Change in D0, D1 remains the same
+                        data = (self.rng.randint(0, 0xFF) << 8) | previous_D1
+                    else:
+                        # Change in D1, D0 remains the same
+                        data = (previous_D0 << 8) | self.rng.randint(0, 0xFF)
+                    if level >= log.REQUEST:
+                        print(f"🔄 Repeated Write: Address: {address}, Data: {format_data(data)}")
+                else:
+                    # Random write request
+                    address = self.rng.randint(0, self.capacity - 1)
+                    data = self.rng.randint(0, 0xFFFF)
+                    previous_D0 = (data >> 8) & 0xFF
+                    previous_D1 = data & 0xFF
+                    previous_address = address
+                    if level >= log.REQUEST:
+                        print(f"✨ Random Write: Address: {address}, Data: {format_data(data)}")
+
+                self.add_write_request(address, data)
+
+            while len(self.write_buffer) > 0:
+                self.handle_write_request()
+
+            if level >= log.SUMMARY:
+                print("✅ Mixed Write Simulation Completed.")
+        finally:
+            log.set_level(previous_level)
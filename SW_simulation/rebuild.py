@@ -0,0 +1,188 @@
+# Resumable, throttled rebuild of a failed disk
+#
+# RAID5_recovery() rebuilds the whole disk in one blocking loop. The RebuildEngine instead runs as a
+# background task of the array (like scrubber.PatrolScrubber): every tick_interval foreground requests it
+# rebuilds up to stripes_per_tick stripes, so the two knobs split the disk bandwidth between rebuild and
+# foreground I/O. Progress is a watermark:
+#   stripes below the watermark are rebuilt: reads and writes use the replacement disk again
+#   stripes at or above it are still degraded: reads reconstruct the block on the fly, writes skip it
+# Stripes that stripe_valid marks as never written hold no data and are passed over without any I/O.
+#
+# Usage:
+#   engine = RebuildEngine(array, stripes_per_tick=2, tick_interval=4)
+#   engine.start()              # the (single) failed disk, rebuilt onto a blank replacement
+#   ... run the workload ...    # engine.pause() / engine.resume() at any time
+#   engine.print_report()
+# An interrupted rebuild can be continued with start(disk, watermark=engine.watermark, replace=False).
+import time
+
+import sim_logging as log
+
+
+class RebuildEngine:
+    """
+    Args:
+        array (RaidArray): the array with the failed disk
+        stripes_per_tick (int): rebuild budget, in written stripes per tick
+        tick_interval (int): foreground requests between two ticks
+    """
+    __slots__ = ("array", "stripes_per_tick", "tick_interval", "disk", "paused", "done", "requests_since_tick",
+                 "ticks", "stripes_rebuilt", "stripes_skipped", "stripes_lost", "stalled_ticks", "rebuild_time",
+                 "foreground_requests", "degraded_reads_at_start")
+
+    def __init__(self, array, stripes_per_tick=1, tick_interval=1):
+        if stripes_per_tick < 1 or tick_interval < 1:
+            raise ValueError("stripes_per_tick and tick_interval must be at least 1.")
+        self.array = array
+        self.stripes_per_tick = stripes_per_tick
+        self.tick_interval = tick_interval
+        self.disk = None
+        self.paused = False
+        self.done = False
+        self.requests_since_tick = 0
+
+        self.ticks = 0
+        self.stripes_rebuilt = 0
+        self.stripes_skipped = 0  # Never-written stripes passed over
+        self.stripes_lost = 0  # Stripes with an uncorrectable error on a survivor: their block is written as 0
+        self.stalled_ticks = 0  # Ticks without progress because another disk failed
+        self.rebuild_time = 0.0  # Seconds spent rebuilding, i.e. the delay added to the foreground requests
+        self.foreground_requests = 0  # Foreground requests served while the rebuild ran
+        self.degraded_reads_at_start = 0
+
+    @property
+    def watermark(self):
+        return self.array.rebuild_watermark
+
+    def start(self, disk=None, watermark=0, replace=True):
+        """
+        Starts (or resumes from a saved watermark) the rebuild of a failed disk.
+        Args:
+            disk (int): the disk to rebuild; defaults to the only failed disk
+            watermark (int): first stripe still to rebuild
+            replace (bool): blank the disk first, as a new replacement drive would be
+        """
+        array = self.array
+        failed_disks = [i for i, status in enumerate(array.disk_status) if status == 0]
+        if disk is None:
+            if len(failed_disks) != 1:
+                raise ValueError(f"Expected exactly one failed disk, found {failed_disks}.")
+            disk = failed_disks[0]
+        elif disk not in failed_disks:
+            raise ValueError(f"Disk {disk} has not failed.")
+
+        if replace:
+            array.storage.reset_disk(disk)
+        self.disk = disk
+        self.done = False
+        self.paused = False
+        array.rebuild_disk = disk
+        array.rebuild_watermark = watermark
+        self.degraded_reads_at_start = array.degraded_reads
+        if self not in array.background_tasks:
+            array.background_tasks.append(self)
+        if log.level >= log.SUMMARY:
+            print(f"\n🛠️ Rebuild of Disk {disk} started at Stripe {watermark}.")
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def on_request(self):
+        """
+        Called by the array after every foreground request.
+        """
+        self.foreground_requests += 1
+        self.requests_since_tick += 1
+        if self.requests_since_tick >= self.tick_interval:
+            self.requests_since_tick = 0
+            if not self.paused:
+                self.tick()
+
+    def tick(self):
+        """
+        Advances the watermark over up to stripes_per_tick written stripes (never-written ones are free).
+        """
+        array = self.array
+        if self.done:
+            return
+        if array.rebuild_disk != self.disk:
+            self.done = True  # Recovered by RAID5_recovery() in the meantime
+            if self in array.background_tasks:
+                array.background_tasks.remove(self)
+            return
+        if array.disk_status.count(0) > 1:
+            self.stalled_ticks += 1  # Another disk failed: nothing left to rebuild from
+            return
+
+        start = time.perf_counter()
+        budget = self.stripes_per_tick
+        while budget and array.rebuild_watermark < array.num_stripes:
+            stripe_num = array.rebuild_watermark
+            if array.stripe_valid[stripe_num] == 0:
+                array.rebuild_watermark += 1
+                self.stripes_skipped += 1
+                continue
+            block = array.stripe_xor(self.disk, stripe_num)
+            if block is None:
+                block = 0
+                array.lost_blocks += 1
+                self.stripes_lost += 1
+                if log.level >= log.REQUEST:
+                    print(f"❌ Uncorrectable error in Stripe {stripe_num}: its block on Disk {self.disk} is lost")
+            # Move the watermark first: write_block only writes to the rebuilding disk below it
+            array.rebuild_watermark += 1
+            array.write_block(self.disk, stripe_num, block)
+            self.stripes_rebuilt += 1
+            budget -= 1
+            if log.level >= log.TRACE:
+                print(f"✅ Rebuilt Stripe {stripe_num} on Disk {self.disk}")
+        self.rebuild_time += time.perf_counter() - start
+        self.ticks += 1
+
+        if array.rebuild_watermark >= array.num_stripes:
+            self.finish()
+
+    def run(self):
+        """
+        Rebuilds the rest of the disk now, without throttling.
+        """
+        while not self.done and self.array.disk_status.count(0) == 1:
+            self.tick()
+
+    def finish(self):
+        array = self.array
+        array.disk_status[self.disk] = 1  # Mark the disk as healthy after the rebuild
+        array.num_of_fail_disks = array.disk_status.count(0)
+        array.rebuild_disk = None
+        array.rebuild_watermark = 0
+        if self in array.background_tasks:
+            array.background_tasks.remove(self)
+        self.done = True
+        if log.level >= log.SUMMARY:
+            print(f"✅ Disk {self.disk} successfully rebuilt.")
+
+    def progress(self):
+        """
+        Fraction of the stripes behind the watermark.
+        """
+        if self.done:
+            return 1.0
+        return self.array.rebuild_watermark / self.array.num_stripes
+
+    def print_report(self):
+        if log.level < log.SUMMARY:
+            return
+        state = "complete" if self.done else ("paused" if self.paused else "running")
+        print(f"\n🛠️ Rebuild Summary (Disk {self.disk}, {state}, {self.progress() * 100:.1f}%):")
+        print(f"Stripes rebuilt: {self.stripes_rebuilt}, never-written stripes skipped: {self.stripes_skipped}")
+        if self.stripes_lost:
+            print(f"❌ Stripes lost to uncorrectable errors: {self.stripes_lost}")
+        print(f"Ticks: {self.ticks} over {self.foreground_requests} foreground requests"
+              + (f", {self.stalled_ticks} stalled" if self.stalled_ticks else ""))
+        per_request = self.rebuild_time / self.foreground_requests * 1e6 if self.foreground_requests else 0.0
+        print(f"Rebuild time: {self.rebuild_time * 1e3:.2f} ms, "
+              f"{per_request:.2f} µs added per foreground request")
+        print(f"Degraded reads during the rebuild: {self.array.degraded_reads - self.degraded_reads_at_start}")
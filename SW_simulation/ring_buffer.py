@@ -0,0 +1,71 @@
+# Fixed-capacity FIFO ring buffer used for the write and read request queues
+
+
+class RingBuffer:
+    """
+    Fixed-capacity FIFO queue over a preallocated slot list.
+    push() and pop() only move the tail/head indices, so both are O(1) regardless of the capacity.
+    """
+    __slots__ = ("capacity", "slots", "head", "tail", "count")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0  # index of the oldest request
+        self.tail = 0  # index where the next request is stored
+        self.count = 0  # the number of requests the buffer holds now
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """
+        FIFO-order access: buffer[0] is the oldest request.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError("ring buffer index out of range")
+        return self.slots[(self.head + index) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.slots[(self.head + i) % self.capacity]
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+    def push(self, item):
+        """
+        Adds a request at the tail.
+        Returns:
+            bool: False if the buffer is full and the request was rejected
+        """
+        if self.count >= self.capacity:
+            return False
+        self.slots[self.tail] = item
+        self.tail += 1
+        if self.tail == self.capacity:
+            self.tail = 0
+        self.count += 1
+        return True
+
+    def peek(self):
+        return self.slots[self.head] if self.count else None
+
+    def pop(self):
+        """
+        Removes and returns the oldest request (None if the buffer is empty).
+        """
+        if self.count == 0:
+            return None
+        item = self.slots[self.head]
+        self.slots[self.head] = None  # Clear the freed slot
+        self.head += 1
+        if self.head == self.capacity:
+            self.head = 0
+        self.count -= 1
+        return item
+
+    def clear(self):
+        for i in range(self.count):
+            self.slots[(self.head + i) % self.capacity] = None
+        self.head = self.tail = self.count = 0
@@ -0,0 +1,264 @@
+# Compact binary run log
+#
+# The REQUEST/TRACE text output costs more than the simulation itself on large runs and produces files
+# nobody can load. A RunLog attached to an array records one fixed-size binary record per handled request
+# instead; read_run_log() iterates over the records and render_text() turns them back into the
+# per-request lines of the TRACE console output on demand (buffer listings, disk-state dumps and
+# summaries are not part of the log).
+#
+# File layout: MAGIC, a HEADER (num_disks, address_bits) and then RECORD after RECORD (little-endian):
+#   op, flags (FLAG_*: what the write or read path did), written (WROTE_*: the blocks the write path chose to
+#   write, dropped ones included), address, data, stripe, D0/D1/P disk, failed disks (bit mask), D0/D1/P
+#   codewords, old D0/D1 codewords.
+# Writes store the codewords written, the parity computed for them and the old data codewords they replaced;
+# reads store the D0/D1 codewords as read, before ECC correction. The flags are set by the array where it
+# takes each decision, never inferred from its counters.
+#
+# Usage:
+#   with RunLog("run.log", array):          # attaches itself to array.run_log
+#       array.simulate_mixed_write_distribution(100000)
+#   python run_log.py run.log [--out run.txt]  # render as text
+import argparse
+import struct
+import sys
+from collections import namedtuple
+
+from hamming import DECODE_TABLE
+from sim_logging import format_block, format_address, format_data
+
+MAGIC = b"RAIDLOG\x02"
+HEADER = struct.Struct("<HH")
+RECORD = struct.Struct("<BHBQHIHHHQHHHHH")
+MAX_DISKS = 64  # Failed disks are stored as a 64-bit mask
+BUFFER_RECORDS = 4096  # Records packed in memory before a file write
+
+READ = 0
+WRITE = 1
+
+# flags
+FLAG_D0_CORRECTED = 1  # Single-bit error in D0 corrected (or uncorrectable D0 rebuilt) and written back
+FLAG_D1_CORRECTED = 2
+FLAG_SKIPPED = 4  # Redundant write: the data was already on disk
+FLAG_DEGRADED = 8  # Write committed / read served from the disks with one disk failed
+FLAG_FAILED = 16  # More than one disk failed: data lost / write not done
+FLAG_BUFFER_HIT = 32  # Read served from a pending write
+FLAG_CACHE_HIT = 64  # Read served from the read cache
+FLAG_FULL_STRIPE = 128  # First write to the stripe: full-stripe write
+FLAG_READ_MODIFY_WRITE = 256  # Parity updated from the old parity block (else from the whole stripe)
+FLAG_RECONSTRUCTED = 512  # Degraded read: a data block was reconstructed from the rest of the stripe
+FLAG_PARITY_MISMATCH = 1024  # verify_parity_on_read found the stripe inconsistent
+FLAG_DROPPED = 2048  # Degraded write: the block of the failed disk was not written
+FLAG_D0_UNCORRECTABLE = 4096  # D0 (or a block it was reconstructed from) had a DBE: rebuilt if D0_CORRECTED, else lost
+FLAG_D1_UNCORRECTABLE = 8192
+
+# written
+WROTE_P = 1
+WROTE_D0 = 2
+WROTE_D1 = 4
+
+LogRecord = namedtuple("LogRecord", "op flags written address data stripe D0_disk D1_disk P_disk "
+                                    "failed_disks D0 D1 P D0_old D1_old")
+
+
+class RunLog:
+    """
+    Args:
+        path (str): the log file (overwritten)
+        array (RaidArray): the array to log; the log attaches itself as array.run_log
+    """
+    __slots__ = ("file", "array", "buffer", "records")
+
+    def __init__(self, path, array):
+        if array.num_disks > MAX_DISKS:
+            raise ValueError(f"A run log supports up to {MAX_DISKS} disks, the array has {array.num_disks}.")
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + HEADER.pack(array.num_disks, array.address_bits))
+        self.array = array
+        self.buffer = []
+        self.records = 0
+        array.run_log = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, op, flags, written, address, data, stripe_num, D0_disk, D1_disk, P_disk,
+               D0=0, D1=0, P=0, D0_old=0, D1_old=0):
+        failed_disks = 0
+        for disk, status in enumerate(self.array.disk_status):
+            if status == 0:
+                failed_disks |= 1 << disk
+        self.buffer.append(RECORD.pack(op, flags, written, address, data, stripe_num, D0_disk, D1_disk, P_disk,
+                                       failed_disks, D0, D1, P, D0_old, D1_old))
+        self.records += 1
+        if len(self.buffer) >= BUFFER_RECORDS:
+            self.flush()
+
+    def log_write(self, req, flags, written, stripe_num, D0_disk, D1_disk, P_disk, D0_enc, D1_enc, P,
+                  D0_enc_old, D1_enc_old):
+        """
+        Called by handle_write_request once the write is done, with the flags and written blocks reported
+        by the write path.
+        """
+        self.append(WRITE, flags, written, req['address'], req['data'], stripe_num, D0_disk, D1_disk, P_disk,
+                    D0_enc, D1_enc, P, D0_enc_old, D1_enc_old)
+
+    def log_read(self, address, data, flags, stripe_num, D0_disk, D1_disk, P_disk, D0_block=0, D1_block=0):
+        """
+        Called by handle_read_request for every outcome (data is None when lost).
+        """
+        self.append(READ, flags, 0, address, data or 0, stripe_num, D0_disk, D1_disk, P_disk, D0_block, D1_block)
+
+    def log_failed_write(self, req):
+        stripe_num, D0_disk, D1_disk, P_disk = self.array.locate(req['address'])
+        self.append(WRITE, FLAG_FAILED, 0, req['address'], req['data'], stripe_num, D0_disk, D1_disk, P_disk)
+
+    def flush(self):
+        self.file.write(b"".join(self.buffer))
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        if self.array.run_log is self:
+            self.array.run_log = None
+
+
+def read_run_log(path):
+    """
+    Yields the LogRecords of a run log, after checking its header (see read_header() for the geometry).
+    """
+    with open(path, "rb") as file:
+        read_header(file, path)
+        chunk_size = RECORD.size * BUFFER_RECORDS
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            if len(chunk) % RECORD.size:
+                raise ValueError(f"{path}: truncated last record")
+            for fields in RECORD.iter_unpack(chunk):
+                yield LogRecord._make(fields)
+
+def read_header(file, path="run log"):
+    """
+    Returns:
+        tuple: (num_disks, address_bits)
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{path} is not a run log.")
+    return HEADER.unpack(file.read(HEADER.size))
+
+def failed_disk_list(failed_disks):
+    return ", ".join(str(disk) for disk in range(MAX_DISKS) if failed_disks >> disk & 1)
+
+def render_text(records, address_bits=8):
+    """
+    Yields the TRACE console lines of each request (what handle_write_request / handle_read_request print),
+    without the buffer listings, disk-state dumps and summaries around them.
+    """
+    for r in records:
+        address = format_address(r.address, address_bits)
+        yield ""
+        if r.op == WRITE:
+            yield f"🔄 Handling Write Request: Address: {address}, Data: {format_data(r.data)} ({r.data})"
+            if r.flags & FLAG_FAILED:
+                yield "❌ ERROR: Too many disk failures. Write request FAILED."
+                continue
+            yield f"🔹 D0 (Upper 8 bits): {format_address(r.data >> 8)} ({r.data >> 8})"
+            yield f"🔹 D1 (Lower 8 bits): {format_address(r.data & 0xFF)} ({r.data & 0xFF})"
+            yield f"🔹 D0_enc: {format_block(r.D0)} ({r.D0})"
+            yield f"🔹 D1_enc: {format_block(r.D1)} ({r.D1})"
+            degraded = f"🛡️ Disk {failed_disk_list(r.failed_disks)} failed. Writing in degraded mode..."
+            if r.flags & FLAG_FULL_STRIPE:
+                if r.flags & FLAG_DEGRADED:
+                    yield degraded
+                yield ""
+                yield f"🔄 Writing Data to Stripe {r.stripe}:"
+                yield f"🔹 D0_enc: {format_block(r.D0)} ({r.D0})"
+                yield f"🔹 D1_enc: {format_block(r.D1)} ({r.D1})"
+                yield "🛡️ Stripe is INVALID. Calculating Parity (P0)..."
+                yield f"🔄 Parity (P0): {format_block(r.P)} ({r.P})"
+                yield f"✅ Stripe {r.stripe} marked as VALID."
+                continue
+            yield f"🔹 D0_enc_old: {format_block(r.D0_old)} ({r.D0_old})"
+            yield f"🔹 D1_enc_old: {format_block(r.D1_old)} ({r.D1_old})"
+            if r.flags & FLAG_SKIPPED:
+                yield "✅ Data is identical. Skipping redundant write."
+                continue
+            if r.flags & FLAG_DEGRADED:
+                yield degraded
+            if r.flags & FLAG_READ_MODIFY_WRITE:
+                P_old = r.P ^ DECODE_TABLE[r.D0_old][1] ^ r.D0 ^ DECODE_TABLE[r.D1_old][1] ^ r.D1
+                yield f"🔹 P0_old (read-modify-write): {format_block(P_old)} ({P_old})"
+            yield f"🔄 Calculated New Parity (P0_new): {format_block(r.P)} ({r.P})"
+            if r.written & (WROTE_D0 | WROTE_D1) == WROTE_D1:
+                yield f"✍️ Writing Only: P0_new ({r.P}), D1_enc ({r.D1})"
+            elif r.written & (WROTE_D0 | WROTE_D1) == WROTE_D0:
+                yield f"✍️ Writing Only: P0_new ({r.P}), D0_enc ({r.D0})"
+            else:
+                yield f"✍️ Writing All: P0_new ({r.P}), D0_enc ({r.D0}), D1_enc ({r.D1})"
+        else:
+            yield f"📖 Processing Read Request at Address: {address} (Stripe {r.stripe})"
+            if r.flags & FLAG_BUFFER_HIT:
+                yield f"✅ Read Complete (write buffer hit). Data at Address {address}: {format_data(r.data)}"
+                continue
+            if r.flags & FLAG_CACHE_HIT:
+                yield f"✅ Read Complete (cache hit). Data at Address {address}: {format_data(r.data)}"
+                continue
+            if r.flags & FLAG_FAILED:
+                yield "❌ ERROR: Too many disk failures. System cannot recover data."
+                yield f"💥 Failed Disks: {failed_disk_list(r.failed_disks)}"
+                continue
+            if r.flags & FLAG_DEGRADED:
+                yield "🛡️ One disk failure detected. Reading in degraded mode..."
+                if r.flags & FLAG_RECONSTRUCTED:
+                    yield (f"🔹 Reconstructed from the surviving blocks and parity: "
+                           f"D0_enc {format_block(r.D0)}, D1_enc {format_block(r.D1)}")
+            else:
+                yield "✅ All disks are healthy. Performing Hamming ECC check..."
+                if r.flags & FLAG_PARITY_MISMATCH:
+                    yield f"⚠️ Parity mismatch in Stripe {r.stripe}"
+            for flag, uncorrectable, name in ((FLAG_D0_CORRECTED, FLAG_D0_UNCORRECTABLE, "D0_enc"),
+                                              (FLAG_D1_CORRECTED, FLAG_D1_UNCORRECTABLE, "D1_enc")):
+                if r.flags & uncorrectable:
+                    if r.flags & flag:
+                        yield f"❌ Uncorrectable error detected in {name}. Rebuilding it from the rest of the stripe..."
+                        yield f"✅ {name} rebuilt and written back."
+                    else:
+                        yield f"❌ Uncorrectable error detected in {name}. The data is lost."
+                elif r.flags & flag:
+                    yield f"⚠️ Single-Bit Error detected in {name}. Correcting..."
+                    yield "🛠️ Fixing single-bit error..."
+                    yield f"✅ {name} corrected and written back."
+            if (r.flags & FLAG_D0_UNCORRECTABLE and not r.flags & FLAG_D0_CORRECTED
+                    or r.flags & FLAG_D1_UNCORRECTABLE and not r.flags & FLAG_D1_CORRECTED):
+                yield f"❌ Read Failed. Data at Address {address} is lost."
+            else:
+                yield f"✅ Read Complete. Data at Address {address}: {format_data(r.data)}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a binary run log as text.")
+    parser.add_argument("log", help="run log written by RunLog")
+    parser.add_argument("--out", help="text file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.log, "rb") as file:
+        _, address_bits = read_header(file, args.log)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for line in render_text(read_run_log(args.log), address_bits):
+            out.write(line + "\n")
+    finally:
+        if args.out:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
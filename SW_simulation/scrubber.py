@@ -0,0 +1,178 @@
+# Incremental background patrol scrubber
+#
+# Reads only correct single-bit errors in the blocks they happen to touch, so cold stripes keep their
+# errors until a second flip makes them uncorrectable. The scrubber walks the stripes in order, a few per
+# tick, between foreground requests:
+#   1. Hamming check on every block of the stripe. Parity blocks are codewords too (the code is linear,
+#      so the XOR of codewords is a codeword) and get the same check. Single-bit errors are written back.
+#   2. Parity consistency: the XOR of all blocks must be 0. A mismatch left after step 1 (e.g. a
+#      miscorrected double-bit error) is repaired by rewriting the parity from the data blocks.
+#
+# Usage:
+#   scrubber = PatrolScrubber(array, stripes_per_tick=4, tick_interval=10)
+#   scrubber.attach()  # a tick after every 10th foreground request
+#   ... run the workload ...
+#   scrubber.print_report()
+import time
+
+import sim_logging as log
+from hamming import Hamming_lookup, SBE, DBE
+from metrics import ECC_CORRECTION, UNCORRECTABLE_ERROR
+
+
+class PatrolScrubber:
+    """
+    Args:
+        array (RaidArray): the array to scrub
+        stripes_per_tick (int): budget of stripes checked per tick
+        tick_interval (int): foreground requests between two ticks once attached
+    """
+    __slots__ = ("array", "stripes_per_tick", "tick_interval", "cursor", "requests_since_tick",
+                 "ticks", "passes", "stripes_scrubbed", "stripes_in_pass", "blocks_checked", "sbe_repairs",
+                 "dbe_repairs", "lost_blocks", "parity_repairs", "skipped_ticks", "scrub_time", "foreground_requests")
+
+    def __init__(self, array, stripes_per_tick=1, tick_interval=1):
+        if stripes_per_tick < 1 or tick_interval < 1:
+            raise ValueError("stripes_per_tick and tick_interval must be at least 1.")
+        self.array = array
+        self.stripes_per_tick = stripes_per_tick
+        self.tick_interval = tick_interval
+        self.cursor = 0  # Next stripe to scrub
+        self.requests_since_tick = 0
+
+        self.ticks = 0
+        self.passes = 0  # Completed walks over all stripes
+        self.stripes_scrubbed = 0
+        self.stripes_in_pass = 0  # Stripes scrubbed in the current pass
+        self.blocks_checked = 0
+        self.sbe_repairs = 0  # Single-bit errors corrected and written back
+        self.dbe_repairs = 0  # Uncorrectable blocks rebuilt from the rest of their stripe
+        self.lost_blocks = 0  # Uncorrectable blocks in a stripe with more than one of them, left as they are
+        self.parity_repairs = 0  # Inconsistent stripes whose parity was rewritten
+        self.skipped_ticks = 0  # Ticks skipped because a disk has failed
+        self.scrub_time = 0.0  # Seconds spent scrubbing, i.e. the delay added to the foreground requests
+        self.foreground_requests = 0  # Foreground requests seen while attached
+
+    def attach(self):
+        if self not in self.array.background_tasks:
+            self.array.background_tasks.append(self)
+
+    def detach(self):
+        if self in self.array.background_tasks:
+            self.array.background_tasks.remove(self)
+
+    def on_request(self):
+        """
+        Called by the array after every foreground request.
+        """
+        self.foreground_requests += 1
+        self.requests_since_tick += 1
+        if self.requests_since_tick >= self.tick_interval:
+            self.requests_since_tick = 0
+            self.tick()
+
+    def tick(self):
+        """
+        Scrubs the next stripes_per_tick stripes. Does nothing while a disk is failed, since the parity
+        check needs every block.
+        """
+        array = self.array
+        if 0 in array.disk_status:
+            self.skipped_ticks += 1
+            return
+
+        start = time.perf_counter()
+        for _ in range(min(self.stripes_per_tick, array.num_stripes)):
+            self.scrub_stripe(self.cursor)
+            self.cursor += 1
+            self.stripes_in_pass += 1
+            if self.cursor == array.num_stripes:
+                self.cursor = 0
+                self.stripes_in_pass = 0
+                self.passes += 1
+                if log.level >= log.REQUEST:
+                    print(f"🧹 Scrub pass {self.passes} complete.")
+        self.scrub_time += time.perf_counter() - start
+        self.ticks += 1
+
+    def scrub_stripe(self, stripe_num):
+        array = self.array
+        if array.stripe_valid[stripe_num] == 0:
+            return  # Never written, nothing to check
+
+        level = log.level
+        repaired = False
+        parity = 0
+        uncorrectable = []
+        for disk in range(array.num_disks):
+            status, corrected, _ = Hamming_lookup(array.disks[disk][stripe_num])
+            array.read_count_per_disk[disk] += 1
+            if status == SBE:
+                array.write_block(disk, stripe_num, corrected)
+                array.metrics.record(ECC_CORRECTION, disk, stripe_num)
+                self.sbe_repairs += 1
+                repaired = True
+                if level >= log.REQUEST:
+                    print(f"🧹 Scrub: Single-Bit Error corrected on Disk {disk}, Stripe {stripe_num}")
+            elif status == DBE:
+                array.metrics.record(UNCORRECTABLE_ERROR, disk, stripe_num)
+                uncorrectable.append(disk)
+                continue
+            parity ^= corrected
+        self.blocks_checked += array.num_disks
+        if array.read_count_per_stripe is not None:
+            array.read_count_per_stripe[stripe_num] += array.num_disks
+
+        if len(uncorrectable) == 1:
+            # The XOR of the other blocks is the lost one, whether it held data or parity
+            disk = uncorrectable[0]
+            array.write_block(disk, stripe_num, parity, parity=disk == array.parity_disk_of(stripe_num))
+            self.dbe_repairs += 1
+            repaired = True
+            if level >= log.REQUEST:
+                print(f"🧹 Scrub: Uncorrectable error on Disk {disk}, Stripe {stripe_num} rebuilt from the rest of the stripe")
+        elif uncorrectable:
+            # Not recoverable: rewriting the parity would only hide the loss
+            self.lost_blocks += len(uncorrectable)
+            array.lost_blocks += len(uncorrectable)
+            if level >= log.REQUEST:
+                print(f"❌ Scrub: Uncorrectable errors on Disks {', '.join(map(str, uncorrectable))}, "
+                      f"Stripe {stripe_num}: the data is lost")
+        elif parity != 0:
+            parity_disk = array.parity_disk_of(stripe_num)
+            P0 = 0
+            for disk in array.data_disk_map[parity_disk][0]:
+                P0 ^= array.disks[disk][stripe_num]
+            array.write_block(parity_disk, stripe_num, P0, parity=True)
+            self.parity_repairs += 1
+            repaired = True
+            if level >= log.REQUEST:
+                print(f"🧹 Scrub: Parity of Stripe {stripe_num} was inconsistent and has been rewritten")
+
+        if repaired:
+            array.invalidate_stripe(stripe_num)
+        self.stripes_scrubbed += 1
+
+    def coverage(self):
+        """
+        Fraction of the stripes scrubbed since the start of the current pass (1.0 once a full pass is done).
+        """
+        if self.passes:
+            return 1.0
+        return self.stripes_in_pass / self.array.num_stripes
+
+    def print_report(self):
+        if log.level < log.SUMMARY:
+            return
+        print("\n🧹 Patrol Scrub Summary:")
+        print(f"Stripes scrubbed: {self.stripes_scrubbed} in {self.ticks} ticks "
+              f"({self.passes} full passes, coverage {self.coverage() * 100:.1f}%)")
+        print(f"Blocks checked: {self.blocks_checked}")
+        print(f"Repairs: {self.sbe_repairs} single-bit errors, {self.parity_repairs} parities")
+        if self.dbe_repairs or self.lost_blocks:
+            print(f"Uncorrectable blocks: {self.dbe_repairs} rebuilt from their stripe, {self.lost_blocks} lost")
+        if self.skipped_ticks:
+            print(f"Ticks skipped during disk failure: {self.skipped_ticks}")
+        per_request = self.scrub_time / self.foreground_requests * 1e6 if self.foreground_requests else 0.0
+        print(f"Foreground cost: {self.scrub_time * 1e3:.2f} ms total, "
+              f"{per_request:.2f} µs per foreground request")
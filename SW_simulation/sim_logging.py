@@ -0,0 +1,78 @@
+# Verbosity levels for the RAID 5 simulation
+#
+# Every print in the simulator is guarded by a level check *before* its f-string is built,
+# e.g.  if log.level >= log.TRACE: print(f"... {format_block(D0_enc)} ...")
+# so a disabled level costs one integer comparison and does no string formatting at all.
+import os
+
+QUIET = 0  # Nothing but hard errors
+SUMMARY = 1  # Simulation start/end, counters, failures and recovery
+REQUEST = 2  # A line or two per request (enqueue, handling, what was written, read result)
+TRACE = 3  # Per-bit detail: codewords, parity, old blocks, disk state and buffer dumps
+
+LEVEL_NAMES = {"quiet": QUIET, "summary": SUMMARY, "request": REQUEST, "trace": TRACE}
+
+# Simulations with at least this many requests run QUIET unless a level is given explicitly
+LARGE_SIMULATION_THRESHOLD = 10000
+
+
+def parse_level(value):
+    """
+    Accepts a level number (0-3) or name ("quiet", "summary", "request", "trace").
+    """
+    if isinstance(value, int):
+        if QUIET <= value <= TRACE:
+            return value
+    elif isinstance(value, str):
+        if value.strip().isdigit():
+            return parse_level(int(value))
+        if value.strip().lower() in LEVEL_NAMES:
+            return LEVEL_NAMES[value.strip().lower()]
+    raise ValueError(f"Invalid log level: {value!r}. Use 0-3 or one of {', '.join(LEVEL_NAMES)}.")
+
+# Current level. The run configuration can select it with the RAID_SIM_LOG_LEVEL environment variable.
+level = parse_level(os.environ.get("RAID_SIM_LOG_LEVEL", "trace"))
+
+
+def set_level(new_level):
+    """
+    Sets the current level and returns the previous one.
+    """
+    global level
+    previous = level
+    level = parse_level(new_level)
+    return previous
+
+def level_for_simulation(num_requests, requested=None):
+    """
+    The level a simulation of num_requests should run at: the requested one if given,
+    QUIET for large simulations, otherwise the current level.
+    """
+    if requested is not None:
+        return parse_level(requested)
+    if num_requests >= LARGE_SIMULATION_THRESHOLD:
+        return QUIET
+    return level
+
+# Formatting helpers for log lines
+
+def format_block(block):
+    block_str = f"{block:012b}"
+    return " ".join(block_str[i:i + 4] for i in range(0, len(block_str), 4))
+
+def format_address(address, bits=8):
+    address_str = f"{address:0{bits}b}"
+    return " ".join(address_str[i:i + 4] for i in range(0, len(address_str), 4))
+
+def format_data(data):
+    data_str = f"{data:016b}"
+    return " ".join(data_str[i:i + 4] for i in range(0, len(data_str), 4))
+
+def print_red(text):
+    """
+    Prints the given text in bold red color.
+
+    Parameters:
+        text (str): The text to print.
+    """
+    print(f"\033[1;31m{text}\033[0m")
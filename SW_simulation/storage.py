@@ -0,0 +1,128 @@
+# Storage backends for RaidArray
+#
+# A backend owns everything that grows with the array size:
+#   disks                  one indexable of packed 12-bit codewords (uint16) per disk:  disks[disk][stripe]
+#   stripe_valid           one byte per stripe (1 = written, 0 = never written)
+#   write_count_per_block  one indexable of uint32 write counters per disk:  write_count_per_block[disk][stripe]
+# RaidArray only ever indexes these, so the in-memory and the memory-mapped backends are interchangeable.
+import json
+import mmap
+import os
+import sys
+from array import array
+
+ZERO_CHUNK = 1 << 20  # Bytes zeroed/filled per step when (re)initializing an image
+
+
+class MemoryStorage:
+    """
+    Everything in RAM: array('H') disks, a bytearray validity map and array('I') block counters.
+    """
+    __slots__ = ("num_disks", "num_stripes", "disks", "stripe_valid", "write_count_per_block")
+
+    def __init__(self, num_disks, num_stripes):
+        self.num_disks = num_disks
+        self.num_stripes = num_stripes
+        self.disks = [array('H', bytes(2 * num_stripes)) for _ in range(num_disks)]
+        self.stripe_valid = bytearray(num_stripes)
+        self.write_count_per_block = [array('I', [0]) * num_stripes for _ in range(num_disks)]
+
+    def reset_disk(self, disk_index):
+        self.disks[disk_index] = array('H', bytes(2 * self.num_stripes))
+
+    def reset_block_counters(self):
+        for disk_index in range(self.num_disks):
+            self.write_count_per_block[disk_index] = array('I', [0]) * self.num_stripes
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MmapStorage:
+    """
+    Every disk is a file of packed codewords (native-endian uint16, one per stripe) accessed through mmap,
+    so memory use is bounded by the OS page cache and the images survive the process.
+    Directory layout:
+        meta.json                geometry and byte order
+        disk<i>.img              codewords of disk i
+        disk<i>.wear             uint32 write counter per block of disk i
+        stripe_valid.map         one byte per stripe
+    Args:
+        path (str): directory of the image set; created if it does not exist
+        num_disks, num_stripes (int): geometry for a new image set; checked against meta.json when reopening
+    """
+    __slots__ = ("path", "num_disks", "num_stripes", "disks", "stripe_valid", "write_count_per_block", "_maps")
+
+    def __init__(self, path, num_disks=None, num_stripes=None):
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta["byteorder"] != sys.byteorder:
+                raise ValueError(f"Image set {path} was written on a {meta['byteorder']}-endian machine.")
+            for name, value in (("num_disks", num_disks), ("num_stripes", num_stripes)):
+                if value is not None and value != meta[name]:
+                    raise ValueError(f"Image set {path} has {name}={meta[name]}, not {value}.")
+            self.num_disks = meta["num_disks"]
+            self.num_stripes = meta["num_stripes"]
+            create = False
+        else:
+            if num_disks is None or num_stripes is None:
+                raise ValueError(f"No image set at {path}: num_disks and num_stripes are needed to create one.")
+            os.makedirs(path, exist_ok=True)
+            self.num_disks = num_disks
+            self.num_stripes = num_stripes
+            create = True
+
+        self._maps = []
+        self.disks = [self._map(f"disk{i}.img", 2, "H", create) for i in range(self.num_disks)]
+        self.write_count_per_block = [self._map(f"disk{i}.wear", 4, "I", create) for i in range(self.num_disks)]
+        self.stripe_valid = self._map("stripe_valid.map", 1, "B", create)
+
+        if create:
+            with open(meta_path, "w", encoding="utf-8") as file:
+                json.dump({"num_disks": self.num_disks, "num_stripes": self.num_stripes, "block_size": 12,
+                           "byteorder": sys.byteorder}, file, indent=1)
+
+    def _map(self, name, item_size, typecode, create):
+        size = item_size * self.num_stripes
+        file_name = os.path.join(self.path, name)
+        with open(file_name, "w+b" if create else "r+b") as file:
+            if create:
+                file.truncate(size)  # Sparse, reads back as zeros
+            elif os.fstat(file.fileno()).st_size != size:
+                raise ValueError(f"{file_name} does not match the geometry in meta.json.")
+            mapped = mmap.mmap(file.fileno(), size)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+    @staticmethod
+    def _fill(mapped, value):
+        chunk = bytes([value]) * ZERO_CHUNK
+        for start in range(0, len(mapped), ZERO_CHUNK):
+            end = min(start + ZERO_CHUNK, len(mapped))
+            mapped[start:end] = chunk[:end - start]
+
+    def reset_disk(self, disk_index):
+        self._fill(self.disks[disk_index].obj, 0)
+
+    def reset_block_counters(self):
+        for counters in self.write_count_per_block:
+            self._fill(counters.obj, 0)
+
+    def flush(self):
+        for mapped in self._maps:
+            mapped.flush()
+
+    def close(self):
+        self.flush()
+        for view in self.disks + self.write_count_per_block + [self.stripe_valid]:
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
@@ -0,0 +1,211 @@
+# Parallel parameter sweep over simulate_mixed_write_distribution
+#
+# Every (disks, stripes, size, layout, rewrite ratio, replicate) combination is one task. Tasks fan out over a process pool,
+# each worker runs a QUIET simulation on its own RaidArray and returns a compact result record, and the
+# records are aggregated into mean / 95% confidence interval tables, per disk and per block (disk, stripe).
+#
+# Run from SW_simulation/:
+#   python sweep.py --sizes 10 100 1000 10000 100000 --layouts round_robin fixed_parity --replicates 10
+#   python sweep.py --disks 4 8 16 --stripes 4096 --sizes 100000
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import sim_logging as log
+from raid_array import (RaidArray, PARITY_LAYOUTS, ROUND_ROBIN, WRITE_BUFFER_SIZE, NUM_DISKS, NUM_STRIPES,
+                        WRITE_MODES, AUTO_WRITE)
+
+# Two-sided 95% Student t quantiles by degrees of freedom (falls back to the normal 1.96 above 30)
+T_975 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+         12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042}
+
+
+def task_seed(base_seed, size, layout, rewrite_ratio, replicate, num_disks=NUM_DISKS, num_stripes=NUM_STRIPES):
+    """
+    Deterministic per-task seed: the same task always gets the same seed, independent of
+    which worker runs it, the number of workers or the order the tasks finish in.
+    """
+    key = f"{base_seed}:{size}:{layout}:{rewrite_ratio!r}:{replicate}"
+    if (num_disks, num_stripes) != (NUM_DISKS, NUM_STRIPES):
+        key += f":{num_disks}x{num_stripes}"  # Default geometry keeps the seeds of earlier sweeps
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "little")
+
+def make_tasks(sizes, layouts, rewrite_ratios, replicates, base_seed=0, disks=(NUM_DISKS,), stripes=(NUM_STRIPES,),
+               write_mode=AUTO_WRITE, coalesce_writes=False):
+    return [
+        {"num_disks": num_disks, "num_stripes": num_stripes, "write_mode": write_mode,
+         "coalesce_writes": coalesce_writes, "size": size, "layout": layout,
+         "rewrite_ratio": rewrite_ratio, "replicate": replicate,
+         "seed": task_seed(base_seed, size, layout, rewrite_ratio, replicate, num_disks, num_stripes)}
+        for num_disks in disks
+        for num_stripes in stripes
+        for size in sizes
+        for layout in layouts
+        for rewrite_ratio in rewrite_ratios
+        for replicate in range(replicates)
+    ]
+
+def run_task(task):
+    """
+    Worker: one quiet simulation on a fresh array. Returns the task with its results added.
+    """
+    array = RaidArray(num_disks=task["num_disks"], num_stripes=task["num_stripes"],
+                      write_buffer_size=max(task["size"], WRITE_BUFFER_SIZE), rng=random.Random(task["seed"]),
+                      parity_layout=task["layout"], write_mode=task["write_mode"],
+                      coalesce_writes=task["coalesce_writes"])
+    array.write_sys_is_ready = 1
+
+    start = time.perf_counter()
+    array.simulate_mixed_write_distribution(task["size"], log_level=log.QUIET, rewrite_ratio=task["rewrite_ratio"])
+    elapsed = time.perf_counter() - start
+
+    return dict(task,
+                writes_per_disk=list(array.write_count_per_disk),
+                writes_per_block=[list(block_counts) for block_counts in array.write_count_per_block],
+                redundant_write_skips=array.redundant_write_skips,
+                partial_write_skips=array.partial_write_skips,
+                reads_per_disk=list(array.read_count_per_disk),
+                read_modify_writes=array.read_modify_writes,
+                reconstruct_writes=array.reconstruct_writes,
+                coalesced_writes=array.coalesced_writes,
+                coalesced_disk_writes_avoided=array.coalesced_disk_writes_avoided,
+                coalesced_parity_writes_avoided=array.coalesced_parity_writes_avoided,
+                elapsed=elapsed)
+
+def run_sweep(tasks, workers=None):
+    """
+    Runs all tasks over a process pool (all cores by default). Results come back in task order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_task(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_task, tasks, chunksize=chunksize))
+
+def mean_ci(values):
+    """
+    Returns (mean, half width of the 95% confidence interval).
+    """
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, 0.0
+    df = len(values) - 1
+    t = T_975[max(k for k in T_975 if k <= df)] if df <= 30 else 1.96
+    return mean, t * statistics.stdev(values) / math.sqrt(len(values))
+
+def wear_cov(writes_per_disk):
+    """
+    Coefficient of variation of the writes across disks, in percent (lower = better wear leveling).
+    """
+    mean = statistics.fmean(writes_per_disk)
+    return statistics.pstdev(writes_per_disk) / mean * 100 if mean else 0.0
+
+def all_blocks(writes_per_block):
+    return [count for block_counts in writes_per_block for count in block_counts]
+
+def aggregate(results):
+    """
+    Groups the result records by (disks, stripes, size, layout, rewrite ratio) and reduces every metric to mean and CI.
+    Per block: writes_per_block[disk][stripe] is the mean and CI of that block's writes, and the hottest block
+    (block_writes_max) and the spread over all blocks (block_wear_cov) are reduced per replicate.
+    """
+    groups = {}
+    for result in results:
+        key = (result["num_disks"], result["num_stripes"], result["size"], result["layout"], result["rewrite_ratio"])
+        groups.setdefault(key, []).append(result)
+
+    table = []
+    for (num_disks, num_stripes, size, layout, rewrite_ratio), group in groups.items():
+        table.append({
+            "num_disks": num_disks, "num_stripes": num_stripes,
+            "size": size, "layout": layout, "rewrite_ratio": rewrite_ratio, "replicates": len(group),
+            "writes_per_disk": [mean_ci([r["writes_per_disk"][d] for r in group]) for d in range(num_disks)],
+            "writes_per_block": [[mean_ci([r["writes_per_block"][d][stripe] for r in group])
+                                  for stripe in range(num_stripes)] for d in range(num_disks)],
+            "block_writes_max": mean_ci([max(all_blocks(r["writes_per_block"])) for r in group]),
+            "block_wear_cov": mean_ci([wear_cov(all_blocks(r["writes_per_block"])) for r in group]),
+            "redundant_write_skips": mean_ci([r["redundant_write_skips"] for r in group]),
+            "partial_write_skips": mean_ci([r["partial_write_skips"] for r in group]),
+            "disk_reads": mean_ci([sum(r["reads_per_disk"]) for r in group]),
+            "coalesced_disk_writes_avoided": mean_ci([r["coalesced_disk_writes_avoided"] for r in group]),
+            "coalesced_parity_writes_avoided": mean_ci([r["coalesced_parity_writes_avoided"] for r in group]),
+            "wear_cov": mean_ci([wear_cov(r["writes_per_disk"]) for r in group]),
+            "elapsed": mean_ci([r["elapsed"] for r in group]),
+        })
+    return table
+
+def print_table(table):
+    """
+    One table per geometry, since the number of per-disk columns depends on the disk count.
+    """
+    geometries = {}
+    for row in table:
+        geometries.setdefault((row["num_disks"], row["num_stripes"]), []).append(row)
+
+    for (num_disks, num_stripes), rows in geometries.items():
+        print(f"\n💾 {num_disks} disks x {num_stripes} stripes")
+        header = (f"{'size':>8} | {'layout':<12} | {'rewrite':>7} | {'n':>3} | "
+                  + " | ".join(f"{f'Disk {d} writes':>20}" for d in range(num_disks))
+                  + f" | {'redundant skips':>18} | {'partial skips':>18} | {'disk reads':>20}"
+                  + f" | {'wear CoV %':>14} | {'max block writes':>18} | {'block CoV %':>14} | {'req/s':>10}")
+        print(header)
+        print("-" * len(header))
+        for row in rows:
+            cells = [f"{m:>11.1f} ± {ci:<6.1f}" for m, ci in row["writes_per_disk"]]
+            for key in ("redundant_write_skips", "partial_write_skips"):
+                m, ci = row[key]
+                cells.append(f"{m:>9.1f} ± {ci:<6.1f}")
+            m, ci = row["disk_reads"]
+            cells.append(f"{m:>11.1f} ± {ci:<6.1f}")
+            m, ci = row["wear_cov"]
+            cells.append(f"{m:>6.2f} ± {ci:<5.2f}")
+            m, ci = row["block_writes_max"]
+            cells.append(f"{m:>9.1f} ± {ci:<6.1f}")
+            m, ci = row["block_wear_cov"]
+            cells.append(f"{m:>6.2f} ± {ci:<5.2f}")
+            m, ci = row["elapsed"]
+            cells.append(f"{row['size'] / m if m else 0:>10.0f}")
+            print(f"{row['size']:>8} | {row['layout']:<12} | {row['rewrite_ratio']:>7g} | {row['replicates']:>3} | "
+                  + " | ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sweep of simulate_mixed_write_distribution")
+    parser.add_argument("--disks", type=int, nargs="+", default=[NUM_DISKS], help="disks per array (at least 3)")
+    parser.add_argument("--stripes", type=int, nargs="+", default=[NUM_STRIPES], help="stripes per disk")
+    parser.add_argument("--write-mode", default=AUTO_WRITE, choices=WRITE_MODES, help="parity update of small writes")
+    parser.add_argument("--coalesce", action="store_true", help="merge queued writes to the same address")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--layouts", nargs="+", default=[ROUND_ROBIN], choices=PARITY_LAYOUTS)
+    parser.add_argument("--rewrite-ratios", type=float, nargs="+", default=[0.25])
+    parser.add_argument("--replicates", type=int, default=5, help="seeds per combination")
+    parser.add_argument("--base-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--json", help="also write the raw records and the aggregated table to this file")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.sizes, args.layouts, args.rewrite_ratios, args.replicates, args.base_seed,
+                       args.disks, args.stripes, args.write_mode, args.coalesce)
+    start = time.perf_counter()
+    results = run_sweep(tasks, args.workers)
+    elapsed = time.perf_counter() - start
+
+    table = aggregate(results)
+    print_table(table)
+    print(f"\n✅ {len(tasks)} simulations in {elapsed:.2f} s on {args.workers or os.cpu_count()} worker(s)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"results": results, "table": table}, file, indent=1)
+        print(f"✅ Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
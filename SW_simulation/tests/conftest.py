@@ -0,0 +1,5 @@
+# The simulator modules are flat scripts run from SW_simulation/: make them importable from the tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,39 @@
+# Report analysis: the collected numbers have the expected shape, with no figure drawn
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import sim_logging as log
+from analysis import collect_reads, collect_write_distribution, main, wear_leveling_cov
+from raid_array import NUM_DISKS, PARITY_LAYOUTS
+
+SIZES = (10, 100)
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def test_collect_write_distribution_shape():
+    writes_by_layout = collect_write_distribution(SIZES)
+    assert set(writes_by_layout) == set(PARITY_LAYOUTS)
+    for writes in writes_by_layout.values():
+        assert writes.shape == (len(SIZES), NUM_DISKS)
+        assert (writes.sum(axis=1) > 0).all()
+        assert wear_leveling_cov(writes).shape == (len(SIZES),)
+
+def test_collect_reads_shape():
+    reads_without_ecc, reads_with_ecc = collect_reads(SIZES)
+    assert reads_without_ecc.shape == reads_with_ecc.shape == (len(SIZES),)
+    assert reads_with_ecc.tolist() == [2 * size for size in SIZES]  # D0 and D1 only
+    assert reads_without_ecc.tolist() == [NUM_DISKS * size for size in SIZES]  # The whole stripe
+
+def test_main_without_plots_does_not_import_matplotlib(capsys):
+    imported = "matplotlib" in sys.modules
+    main(["--sizes", "10", "--no-plots"])
+    assert "Disk reads with ECC:    [20]" in capsys.readouterr().out
+    assert ("matplotlib" in sys.modules) == imported
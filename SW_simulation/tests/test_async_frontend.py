@@ -0,0 +1,103 @@
+# AsyncFrontEnd: futures resolve to what the array returns, lost data included
+import asyncio
+import random
+
+import pytest
+
+import sim_logging as log
+from async_frontend import AsyncFrontEnd, run_clients, READ, WRITE
+from hamming import DBE, Hamming_check
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def double_bit_error(codeword):
+    codeword ^= 0b100000000001  # Positions 1 and 12: syndrome 13
+    assert Hamming_check(codeword) == DBE
+    return codeword
+
+def test_reads_return_the_written_words():
+    array = RaidArray(num_disks=5, num_stripes=16, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array, read_workers=2, write_workers=2) as frontend:
+            await asyncio.gather(*(frontend.write(address, 0x0101 * address) for address in range(array.capacity)))
+            return frontend, await asyncio.gather(*(frontend.read(address) for address in range(array.capacity)))
+
+    frontend, words = run(scenario())
+    assert words == [0x0101 * address for address in range(array.capacity)]
+    assert frontend.completed == {READ: array.capacity, WRITE: array.capacity}
+
+def test_uncorrectable_error_with_the_parity_disk_failed_reads_none():
+    array = RaidArray(num_disks=5, num_stripes=4, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array) as frontend:
+            await frontend.write(1, 0xABCD)
+            stripe_num, D0_disk, _, parity_disk = array.locate(1)
+            array.disks[D0_disk][stripe_num] = double_bit_error(array.disks[D0_disk][stripe_num])
+            array.disk_status[parity_disk] = 0
+            return await frontend.read(1)
+
+    assert run(scenario()) is None
+    assert (array.lost_blocks, array.lost_reads) == (1, 1)
+
+def test_block_that_cannot_be_reconstructed_reads_none():
+    array = RaidArray(num_disks=5, num_stripes=4, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array) as frontend:
+            await frontend.write(1, 0xABCD)
+            await frontend.write(5, 0x1234)  # Same stripe, so word 1 can be rebuilt from it
+            stripe_num, D0_disk, _, parity_disk = array.locate(1)
+            array.disks[parity_disk][stripe_num] = double_bit_error(array.disks[parity_disk][stripe_num])
+            array.disk_status[D0_disk] = 0
+            return await frontend.read(1), await frontend.read(5)
+
+    assert run(scenario()) == (None, 0x1234)
+    assert array.lost_reads == 1
+
+def test_uncorrectable_error_is_repaired_when_the_stripe_is_healthy():
+    array = RaidArray(num_disks=5, num_stripes=4, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array) as frontend:
+            await frontend.write(1, 0xABCD)
+            stripe_num, D0_disk, _, _ = array.locate(1)
+            array.disks[D0_disk][stripe_num] = double_bit_error(array.disks[D0_disk][stripe_num])
+            return await frontend.read(1)
+
+    assert run(scenario()) == 0xABCD
+    assert (array.lost_blocks, array.lost_reads) == (0, 0)
+
+def test_same_stripe_requests_wait_for_the_lock():
+    array = RaidArray(num_disks=5, num_stripes=1, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array, read_workers=2, write_workers=2, service_time=1e-3) as frontend:
+            await asyncio.gather(frontend.write(0, 1), frontend.write(1, 2), frontend.read(0), frontend.read(1))
+            return frontend
+
+    frontend = run(scenario())
+    assert frontend.lock_waits > 0
+    assert frontend.max_in_flight == 1  # One stripe: the modelled service times never overlap
+
+def test_random_clients_complete_every_request():
+    array = RaidArray(num_disks=5, num_stripes=64, rng=random.Random(0))
+
+    async def scenario():
+        async with AsyncFrontEnd(array, read_workers=3, write_workers=3) as frontend:
+            await run_clients(frontend, num_clients=4, requests_per_client=50, rng=random.Random(1))
+            return frontend
+
+    frontend = run(scenario())
+    assert frontend.completed[READ] + frontend.completed[WRITE] == 200
+    assert len(array.write_buffer) == 0 and len(array.read_buffer) == 0
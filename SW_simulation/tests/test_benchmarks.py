@@ -0,0 +1,46 @@
+# Benchmark suite: every benchmark runs, and the baseline comparison flags only real slowdowns
+import json
+import random
+
+import pytest
+
+import sim_logging as log
+from benchmarks import BENCHMARKS, find_regressions, main
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_every_benchmark_runs(name):
+    run = BENCHMARKS[name](10, random.Random(10))
+    run()
+    run()  # Timed calls repeat: the setup must leave a state the next call can run from
+
+def test_find_regressions():
+    baseline = {"a": {"10": 100.0, "1000": 100.0}, "b": {"10": 50.0}}
+    results = {"a": {"10": 124.0, "1000": 126.0, "100000": 999.0}, "b": {"10": 10.0}, "c": {"10": 1.0}}
+    assert find_regressions(results, baseline, 0.25) == [("a", "1000", 126.0, 100.0)]
+    assert find_regressions(results, baseline, 0.3) == []
+
+def test_save_and_compare_round_trip(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    options = ["--only", "hamming_encode", "--sizes", "10", "--repeat", "1"]
+    assert main(options + ["--save", path]) == 0
+    with open(path, encoding="utf-8") as file:
+        saved = json.load(file)
+    assert set(saved["results"]) == {"hamming_encode"} and set(saved["results"]["hamming_encode"]) == {"10"}
+
+    saved["results"]["hamming_encode"]["10"] *= 1000  # A much slower baseline: no regression
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(saved, file)
+    assert main(options + ["--compare", path]) == 0
+
+    saved["results"]["hamming_encode"]["10"] /= 1e6  # A much faster baseline: a regression
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(saved, file)
+    assert main(options + ["--compare", path]) == 1
+    assert "1 regressions" in capsys.readouterr().out
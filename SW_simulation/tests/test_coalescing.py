@@ -0,0 +1,94 @@
+# Write coalescing: the disk writes it saves are exactly the ones coalesced_disk_writes_avoided counts
+import random
+
+import pytest
+
+import sim_logging as log
+from metrics import PARITY_WRITE
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def run_stream(stream, coalesce_writes, prefill=(), num_disks=5, num_stripes=8):
+    """
+    Writes prefill one by one, then queues the whole stream before draining it.
+    Returns:
+        RaidArray: the array, with counters covering the stream only
+    """
+    array = RaidArray(num_disks=num_disks, num_stripes=num_stripes, rng=random.Random(0),
+                      coalesce_writes=coalesce_writes)
+    array.write_sys_is_ready = 1
+    for address, data in prefill:
+        array.add_write_request(address, data)
+        array.handle_write_request()
+    array.reset_write_counters()
+    for address, data in stream:
+        array.add_write_request(address, data)
+    while len(array.write_buffer) > 0:
+        array.handle_write_request()
+    return array
+
+def assert_savings_counted(stream, **options):
+    plain = run_stream(stream, False, **options)
+    coalesced = run_stream(stream, True, **options)
+    assert [list(disk) for disk in coalesced.disks] == [list(disk) for disk in plain.disks]
+    assert (sum(plain.write_count_per_disk) - sum(coalesced.write_count_per_disk)
+            == coalesced.coalesced_disk_writes_avoided)
+    assert (plain.metrics.total(PARITY_WRITE) - coalesced.metrics.total(PARITY_WRITE)
+            == coalesced.coalesced_parity_writes_avoided)
+    return coalesced
+
+def random_stream(rng, capacity, count):
+    """
+    Writes to a few hot words: new words, byte-equal rewrites and rewrites of one byte only.
+    """
+    words = {}
+    stream = []
+    for _ in range(count):
+        address = rng.randrange(min(capacity, 6))
+        old = words.get(address, rng.getrandbits(16))
+        kind = rng.random()
+        if kind < 0.2:
+            data = old
+        elif kind < 0.4:
+            data = (old & 0xFF00) | rng.getrandbits(8)
+        elif kind < 0.6:
+            data = (rng.getrandbits(8) << 8) | (old & 0xFF)
+        else:
+            data = rng.getrandbits(16)
+        words[address] = data
+        stream.append((address, data))
+    return stream
+
+def test_chain_on_an_invalid_stripe():
+    coalesced = assert_savings_counted([(0, 0x1111), (0, 0x2222), (0, 0x2233)])
+    assert coalesced.coalesced_writes == 2
+    assert coalesced.coalesced_disk_writes_avoided == 5  # 0x1111 -> 0x2222: D0, D1, P; -> 0x2233: D1, P
+
+def test_chain_back_to_the_value_on_disk():
+    coalesced = assert_savings_counted([(0, 0x1234), (0, 0x1299), (0, 0x1234)], prefill=[(0, 0x1234)])
+    assert sum(coalesced.write_count_per_disk) == 0
+    assert coalesced.coalesced_disk_writes_avoided == 4
+
+def test_byte_equal_rewrites_save_nothing():
+    coalesced = assert_savings_counted([(1, 0xABCD), (1, 0xABCD), (1, 0xABCD)], prefill=[(1, 0x0001)])
+    assert coalesced.coalesced_writes == 2
+    assert coalesced.coalesced_disk_writes_avoided == 0
+
+def test_first_value_equal_to_disk_final_value_different():
+    assert_savings_counted([(2, 0x5555), (2, 0x55AA)], prefill=[(2, 0x5555)])
+
+@pytest.mark.parametrize("num_disks", [3, 4, 5, 7])
+@pytest.mark.parametrize("prefilled", [False, True])
+def test_random_streams(num_disks, prefilled):
+    rng = random.Random(num_disks * 2 + prefilled)
+    for _ in range(20):
+        capacity = 8 * ((num_disks - 1) // 2)
+        prefill = [(address, rng.getrandbits(16)) for address in range(capacity) if rng.random() < 0.5] \
+            if prefilled else ()
+        assert_savings_counted(random_stream(rng, capacity, 40), prefill=prefill, num_disks=num_disks)
@@ -0,0 +1,93 @@
+# Degraded mode: one failed disk costs nothing but reconstruction, more than one fails requests, lost data reads as None
+import random
+
+import pytest
+
+import sim_logging as log
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+ADDRESS = 5
+DBE_PATTERN = 0b100000000001  # Syndrome 13: detected, not miscorrected
+
+def filled_array(num_disks=5, num_stripes=16, seed=0):
+    """
+    A fully written array and the word written at every address.
+    """
+    rng = random.Random(seed)
+    array = RaidArray(num_disks=num_disks, num_stripes=num_stripes, rng=random.Random(seed))
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    written = {}
+    for address in range(array.capacity):
+        written[address] = rng.getrandbits(16)
+        array.add_write_request(address, written[address])
+        array.handle_write_request()
+    return array, written
+
+def fail_disk(array, disk):
+    array.disk_status[disk] = 0
+    array.reset_disk(disk)
+
+def read_now(array, address):
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def write_now(array, address, data):
+    array.add_write_request(address, data)
+    array.handle_write_request()
+
+def disk_in_role(array, role):
+    stripe_num, D0_disk, D1_disk, parity_disk = array.locate(ADDRESS)
+    return {"D0": D0_disk, "D1": D1_disk, "parity": parity_disk}[role]
+
+@pytest.mark.parametrize("role", ["D0", "D1", "parity"])
+def test_degraded_read(role):
+    array, written = filled_array()
+    fail_disk(array, disk_in_role(array, role))
+    assert read_now(array, ADDRESS) == written[ADDRESS]
+    assert array.degraded_reads == 1
+    assert array.reconstructed_blocks == (0 if role == "parity" else 1)
+    assert (array.failed_reads, array.lost_reads) == (0, 0)
+
+@pytest.mark.parametrize("role", ["D0", "D1", "parity"])
+def test_degraded_write_survives_recovery(role):
+    array, written = filled_array()
+    failed_disk = disk_in_role(array, role)
+    fail_disk(array, failed_disk)
+    write_now(array, ADDRESS, written[ADDRESS] ^ 0x8001)
+    assert array.degraded_writes == 1
+    assert read_now(array, ADDRESS) == written[ADDRESS] ^ 0x8001
+    array.RAID5_recovery()
+    assert array.disk_status.count(0) == 0
+    for address in range(array.capacity):
+        expected = written[address] ^ 0x8001 if address == ADDRESS else written[address]
+        assert read_now(array, address) == expected
+
+def test_two_failed_disks_fail_reads_and_writes():
+    array, written = filled_array()
+    fail_disk(array, 0)
+    fail_disk(array, 3)
+    assert read_now(array, ADDRESS) is None
+    write_now(array, ADDRESS, 0x1234)
+    assert (array.failed_reads, array.failed_writes) == (1, 1)
+    assert (array.degraded_reads, array.degraded_writes) == (0, 0)
+    assert len(array.read_buffer) == 0 and len(array.write_buffer) == 0
+    array.RAID5_recovery()  # Impossible: both disks stay failed
+    assert array.disk_status.count(0) == 2
+
+@pytest.mark.parametrize("role", ["D0", "D1"])
+def test_block_lost_with_a_dbe_on_a_survivor_reads_as_none(role):
+    array, written = filled_array()
+    stripe_num, D0_disk, D1_disk, parity_disk = array.locate(ADDRESS)
+    fail_disk(array, disk_in_role(array, role))
+    array.disks[parity_disk][stripe_num] ^= DBE_PATTERN
+    assert read_now(array, ADDRESS) is None
+    assert array.lost_reads == 1
+    assert array.lost_blocks == 1
@@ -0,0 +1,46 @@
+# Event simulator: every arrival process completes exactly the requests asked for
+import random
+
+import pytest
+
+import sim_logging as log
+from event_sim import ARRIVAL_PROCESSES, CLOSED, EventSimulator
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def make_simulator(arrival, queue_depth=4, seed=0):
+    array = RaidArray(num_disks=5, num_stripes=64, rng=random.Random(seed))
+    return EventSimulator(array, queue_depth=queue_depth, arrival=arrival, rng=random.Random(seed))
+
+@pytest.mark.parametrize("num_requests, queue_depth", [(0, 4), (1, 4), (3, 4), (4, 4), (500, 4), (500, 1)])
+def test_closed_completes_exactly_num_requests(num_requests, queue_depth):
+    simulator = make_simulator(CLOSED, queue_depth)
+    results = simulator.run(num_requests)
+    assert results["requests"] == simulator.issued == num_requests
+    assert simulator.in_flight == 0 and not simulator.backlog
+
+@pytest.mark.parametrize("arrival", ARRIVAL_PROCESSES)
+def test_every_arrival_process_completes_num_requests(arrival):
+    simulator = make_simulator(arrival)
+    results = simulator.run(300)
+    assert results["requests"] == 300
+    assert results["makespan"] > 0 and results["iops"] > 0
+
+def test_closed_run_with_a_failure_and_recovery():
+    simulator = make_simulator(CLOSED)
+    results = simulator.run(400, fail_disk=2, fail_at=0.002, recover_at=0.004)
+    assert results["requests"] == 400
+    assert results["recovery_time"] is not None
+    assert simulator.array.disk_status.count(0) == 0
+
+def test_same_seed_same_timeline():
+    first = make_simulator(CLOSED).run(200)
+    second = make_simulator(CLOSED).run(200)
+    del first["events_per_second"], second["events_per_second"]  # Wall clock
+    assert first == second
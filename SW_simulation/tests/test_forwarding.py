@@ -0,0 +1,81 @@
+# Read forwarding from the write buffer: a read sees the newest write issued before it, and nothing issued after
+import random
+
+import pytest
+
+import sim_logging as log
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def make_array(coalesce_writes=False):
+    array = RaidArray(num_disks=5, num_stripes=8, rng=random.Random(0), forward_reads=True,
+                      coalesce_writes=coalesce_writes)
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    return array
+
+def write_now(array, address, data):
+    array.add_write_request(address, data)
+    array.handle_write_request()
+
+def read_now(array, address):
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def drain_writes(array):
+    while len(array.write_buffer) > 0:
+        array.handle_write_request()
+
+def test_read_returns_the_pending_write():
+    array = make_array()
+    write_now(array, 3, 0x1111)
+    array.add_write_request(3, 0x2222)
+    assert read_now(array, 3) == 0x2222
+    assert array.read_buffer_hits == 1
+
+def test_read_queued_before_a_later_write_returns_the_old_data():
+    array = make_array()
+    write_now(array, 3, 0x1111)
+    array.add_read_request(3)
+    array.add_write_request(3, 0x2222)
+    assert array.handle_read_request() == 0x1111
+    assert array.read_buffer_hits == 0
+
+def test_read_between_two_pending_writes_returns_the_earlier_one():
+    array = make_array()
+    array.add_write_request(3, 0x1111)
+    array.add_read_request(3)
+    array.add_write_request(3, 0x2222)
+    assert array.handle_read_request() == 0x1111
+    assert array.read_buffer_hits == 1
+    drain_writes(array)
+    assert read_now(array, 3) == 0x2222
+
+@pytest.mark.parametrize("coalesce_writes", [False, True])
+def test_read_after_two_writes_returns_the_newest(coalesce_writes):
+    array = make_array(coalesce_writes)
+    array.add_write_request(3, 0x1111)
+    array.add_write_request(3, 0x2222)
+    assert array.coalesced_writes == (1 if coalesce_writes else 0)
+    assert read_now(array, 3) == 0x2222
+    assert array.read_buffer_hits == 1
+
+@pytest.mark.parametrize("coalesce_writes", [False, True])
+def test_pending_writes_are_dropped_once_drained(coalesce_writes):
+    array = make_array(coalesce_writes)
+    for address, data in [(3, 0x1111), (4, 0x4444), (3, 0x2222), (3, 0x3333)]:
+        array.add_write_request(address, data)
+    array.add_read_request(3)
+    array.add_write_request(3, 0x5555)
+    drain_writes(array)
+    assert array.pending_by_word == {}
+    assert array.pending_writes == {}
+    assert array.handle_read_request() == 0x5555  # Queued before the last write, which is on the disks by now
+    assert array.read_buffer_hits == 0
+    assert read_now(array, 4) == 0x4444
@@ -0,0 +1,49 @@
+# Lookup tables against the per-bit reference implementation, over every codeword
+# Run from SW_simulation/:  python -m pytest -q tests
+from hamming import (BLOCK_SIZE, BLOCK_MASK, NO_ERROR, SBE, DBE, ENCODE_TABLE, SYNDROME_TABLE, DECODE_TABLE,
+                     hamming_encode_bitwise, Hamming_syndrome_bitwise, Hamming_fix_bitwise, Hamming_decode,
+                     hamming_encode, Hamming_check, Hamming_fix, Hamming_lookup, block_to_bits, bits_to_block)
+
+
+def test_encode_table_matches_reference():
+    for data in range(256):
+        assert ENCODE_TABLE[data] == hamming_encode_bitwise(data) == hamming_encode(data)
+        assert Hamming_decode(hamming_encode(data)) == data
+
+def test_decode_table_matches_reference():
+    for codeword in range(BLOCK_MASK + 1):
+        syndrome = Hamming_syndrome_bitwise(codeword)
+        corrected = Hamming_fix_bitwise(codeword)
+        assert SYNDROME_TABLE[codeword] == syndrome
+        assert Hamming_lookup(codeword) == (Hamming_check(codeword), corrected, Hamming_decode(corrected))
+        assert Hamming_fix(codeword) == corrected
+
+def test_status_follows_syndrome():
+    for codeword, (status, corrected, _) in enumerate(DECODE_TABLE):
+        syndrome = SYNDROME_TABLE[codeword]
+        if syndrome == 0:
+            assert status == NO_ERROR and corrected == codeword
+        elif syndrome <= BLOCK_SIZE:
+            assert status == SBE and SYNDROME_TABLE[corrected] == 0
+        else:
+            # Names no bit: detected, left as it is
+            assert status == DBE and corrected == codeword
+
+def test_every_single_bit_error_is_corrected():
+    for data in range(256):
+        codeword = hamming_encode(data)
+        for bit in range(BLOCK_SIZE):
+            status, corrected, decoded = Hamming_lookup(codeword ^ (1 << bit))
+            assert (status, corrected, decoded) == (SBE, codeword, data)
+
+def test_double_bit_errors_are_never_silent():
+    for data in range(256):
+        codeword = hamming_encode(data)
+        for low in range(BLOCK_SIZE):
+            for high in range(low + 1, BLOCK_SIZE):
+                assert Hamming_check(codeword ^ (1 << low) ^ (1 << high)) != NO_ERROR
+
+def test_bit_list_round_trip():
+    for codeword in range(BLOCK_MASK + 1):
+        bits = block_to_bits(codeword)
+        assert len(bits) == BLOCK_SIZE and bits_to_block(bits) == codeword
@@ -0,0 +1,50 @@
+# Batch ECC API against the scalar table-driven functions
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hamming import BLOCK_MASK, hamming_encode, Hamming_syndrome, Hamming_fix, Hamming_decode, Hamming_lookup
+from hamming_batch import encode_batch, check_batch, fix_batch, decode_batch, read_batch
+
+ALL_CODEWORDS = np.arange(BLOCK_MASK + 1, dtype=np.uint16)
+
+
+def test_encode_batch_matches_scalar():
+    words = np.arange(0x10000, dtype=np.uint16)
+    D0_enc, D1_enc, P = encode_batch(words)
+    for word in range(0, 0x10000, 251):
+        D0, D1 = hamming_encode(word >> 8), hamming_encode(word & 0xFF)
+        assert (D0_enc[word], D1_enc[word], P[word]) == (D0, D1, D0 ^ D1)
+
+def test_check_fix_decode_match_scalar():
+    corrected, syndromes = fix_batch(ALL_CODEWORDS)
+    assert check_batch(ALL_CODEWORDS).tolist() == syndromes.tolist()
+    assert syndromes.tolist() == [Hamming_syndrome(c) for c in range(BLOCK_MASK + 1)]
+    assert corrected.tolist() == [Hamming_fix(c) for c in range(BLOCK_MASK + 1)]
+    assert decode_batch(ALL_CODEWORDS).tolist() == [Hamming_decode(c) for c in range(BLOCK_MASK + 1)]
+
+def test_read_batch_matches_scalar_read():
+    rng = np.random.default_rng(0)
+    D0_enc = rng.integers(0, BLOCK_MASK + 1, 5000).astype(np.uint16)
+    D1_enc = rng.integers(0, BLOCK_MASK + 1, 5000).astype(np.uint16)
+    words, D0_syndromes, D1_syndromes = read_batch(D0_enc, D1_enc)
+    for i in range(len(words)):
+        D0_dec = Hamming_lookup(int(D0_enc[i]))[2]
+        D1_dec = Hamming_lookup(int(D1_enc[i]))[2]
+        assert words[i] == (D0_dec << 8) | D1_dec
+        assert (D0_syndromes[i], D1_syndromes[i]) == (Hamming_syndrome(int(D0_enc[i])), Hamming_syndrome(int(D1_enc[i])))
+
+@pytest.mark.parametrize("batch", [check_batch, fix_batch, lambda codewords: read_batch(codewords, codewords)])
+def test_bits_above_the_codeword_are_rejected(batch):
+    with pytest.raises(ValueError):
+        batch(ALL_CODEWORDS | 0x1000)
+    with pytest.raises(ValueError):
+        batch([-1])
+
+def test_words_above_16_bits_are_rejected():
+    with pytest.raises(ValueError):
+        encode_batch(np.array([0x10000]))
+    assert encode_batch([0xFFFF])[0].tolist() == [hamming_encode(0xFF)]
+
+def test_decode_batch_extracts_the_data_bits_like_the_scalar_decode():
+    assert decode_batch(ALL_CODEWORDS | 0xF000).tolist() == [Hamming_decode(c | 0xF000) for c in range(BLOCK_MASK + 1)]
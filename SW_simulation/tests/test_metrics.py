@@ -0,0 +1,79 @@
+# Per-stripe metrics: every disk read and write lands in the row of its stripe
+import random
+
+import pytest
+
+import sim_logging as log
+from metrics import DISK_READ, DISK_WRITE, MetricsRegistry
+from raid_array import RaidArray, READ_MODIFY_WRITE, RECONSTRUCT_WRITE
+from scrubber import PatrolScrubber
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def filled_array(seed=0, **options):
+    rng = random.Random(seed)
+    array = RaidArray(num_disks=5, num_stripes=16, rng=random.Random(seed), per_stripe_metrics=True, **options)
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    for address in range(array.capacity):
+        array.add_write_request(address, rng.getrandbits(16))
+        array.handle_write_request()
+    return array
+
+def read_now(array, address):
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def assert_rows_add_up(snapshot):
+    for event in (DISK_READ, DISK_WRITE):
+        assert sum(snapshot["per_stripe"][event]) == snapshot["totals"][event]
+
+@pytest.mark.parametrize("options", [{}, {"verify_parity_on_read": True}, {"write_mode": READ_MODIFY_WRITE},
+                                     {"write_mode": RECONSTRUCT_WRITE}])
+def test_reads_are_counted_per_stripe(options):
+    array = filled_array(**options)
+    rng = random.Random(1)
+    before = array.metrics.snapshot()
+    for _ in range(200):
+        address = rng.randrange(array.capacity)
+        if rng.random() < 0.5:
+            read_now(array, address)
+        else:
+            array.add_write_request(address, rng.getrandbits(16))
+            array.handle_write_request()
+    assert_rows_add_up(array.metrics.snapshot())
+    delta = MetricsRegistry.delta(array.metrics.snapshot(), before)
+    assert sum(delta["per_stripe"][DISK_READ]) == delta["totals"][DISK_READ] > 0
+
+def test_read_lands_on_its_stripe():
+    array = filled_array()
+    stripe_num = array.locate(7)[0]
+    before = array.metrics.snapshot()
+    read_now(array, 7)
+    delta = MetricsRegistry.delta(array.metrics.snapshot(), before)
+    assert delta["per_stripe"][DISK_READ] == [2 if s == stripe_num else 0 for s in range(array.num_stripes)]
+
+def test_degraded_reads_recovery_and_scrub_are_counted():
+    array = filled_array()
+    array.disk_status[1] = 0
+    array.reset_disk(1)
+    for address in range(array.capacity):
+        read_now(array, address)
+    array.RAID5_recovery()
+    scrubber = PatrolScrubber(array, stripes_per_tick=array.num_stripes)
+    scrubber.tick()
+    assert_rows_add_up(array.metrics.snapshot())
+
+def test_reset_and_disabled_per_stripe():
+    array = filled_array()
+    read_now(array, 3)
+    array.reset_write_counters()
+    assert not any(array.metrics.snapshot()["per_stripe"][DISK_READ])
+    plain = RaidArray(num_disks=5, num_stripes=16, rng=random.Random(0))
+    assert plain.read_count_per_stripe is None
+    assert DISK_READ not in plain.metrics.snapshot()["per_stripe"]
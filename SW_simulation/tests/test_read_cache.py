@@ -0,0 +1,93 @@
+# The LRU read cache never serves a word that changed or may have been lost on the disks
+import random
+
+import pytest
+
+import sim_logging as log
+from raid_array import RaidArray
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def filled_array(read_cache_size=8, num_stripes=16, seed=0):
+    """
+    A fully written array with a read cache and the word written at every address.
+    """
+    rng = random.Random(seed)
+    array = RaidArray(num_disks=5, num_stripes=num_stripes, rng=random.Random(seed), read_cache_size=read_cache_size)
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    written = {}
+    for address in range(array.capacity):
+        written[address] = rng.getrandbits(16)
+        array.add_write_request(address, written[address])
+        array.handle_write_request()
+    return array, written
+
+def read_now(array, address):
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def fail_disk(array, disk):
+    array.disk_status[disk] = 0
+    array.reset_disk(disk)
+
+def test_second_read_is_a_hit():
+    array, written = filled_array()
+    assert read_now(array, 5) == written[5]
+    assert read_now(array, 5) == written[5]
+    assert (array.read_cache_hits, array.read_cache_misses) == (1, 1)
+
+def test_least_recently_used_word_is_evicted():
+    array, written = filled_array(read_cache_size=2)
+    for address in (1, 2, 1, 3):
+        assert read_now(array, address) == written[address]
+    assert list(array.read_cache) == [1, 3]
+    assert array.read_cache_evictions == 1
+    assert read_now(array, 2) == written[2]
+    assert array.read_cache_misses == 4
+
+def test_write_invalidates_the_word():
+    array, written = filled_array()
+    read_now(array, 5)
+    read_now(array, 6)
+    array.add_write_request(5, written[5] ^ 0xFFFF)
+    array.handle_write_request()
+    assert 5 not in array.read_cache and 6 in array.read_cache
+    assert read_now(array, 5) == written[5] ^ 0xFFFF
+    assert array.read_cache_misses == 3
+
+def test_disk_failure_invalidates_the_cache():
+    array, written = filled_array()
+    for address in range(4):
+        read_now(array, address)
+    fail_disk(array, 0)
+    assert len(array.read_cache) == 0
+    for address in range(4):
+        assert read_now(array, address) == written[address]
+    assert array.degraded_reads == 4
+
+def test_second_disk_failure_is_not_hidden_by_the_cache():
+    array, written = filled_array()
+    fail_disk(array, 0)
+    assert read_now(array, 0) == written[0]
+    fail_disk(array, 1)
+    lost = [address for address in range(array.capacity) if read_now(array, address) is None]
+    assert lost
+    assert array.read_cache_hits == 0
+
+def test_recovery_invalidates_the_cache():
+    array, written = filled_array()
+    fail_disk(array, 2)
+    for address in range(array.capacity):
+        assert read_now(array, address) == written[address]
+    array.RAID5_recovery()
+    assert len(array.read_cache) == 0
+    degraded_reads = array.degraded_reads
+    for address in range(array.capacity):
+        assert read_now(array, address) == written[address]
+    assert array.degraded_reads == degraded_reads
@@ -0,0 +1,135 @@
+# Rebuilding a failed disk gives back the data it held
+import random
+
+import pytest
+
+import sim_logging as log
+from hamming import DBE, Hamming_check
+from raid_array import RaidArray
+from rebuild import RebuildEngine
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def filled_array(num_disks=5, num_stripes=200, seed=0):
+    """
+    A fully written array and the word written at every address.
+    """
+    rng = random.Random(seed)
+    array = RaidArray(num_disks=num_disks, num_stripes=num_stripes, rng=random.Random(seed))
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    written = {}
+    for address in range(array.capacity):
+        written[address] = rng.getrandbits(16)
+        array.add_write_request(address, written[address])
+        array.handle_write_request()
+    return array, written
+
+def inject_single_bit_errors(array, skip_disk, count, seed=1):
+    """
+    Flips one bit in each of count distinct blocks outside skip_disk.
+    """
+    rng = random.Random(seed)
+    blocks = [(disk, stripe_num) for disk in range(array.num_disks) if disk != skip_disk
+              for stripe_num in range(array.num_stripes)]
+    for disk, stripe_num in rng.sample(blocks, count):
+        array.disks[disk][stripe_num] ^= 1 << rng.randrange(12)
+
+def fail_disk(array, disk):
+    array.disk_status[disk] = 0
+    array.num_of_fail_disks = array.disk_status.count(0)
+
+def assert_stripes_consistent(array):
+    for stripe_num in range(array.num_stripes):
+        parity = 0
+        for disk in range(array.num_disks):
+            parity ^= array.disks[disk][stripe_num]
+        assert parity == 0, stripe_num
+
+def test_engine_rebuilds_the_original_disk():
+    array, _ = filled_array()
+    original = list(array.disks[2])
+    fail_disk(array, 2)
+    engine = RebuildEngine(array, stripes_per_tick=7)
+    engine.start()
+    engine.run()
+    assert engine.done and array.disk_status[2] == 1
+    assert list(array.disks[2]) == original
+
+def test_engine_corrects_single_bit_errors_on_the_survivors():
+    array, _ = filled_array()
+    original = list(array.disks[0])
+    inject_single_bit_errors(array, skip_disk=0, count=50)
+    fail_disk(array, 0)
+    engine = RebuildEngine(array)
+    engine.start()
+    engine.run()
+    assert list(array.disks[0]) == original and engine.stripes_lost == 0
+
+def test_engine_keeps_foreground_writes():
+    array, written = filled_array(num_disks=4)
+    fail_disk(array, 1)
+    engine = RebuildEngine(array, stripes_per_tick=2, tick_interval=3)
+    engine.start()
+    rng = random.Random(2)
+    while not engine.done:
+        address = rng.randrange(array.capacity)
+        written[address] = rng.getrandbits(16)
+        array.add_write_request(address, written[address])
+        array.handle_write_request()
+    assert_stripes_consistent(array)
+    for address, data in written.items():
+        array.add_read_request(address)
+        assert array.handle_read_request() == data
+
+@pytest.fixture(params=["numpy", "packed ints"])
+def bulk_backend(request, monkeypatch):
+    import raid_array
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(raid_array, "np", None)
+    return request.param
+
+def test_recovery_rebuilds_the_original_disk(bulk_backend):
+    array, written = filled_array(num_disks=6)
+    original = list(array.disks[3])
+    inject_single_bit_errors(array, skip_disk=3, count=60)
+    fail_disk(array, 3)
+    array.storage.reset_disk(3)
+    array.RAID5_recovery()
+    assert array.disk_status[3] == 1 and array.lost_blocks == 0
+    assert list(array.disks[3]) == original
+    for address, data in written.items():
+        array.add_read_request(address)
+        assert array.handle_read_request() == data
+
+def test_all_rebuild_paths_agree(bulk_backend):
+    def rebuilt_disk(rebuild):
+        array, _ = filled_array(seed=3)
+        block = array.disks[1][17]
+        inject_single_bit_errors(array, skip_disk=4, count=80, seed=4)
+        array.disks[1][17] = block ^ 0b100000000001  # Positions 1 and 12 of a survivor: syndrome 13
+        assert Hamming_check(array.disks[1][17]) == DBE
+        fail_disk(array, 4)
+        array.storage.reset_disk(4)
+        rebuild(array)
+        return list(array.disks[4]), array.lost_blocks
+
+    def engine(array):
+        rebuild_engine = RebuildEngine(array)
+        rebuild_engine.start()
+        rebuild_engine.run()
+
+    def on_the_fly(array):
+        for stripe_num in range(array.num_stripes):
+            array.disks[4][stripe_num] = array.reconstruct_block(4, stripe_num)
+
+    bulk = rebuilt_disk(lambda array: array.bulk_reconstruct(4, chunk_stripes=64))
+    assert bulk == rebuilt_disk(engine) == rebuilt_disk(on_the_fly)
+    assert bulk[1] == 1 and bulk[0][17] == 0
@@ -0,0 +1,111 @@
+# RunLog: the records read back as written, and render_text reproduces the TRACE console output
+import random
+
+import pytest
+
+import sim_logging as log
+from hamming import DBE, Hamming_check
+from raid_array import RaidArray
+from run_log import (RunLog, read_run_log, render_text, failed_disk_list, READ, WRITE, FLAG_FULL_STRIPE,
+                     FLAG_SKIPPED, FLAG_D0_CORRECTED, FLAG_DEGRADED, FLAG_FAILED, WROTE_P, WROTE_D0, WROTE_D1)
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def new_array(num_disks=5, **options):
+    array = RaidArray(num_disks=num_disks, num_stripes=8, rng=random.Random(0), **options)
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    return array
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "run.log")
+    array = new_array()
+    with RunLog(path, array):
+        array.add_write_request(5, 0x1234)
+        array.handle_write_request()
+        array.add_write_request(5, 0x1234)
+        array.handle_write_request()
+        stripe_num, D0_disk, D1_disk, P_disk = array.locate(5)
+        array.disks[D0_disk][stripe_num] ^= 1 << 3
+        array.add_read_request(5)
+        array.handle_read_request()
+        array.disk_status[D1_disk] = 0
+        array.add_read_request(5)
+        array.handle_read_request()
+        array.disk_status[P_disk] = 0
+        array.add_read_request(5)
+        array.handle_read_request()
+    assert array.run_log is None
+
+    first, repeat, corrected, degraded, failed = read_run_log(path)
+    assert (first.op, first.address, first.data, first.stripe) == (WRITE, 5, 0x1234, stripe_num)
+    assert (first.D0_disk, first.D1_disk, first.P_disk) == (D0_disk, D1_disk, P_disk)
+    assert first.flags & FLAG_FULL_STRIPE and first.written == WROTE_P | WROTE_D0 | WROTE_D1
+    assert first.P == first.D0 ^ first.D1 ^ array.rest_of_stripe_parity(stripe_num, P_disk, D0_disk, D1_disk)
+    assert repeat.flags & FLAG_SKIPPED and repeat.written == 0
+    assert corrected.op == READ and corrected.flags & FLAG_D0_CORRECTED and corrected.data == 0x1234
+    assert corrected.D0 == first.D0 ^ (1 << 3)  # As read, before the correction
+    assert degraded.flags & FLAG_DEGRADED and degraded.data == 0x1234
+    assert failed_disk_list(degraded.failed_disks) == str(D1_disk)
+    assert failed.flags & FLAG_FAILED
+    assert failed_disk_list(failed.failed_disks) == ", ".join(map(str, sorted((D1_disk, P_disk))))
+
+def double_bit_error(codeword):
+    for low in range(12):
+        for high in range(low + 1, 12):
+            if Hamming_check(codeword ^ (1 << low) ^ (1 << high)) == DBE:
+                return codeword ^ (1 << low) ^ (1 << high)
+
+@pytest.mark.parametrize("num_disks, options", [
+    (3, {}), (4, {}), (5, {}), (6, {}),
+    (5, {"verify_parity_on_read": True}), (3, {"read_cache_size": 4}), (4, {"forward_reads": False}),
+    (5, {"coalesce_writes": True}),
+])
+def test_render_matches_console(tmp_path, capsys, num_disks, options):
+    path = str(tmp_path / "run.log")
+    rng = random.Random(num_disks)
+    array = new_array(num_disks, **options)
+    console = []
+
+    def handle(request_handler):
+        log.set_level(log.TRACE)
+        request_handler()
+        log.set_level(log.QUIET)
+        console.extend(capsys.readouterr().out.split("\n")[:-1])
+
+    with RunLog(path, array):
+        for phase in range(6):
+            for _ in range(200):
+                address = rng.randrange(array.capacity)
+                if rng.random() < 0.45:
+                    array.add_write_request(address, rng.getrandbits(16) if rng.random() < 0.7 else address * 3)
+                    if rng.random() < 0.5:
+                        handle(array.handle_write_request)
+                else:
+                    array.add_read_request(address)
+                    handle(array.handle_read_request)
+                if rng.random() < 0.1:
+                    disk = rng.randrange(num_disks)
+                    stripe_num = rng.randrange(array.num_stripes)
+                    if rng.random() < 0.7:
+                        array.disks[disk][stripe_num] ^= 1 << rng.randrange(12)
+                    else:
+                        array.disks[disk][stripe_num] = double_bit_error(array.disks[disk][stripe_num])
+                    array.invalidate_stripe(stripe_num)
+            while len(array.write_buffer):
+                handle(array.handle_write_request)
+            # Healthy, one disk failed, two failed, healthy again
+            if phase == 1:
+                array.disk_status[rng.randrange(num_disks)] = 0
+            elif phase == 3:
+                array.disk_status[(array.disk_status.index(0) + 1) % num_disks] = 0
+            elif phase == 4:
+                array.disk_status[:] = [1] * num_disks
+        capsys.readouterr()
+
+    assert list(render_text(read_run_log(path), array.address_bits)) == console
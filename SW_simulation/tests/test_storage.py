@@ -0,0 +1,68 @@
+# MmapStorage: an image set written by one array reads back the same after reopening
+import random
+
+import pytest
+
+import sim_logging as log
+from raid_array import RaidArray
+from storage import MmapStorage
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def write_words(array, count, seed=0):
+    rng = random.Random(seed)
+    array.write_sys_is_ready = 1
+    written = {}
+    for _ in range(count):
+        address = rng.randrange(array.capacity)
+        written[address] = rng.getrandbits(16)
+        array.add_write_request(address, written[address])
+        array.handle_write_request()
+    return written
+
+def read_word(array, address):
+    array.read_sys_is_ready = 1
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def test_reopen_round_trip(tmp_path):
+    path = str(tmp_path / "images")
+    array = RaidArray(num_disks=5, num_stripes=300, storage=MmapStorage(path, 5, 300))
+    written = write_words(array, 1000)
+    disks = [list(disk) for disk in array.disks]
+    stripe_valid = bytes(array.stripe_valid)
+    block_writes = [list(counts) for counts in array.write_count_per_block]
+    array.close()
+
+    reopened = RaidArray(storage=MmapStorage(path))
+    assert (reopened.num_disks, reopened.num_stripes) == (5, 300)
+    assert [list(disk) for disk in reopened.disks] == disks
+    assert bytes(reopened.stripe_valid) == stripe_valid
+    assert [list(counts) for counts in reopened.write_count_per_block] == block_writes
+    for address, data in written.items():
+        assert read_word(reopened, address) == data
+    reopened.close()
+
+def test_reset_disk_is_persisted(tmp_path):
+    path = str(tmp_path / "images")
+    array = RaidArray(num_disks=3, num_stripes=64, storage=MmapStorage(path, 3, 64))
+    write_words(array, 100)
+    array.reset_disk(1)
+    array.close()
+
+    reopened = RaidArray(storage=MmapStorage(path))
+    assert not any(reopened.disks[1])
+    reopened.close()
+
+def test_reopen_checks_the_geometry(tmp_path):
+    path = str(tmp_path / "images")
+    MmapStorage(path, 3, 64).close()
+    with pytest.raises(ValueError):
+        MmapStorage(path, 4, 64)
+    with pytest.raises(ValueError):
+        MmapStorage(str(tmp_path / "missing"))
@@ -0,0 +1,38 @@
+# Parameter sweep: seeds independent of the worker count, and per-block aggregation
+import pytest
+
+from sweep import make_tasks, run_sweep, aggregate
+
+
+def without_timings(table):
+    return [{key: value for key, value in row.items() if key != "elapsed"} for row in table]
+
+def small_tasks(base_seed=7):
+    return make_tasks([50, 400], ["round_robin", "fixed_parity"], [0.0, 0.5], 3, base_seed=base_seed,
+                      disks=(3, 5), stripes=(8,))
+
+def test_fixed_base_seed_gives_the_same_aggregates_on_any_number_of_workers():
+    serial = aggregate(run_sweep(small_tasks(), workers=1))
+    parallel = aggregate(run_sweep(small_tasks(), workers=3))
+    assert without_timings(serial) == without_timings(parallel)
+
+def test_base_seed_changes_the_results():
+    first = aggregate(run_sweep(small_tasks(base_seed=7), workers=1))
+    second = aggregate(run_sweep(small_tasks(base_seed=8), workers=1))
+    assert without_timings(first) != without_timings(second)
+
+def test_writes_per_block_add_up_to_writes_per_disk():
+    results = run_sweep(small_tasks(), workers=1)
+    for row in aggregate(results):
+        assert len(row["writes_per_block"]) == row["num_disks"]
+        for disk, block_means in enumerate(row["writes_per_block"]):
+            assert len(block_means) == row["num_stripes"]
+            assert sum(mean for mean, _ in block_means) == pytest.approx(row["writes_per_disk"][disk][0])
+        hottest = row["block_writes_max"][0]
+        assert max(mean for block_means in row["writes_per_block"] for mean, _ in block_means) <= hottest
+        assert row["block_wear_cov"][0] >= 0
+
+def test_single_replicate_has_no_confidence_interval():
+    row = aggregate(run_sweep(make_tasks([100], ["round_robin"], [0.25], 1), workers=1))[0]
+    assert all(ci == 0.0 for block_means in row["writes_per_block"] for _, ci in block_means)
+    assert row["block_writes_max"][1] == 0.0
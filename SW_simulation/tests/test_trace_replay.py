@@ -0,0 +1,82 @@
+# Trace replay: CSV and binary traces parse to the same records, and replaying them leaves the expected data
+import gzip
+import random
+
+import pytest
+
+import sim_logging as log
+from raid_array import RaidArray
+from trace_replay import (READ, WRITE, SECTOR_SIZE, TraceReplay, convert_to_binary, expand_records, read_csv_trace,
+                          read_trace)
+
+TRACE = """timestamp,op,lba,size
+0.0,W,0,512
+0.5,write,3,1536
+1.0,R,3,512
+1.5,w,63,1024
+2.0,read,1,4096
+2.5,W,3,100
+"""
+RECORDS = [(0.0, WRITE, 0, 512), (0.5, WRITE, 3, 1536), (1.0, READ, 3, 512), (1.5, WRITE, 63, 1024),
+           (2.0, READ, 1, 4096), (2.5, WRITE, 3, 100)]
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+@pytest.fixture
+def csv_trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text(TRACE)
+    return str(path)
+
+def make_array():
+    return RaidArray(num_disks=5, num_stripes=32, rng=random.Random(0))
+
+def test_csv_trace_parses(csv_trace):
+    assert list(read_csv_trace(csv_trace)) == RECORDS
+
+def test_binary_and_gzip_round_trip(csv_trace, tmp_path):
+    binary = str(tmp_path / "trace.bin")
+    assert convert_to_binary(csv_trace, binary) == len(RECORDS)
+    assert list(read_trace(binary)) == RECORDS
+    compressed = str(tmp_path / "trace.csv.gz")
+    with gzip.open(compressed, "wt") as file:
+        file.write(TRACE)
+    assert list(read_trace(compressed)) == RECORDS
+
+def test_unknown_operation_is_rejected(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("0.0,W,0,512\n1.0,X,0,512\n")
+    with pytest.raises(ValueError):
+        list(read_csv_trace(str(path)))
+
+def test_records_expand_to_one_word_per_sector():
+    capacity = make_array().capacity
+    words = list(expand_records(RECORDS, capacity))
+    assert len(words) == sum(max(1, -(-size // SECTOR_SIZE)) for _, _, _, size in RECORDS)
+    assert words[:4] == [(WRITE, 0), (WRITE, 3), (WRITE, 4), (WRITE, 5)]
+    assert (WRITE, 0) in words[5:7]  # Sector 64 wraps onto word 0
+
+@pytest.mark.parametrize("forward_reads", [True, False])
+def test_replay_leaves_the_written_data(csv_trace, forward_reads):
+    array = RaidArray(num_disks=5, num_stripes=32, rng=random.Random(0), forward_reads=forward_reads)
+    replay = TraceReplay(array, write_batch=2, rng=random.Random(7))
+    replay.replay(csv_trace)
+    data = random.Random(7)
+    expected = {address: data.getrandbits(16)
+                for op, address in expand_records(RECORDS, array.capacity) if op == WRITE}
+    assert (replay.records, replay.reads, replay.writes) == (len(RECORDS), 9, 7)
+    assert len(array.write_buffer) == 0 and len(array.read_buffer) == 0
+    for address, word in expected.items():
+        array.add_read_request(address)
+        assert array.handle_read_request() == word
+
+def test_in_memory_records_replay_like_the_file(csv_trace):
+    from_file, in_memory = make_array(), make_array()
+    TraceReplay(from_file, write_batch=2, rng=random.Random(7)).replay(csv_trace)
+    TraceReplay(in_memory, write_batch=2, rng=random.Random(7)).replay_records(iter(RECORDS))
+    assert [list(disk) for disk in in_memory.disks] == [list(disk) for disk in from_file.disks]
@@ -0,0 +1,77 @@
+# Workload: rewrite semantics across chunk boundaries, and the stream as applied to an array
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import sim_logging as log
+from raid_array import RaidArray
+from trace_replay import READ, WRITE
+from workloads import Workload, UNIFORM, ZIPF, SEQUENTIAL
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def writes_of(workload, num_requests):
+    return [(address, data) for op, address, data in workload.requests(num_requests) if op == WRITE]
+
+def test_d0_only_rewrites_keep_d1_across_chunks():
+    workload = Workload(1 << 20, rewrite_ratio=1.0, d0_only_ratio=1.0, d1_only_ratio=0.0, chunk_size=3, seed=1)
+    address, D1 = workload.last_address, workload.last_D1
+    writes = writes_of(workload, 1000)
+    assert {a for a, _ in writes} == {address}
+    assert {data & 0xFF for _, data in writes} == {D1}
+    assert len({data >> 8 for _, data in writes}) > 200
+
+def test_d1_only_rewrites_keep_d0_across_chunks():
+    workload = Workload(1 << 20, read_ratio=0.5, rewrite_ratio=1.0, d0_only_ratio=0.0, d1_only_ratio=1.0,
+                        chunk_size=4, seed=2)
+    D0 = workload.last_D0
+    assert {data >> 8 for _, data in writes_of(workload, 1000)} == {D0}
+
+def test_rewrites_follow_the_last_fresh_write():
+    # With 2^20 words a fresh write practically never repeats the previous address, so a write to the
+    # previous write's address with its D1 is a D0-only rewrite: about rewrite_ratio of the writes,
+    # at the start of a chunk as well as inside one
+    workload = Workload(1 << 20, read_ratio=0.3, rewrite_ratio=0.5, d0_only_ratio=1.0, d1_only_ratio=0.0,
+                        chunk_size=3, seed=3)
+    previous = None
+    rewrites = {True: [], False: []}  # First request of a chunk -> rewrite or not
+    for i, (op, address, data) in enumerate(workload.requests(30000)):
+        if op != WRITE:
+            continue
+        if previous is not None:
+            rewrite = address == previous[0] and data & 0xFF == previous[1] & 0xFF
+            rewrites[i % 3 == 0].append(rewrite)
+        previous = (address, data)
+    for at_chunk_start in (True, False):
+        assert np.mean(rewrites[at_chunk_start]) == pytest.approx(0.5, abs=0.03)
+
+def test_reads_carry_no_data():
+    ops, addresses, data = next(Workload(1000, read_ratio=0.4, seed=4).chunks(5000))
+    assert set(ops.tolist()) == {READ, WRITE}
+    assert not data[ops == READ].any()
+    assert ((0 <= addresses) & (addresses < 1000)).all()
+
+@pytest.mark.parametrize("distribution", [UNIFORM, ZIPF, SEQUENTIAL])
+def test_addresses_stay_in_capacity(distribution):
+    for ops, addresses, _ in Workload(777, distribution=distribution, chunk_size=500, seed=5).chunks(3000):
+        assert ((0 <= addresses) & (addresses < 777)).all()
+
+def test_sequential_continues_across_chunks():
+    addresses = [address for _, address, _ in Workload(10, distribution=SEQUENTIAL, chunk_size=3, seed=6).requests(25)]
+    assert addresses == [i % 10 for i in range(25)]
+
+def test_apply_leaves_the_last_write_of_every_word():
+    array = RaidArray(num_disks=5, num_stripes=64, rng=random.Random(0))
+    options = dict(read_ratio=0.3, rewrite_ratio=0.4, chunk_size=100, seed=7)
+    expected = dict(writes_of(Workload(array.capacity, **options), 4000))
+    Workload(array.capacity, **options).apply(array, 4000, write_batch=16)
+    for address, data in expected.items():
+        array.add_read_request(address)
+        assert array.handle_read_request() == data
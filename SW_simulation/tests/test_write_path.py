@@ -0,0 +1,112 @@
+# Small writes to a valid stripe: read-modify-write and reconstruct-write give the same, correct parity
+import random
+
+import pytest
+
+import sim_logging as log
+from hamming import DBE, Hamming_check, Hamming_fix
+from raid_array import RaidArray, AUTO_WRITE, READ_MODIFY_WRITE, RECONSTRUCT_WRITE
+
+WRITE_MODES = (AUTO_WRITE, READ_MODIFY_WRITE, RECONSTRUCT_WRITE)
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    previous_level = log.set_level(log.QUIET)
+    yield
+    log.set_level(previous_level)
+
+def new_array(**options):
+    array = RaidArray(rng=random.Random(0), **options)
+    array.write_sys_is_ready = 1
+    array.read_sys_is_ready = 1
+    return array
+
+def write(array, address, data):
+    array.add_write_request(address, data)
+    array.handle_write_request()
+
+def read(array, address):
+    array.add_read_request(address)
+    return array.handle_read_request()
+
+def assert_stripes_consistent(array):
+    """
+    The parity of every stripe matches its data, once latent single-bit errors are corrected.
+    """
+    for stripe_num in range(array.num_stripes):
+        parity = 0
+        for disk in range(array.num_disks):
+            parity ^= Hamming_fix(array.disks[disk][stripe_num])
+        assert parity == 0, stripe_num
+
+@pytest.mark.parametrize("write_mode", WRITE_MODES)
+def test_single_bit_errors_in_the_old_word_stay_out_of_the_parity(write_mode):
+    # Words 0 and 4 share stripe 0; errors on word 0's old blocks must not corrupt the parity word 4 relies on
+    array = new_array(num_disks=5, num_stripes=4, write_mode=write_mode)
+    write(array, 0, 0x1234)
+    write(array, 4, 0x5678)
+    stripe_num, D0_disk, D1_disk, parity_disk = array.locate(0)
+    array.disks[D0_disk][stripe_num] ^= 1 << 2
+    array.disks[D1_disk][stripe_num] ^= 1 << 7
+    array.disks[parity_disk][stripe_num] ^= 1 << 5
+    write(array, 0, 0x9999)
+    assert_stripes_consistent(array)
+
+    array.disk_status[array.locate(4)[1]] = 0
+    assert read(array, 4) == 0x5678
+    assert read(array, 0) == 0x9999
+
+@pytest.mark.parametrize("write_mode", WRITE_MODES)
+def test_single_bit_errors_on_the_rest_of_the_stripe_stay_out_of_the_parity(write_mode):
+    array = new_array(num_disks=7, num_stripes=4, write_mode=write_mode)
+    for address in range(array.capacity):
+        write(array, address, 0x0101 * address)
+    stripe_num, D0_disk, D1_disk, _ = array.locate(4)
+    array.disks[D0_disk][stripe_num] ^= 1 << 9
+    array.disks[D1_disk][stripe_num] ^= 1 << 0
+    write(array, 0, 0xBEEF)
+    assert_stripes_consistent(array)
+    array.disk_status[array.locate(8)[2]] = 0
+    assert read(array, 8) == 0x0808
+
+def test_uncorrectable_old_block_falls_back_to_reconstruct_write():
+    array = new_array(num_disks=5, num_stripes=4, write_mode=READ_MODIFY_WRITE)
+    write(array, 0, 0x1234)
+    write(array, 4, 0x5678)
+    stripe_num, D0_disk, _, _ = array.locate(0)
+    array.disks[D0_disk][stripe_num] ^= 0b100000000001  # Positions 1 and 12: syndrome 13
+    assert Hamming_check(array.disks[D0_disk][stripe_num]) == DBE
+    read_modify_writes = array.read_modify_writes
+    reconstruct_writes = array.reconstruct_writes
+    write(array, 0, 0x9999)
+    assert array.read_modify_writes == read_modify_writes
+    assert array.reconstruct_writes == reconstruct_writes + 1
+    assert_stripes_consistent(array)
+    assert read(array, 4) == 0x5678
+
+@pytest.mark.parametrize("num_disks", [3, 4, 5, 6, 8])
+@pytest.mark.parametrize("write_mode", WRITE_MODES)
+def test_any_disk_can_fail_after_writes_over_single_bit_errors(num_disks, write_mode):
+    array = new_array(num_disks=num_disks, num_stripes=16, write_mode=write_mode)
+    rng = random.Random(num_disks)
+    written = {}
+    blocks = [(disk, stripe_num) for disk in range(num_disks) for stripe_num in range(array.num_stripes)]
+    corrupted = set(rng.sample(blocks, len(blocks) // 4))
+    for address in range(array.capacity):
+        written[address] = rng.getrandbits(16)
+        write(array, address, written[address])
+    for disk, stripe_num in corrupted:  # At most one flipped bit per block, never corrected by a read
+        array.disks[disk][stripe_num] ^= 1 << rng.randrange(12)
+    for _ in range(500):
+        address = rng.randrange(array.capacity)
+        written[address] = rng.getrandbits(16)
+        write(array, address, written[address])
+    assert_stripes_consistent(array)
+
+    # Whichever disk fails, the rest of each stripe rebuilds its block
+    for failed_disk in range(num_disks):
+        for stripe_num in range(array.num_stripes):
+            assert array.stripe_xor(failed_disk, stripe_num) == Hamming_fix(array.disks[failed_disk][stripe_num])
+    for address, data in written.items():
+        assert read(array, address) == data
@@ -0,0 +1,253 @@
+# Streaming block-trace replay
+#
+# Replays recorded block I/O traces through a RaidArray instead of the random workloads. Every stage is a
+# generator, so memory stays bounded whatever the trace size:
+#   read_csv_trace / read_binary_trace  ->  records (timestamp, op, lba, size)
+#   expand_records                       ->  one (op, address) per sector, mapped onto the array
+#   replay                               ->  feeds the write/read buffers, draining the writes in batches
+#
+# Formats (a .gz suffix is decompressed on the fly):
+#   CSV:    timestamp,op,lba,size per line; op is R/W (or read/write); an optional header line is skipped
+#   binary: little-endian records of RECORD_FORMAT: float64 timestamp, uint8 op (0 = read, 1 = write),
+#           uint64 lba, uint32 size. convert_to_binary() turns a CSV trace into one.
+# lba counts SECTOR_SIZE-byte sectors and size is in bytes. Each sector maps to one 16-bit word of the array
+# (address = lba modulo the capacity): the simulator models placement and disk I/O, not capacity.
+# Traces carry no payload, so write data comes from the rng.
+#
+# Run from SW_simulation/:
+#   python trace_replay.py trace.csv --disks 5 --stripes 65536
+#   python trace_replay.py trace.csv --convert trace.bin && python trace_replay.py trace.bin
+import argparse
+import gzip
+import os
+import random
+import struct
+import time
+
+import sim_logging as log
+from raid_array import RaidArray
+
+SECTOR_SIZE = 512
+READ = 0
+WRITE = 1
+RECORD_FORMAT = "<dBQI"
+RECORD = struct.Struct(RECORD_FORMAT)
+RECORDS_PER_CHUNK = 65536  # Binary records unpacked per file read
+WRITE_BATCH = 4096  # Queued writes that trigger a drain of the write buffer
+PROGRESS_INTERVAL = 1_000_000  # Records between two progress lines
+
+OPS = {"r": READ, "read": READ, "0": READ, "w": WRITE, "write": WRITE, "1": WRITE}
+
+
+def open_trace(path, mode="rb"):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+def parse_op(op):
+    try:
+        return OPS[op.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Unknown trace operation: {op!r}") from None
+
+def read_csv_trace(path, progress=None):
+    """
+    Yields (timestamp, op, lba, size) records from a CSV trace.
+    Args:
+        progress (list): if given, progress[0] is kept at the number of trace bytes consumed
+    """
+    with open_trace(path) as file:
+        consumed = 0
+        for line_number, line in enumerate(file, 1):
+            consumed += len(line)
+            if progress is not None:
+                progress[0] = consumed
+            line = line.strip()
+            if not line or line.startswith(b"#"):
+                continue
+            fields = line.decode("ascii").split(",")
+            if len(fields) != 4:
+                raise ValueError(f"{path}:{line_number}: expected timestamp,op,lba,size, got {line!r}")
+            try:
+                yield float(fields[0]), parse_op(fields[1]), int(fields[2]), int(fields[3])
+            except ValueError:
+                if line_number == 1:
+                    continue  # Header line
+                raise
+
+def read_binary_trace(path, progress=None):
+    """
+    Yields (timestamp, op, lba, size) records from a binary trace, RECORDS_PER_CHUNK records per read.
+    """
+    chunk_size = RECORD.size * RECORDS_PER_CHUNK
+    with open_trace(path) as file:
+        consumed = 0
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            if len(chunk) % RECORD.size:
+                raise ValueError(f"{path}: truncated last record")
+            consumed += len(chunk)
+            if progress is not None:
+                progress[0] = consumed
+            yield from RECORD.iter_unpack(chunk)
+
+def read_trace(path, progress=None):
+    """
+    Picks the reader from the file name: .csv (or .csv.gz) is CSV, anything else binary.
+    """
+    if path.endswith(".csv") or path.endswith(".csv.gz"):
+        return read_csv_trace(path, progress)
+    return read_binary_trace(path, progress)
+
+def convert_to_binary(csv_path, binary_path):
+    """
+    Converts a CSV trace into the binary format. Returns the number of records written.
+    """
+    count = 0
+    with open_trace(binary_path, "wb") as out:
+        batch = []
+        for record in read_csv_trace(csv_path):
+            batch.append(RECORD.pack(*record))
+            if len(batch) == RECORDS_PER_CHUNK:
+                out.write(b"".join(batch))
+                count += len(batch)
+                batch.clear()
+        out.write(b"".join(batch))
+        count += len(batch)
+    return count
+
+def expand_records(records, capacity):
+    """
+    Yields one (op, address) per sector of every record (at least one per record).
+    """
+    for _, op, lba, size in records:
+        sectors = max(1, -(-size // SECTOR_SIZE))
+        for sector in range(lba, lba + sectors):
+            yield op, sector % capacity
+
+
+class TraceReplay:
+    """
+    Args:
+        array (RaidArray): the array to replay into
+        write_batch (int): queued writes that trigger a drain of the write buffer
+        progress_interval (int): records between two progress lines (0 = none)
+        rng (random.Random): source of the write data
+    """
+    __slots__ = ("array", "write_batch", "progress_interval", "rng", "records", "reads", "writes",
+                 "trace_bytes", "elapsed")
+
+    def __init__(self, array, write_batch=WRITE_BATCH, progress_interval=PROGRESS_INTERVAL, rng=None):
+        if write_batch < 1 or write_batch > array.write_buffer.capacity:
+            raise ValueError(f"write_batch must be 1-{array.write_buffer.capacity}, got {write_batch}.")
+        self.array = array
+        self.write_batch = write_batch
+        self.progress_interval = progress_interval
+        self.rng = rng if rng is not None else random.Random()
+        self.records = 0
+        self.reads = 0  # Word reads issued
+        self.writes = 0  # Word writes issued
+        self.trace_bytes = 0
+        self.elapsed = 0.0
+
+    def drain_writes(self):
+        array = self.array
+        while len(array.write_buffer) > 0:
+            array.handle_write_request()
+
+    def replay(self, path):
+        """
+        Replays a whole trace file.
+        """
+        total_bytes = 0 if path.endswith(".gz") else os.path.getsize(path)  # Progress is in uncompressed bytes
+        progress = [0]
+        records = read_trace(path, progress)
+        return self.replay_records(records, progress, total_bytes)
+
+    def replay_records(self, records, progress=None, total_bytes=0):
+        """
+        Replays (timestamp, op, lba, size) records from any iterable.
+        """
+        array = self.array
+        array.write_sys_is_ready = 1
+        array.read_sys_is_ready = 1
+        getrandbits = self.rng.getrandbits
+        write_buffer = array.write_buffer
+        level = log.level
+        start = time.perf_counter()
+
+        def counted(records):
+            for record in records:
+                self.records += 1
+                if self.progress_interval and self.records % self.progress_interval == 0:
+                    self.print_progress(start, progress, total_bytes)
+                yield record
+
+        for op, address in expand_records(counted(records), array.capacity):
+            if op == WRITE:
+                array.add_write_request(address, getrandbits(16))
+                self.writes += 1
+                if len(write_buffer) >= self.write_batch:
+                    self.drain_writes()
+            else:
+                if not array.forward_reads:
+                    self.drain_writes()  # Without forwarding, a read must not pass the writes queued before it
+                array.add_read_request(address)
+                array.handle_read_request()
+                self.reads += 1
+        self.drain_writes()
+
+        self.elapsed += time.perf_counter() - start
+        if progress is not None:
+            self.trace_bytes += progress[0]
+        if level >= log.SUMMARY:
+            self.print_report()
+
+    def print_progress(self, start, progress, total_bytes):
+        if log.level < log.SUMMARY:
+            return
+        elapsed = time.perf_counter() - start
+        done = f" ({progress[0] / total_bytes * 100:.1f}% of the trace)" if progress is not None and total_bytes else ""
+        print(f"⏳ {self.records:,} records{done}, {self.records / elapsed:,.0f} records/s", flush=True)
+
+    def print_report(self):
+        if log.level < log.SUMMARY:
+            return
+        rate = self.records / self.elapsed if self.elapsed else 0.0
+        print("\n📼 Trace Replay Summary:")
+        print(f"Records: {self.records:,} -> {self.reads:,} word reads, {self.writes:,} word writes")
+        print(f"Time: {self.elapsed:.2f} s, {rate:,.0f} records/s, "
+              f"{(self.reads + self.writes) / self.elapsed if self.elapsed else 0.0:,.0f} words/s")
+        if self.trace_bytes:
+            print(f"Trace throughput: {self.trace_bytes / self.elapsed / 1e6 if self.elapsed else 0.0:.1f} MB/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a block I/O trace through the RAID 5 simulator.")
+    parser.add_argument("trace", help="CSV (.csv, .csv.gz) or binary trace")
+    parser.add_argument("--convert", metavar="OUT", help="only convert the CSV trace into a binary trace")
+    parser.add_argument("--disks", type=int, default=5)
+    parser.add_argument("--stripes", type=int, default=65536)
+    parser.add_argument("--write-batch", type=int, default=WRITE_BATCH)
+    parser.add_argument("--progress", type=int, default=PROGRESS_INTERVAL, help="records between progress lines")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.convert:
+        count = convert_to_binary(args.trace, args.convert)
+        print(f"✅ {count:,} records written to {args.convert}")
+        return
+
+    log.set_level(log.SUMMARY)  # Progress and summaries, no per-request output
+    array = RaidArray(num_disks=args.disks, num_stripes=args.stripes, rng=random.Random(args.seed))
+    replay = TraceReplay(array, write_batch=args.write_batch, progress_interval=args.progress,
+                         rng=random.Random(args.seed))
+    replay.replay(args.trace)
+    for disk in range(array.num_disks):
+        print(f"Disk {disk}: {array.read_count_per_disk[disk]:,} reads, {array.write_count_per_disk[disk]:,} writes")
+
+
+if __name__ == "__main__":
+    main()
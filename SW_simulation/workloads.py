@@ -0,0 +1,230 @@
+# Vectorized synthetic workloads
+#
+# simulate_random_write_requests / simulate_mixed_write_distribution draw one request at a time with a uniform
+# address and a fixed rewrite pattern. A Workload describes the stream instead and generates it in NumPy
+# chunks of chunk_size requests, yielded lazily: a 10^7-request workload never exists as a list, and the only
+# per-request Python loop left is the array's own handling of each request.
+#
+# Per request:
+#   op       READ with probability read_ratio, else WRITE
+#   address  from the address distribution: UNIFORM, ZIPF (hot spots: rank k is accessed ~ 1 / k^zipf_s,
+#            ranks scattered over the array) or SEQUENTIAL (wrapping around the capacity)
+#   rewrite  a write is, with probability rewrite_ratio, a rewrite of the word last written by a fresh
+#            (non-rewrite) write, like the repeated writes of simulate_mixed_write_distribution. A rewrite
+#            changes only D0 (d0_only_ratio), only D1 (d1_only_ratio) or the whole word (the rest).
+# Rewrites keep the other byte as last written, across chunk boundaries too.
+#
+# Usage:
+#   workload = Workload(array.capacity, distribution=ZIPF, read_ratio=0.3, rewrite_ratio=0.25, seed=1)
+#   for ops, addresses, data in workload.chunks(10**7): ...     # NumPy arrays
+#   for op, address, data in workload.requests(1000): ...       # Python ints
+#   workload.apply(array, 10**6)                                 # run it through a RaidArray
+# Run from SW_simulation/:  python workloads.py --requests 1000000 --distribution zipf --read-ratio 0.3
+import argparse
+import time
+
+import numpy as np
+
+import sim_logging as log
+from metrics import SKIPPED_WRITE
+from raid_array import RaidArray
+from trace_replay import READ, WRITE, WRITE_BATCH
+
+# Address distributions
+UNIFORM = "uniform"
+ZIPF = "zipf"
+SEQUENTIAL = "sequential"
+DISTRIBUTIONS = (UNIFORM, ZIPF, SEQUENTIAL)
+
+CHUNK_SIZE = 65536  # Requests generated per NumPy chunk
+
+
+class Workload:
+    """
+    Args:
+        capacity (int): addressable words (RaidArray.capacity)
+        distribution (str): one of DISTRIBUTIONS
+        read_ratio (float): fraction of the requests that are reads
+        rewrite_ratio (float): fraction of the writes that rewrite the last freshly written word
+        d0_only_ratio (float): fraction of the rewrites that change only D0 (upper byte)
+        d1_only_ratio (float): fraction of the rewrites that change only D1 (lower byte)
+        zipf_s (float): Zipf exponent (ZIPF only, > 0)
+        chunk_size (int): requests generated per chunk
+        seed: seed or np.random.Generator
+    """
+    __slots__ = ("capacity", "distribution", "read_ratio", "rewrite_ratio", "d0_only_ratio", "d1_only_ratio",
+                 "zipf_s", "chunk_size", "rng", "cursor", "zipf_cdf", "zipf_order", "last_address", "last_D0",
+                 "last_D1")
+
+    def __init__(self, capacity, distribution=UNIFORM, read_ratio=0.0, rewrite_ratio=0.0, d0_only_ratio=0.5,
+                 d1_only_ratio=0.5, zipf_s=1.1, chunk_size=CHUNK_SIZE, seed=None):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Invalid distribution: {distribution!r}. Use one of {', '.join(DISTRIBUTIONS)}.")
+        for name, ratio in (("read_ratio", read_ratio), ("rewrite_ratio", rewrite_ratio),
+                            ("d0_only_ratio", d0_only_ratio), ("d1_only_ratio", d1_only_ratio)):
+            if not 0.0 <= ratio <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1, got {ratio}.")
+        if d0_only_ratio + d1_only_ratio > 1.0:
+            raise ValueError("d0_only_ratio + d1_only_ratio must not exceed 1.")
+        if distribution == ZIPF and zipf_s <= 0:
+            raise ValueError("zipf_s must be positive.")
+        if capacity < 1 or chunk_size < 1:
+            raise ValueError("capacity and chunk_size must be at least 1.")
+        self.capacity = capacity
+        self.distribution = distribution
+        self.read_ratio = read_ratio
+        self.rewrite_ratio = rewrite_ratio
+        self.d0_only_ratio = d0_only_ratio
+        self.d1_only_ratio = d1_only_ratio
+        self.zipf_s = zipf_s
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self.cursor = 0  # Next SEQUENTIAL address
+        self.zipf_cdf = None  # Built on first use
+        self.zipf_order = None
+        # The word a rewrite targets before any fresh write, as in simulate_mixed_write_distribution
+        self.last_address = int(self.rng.integers(capacity))
+        self.last_D0 = int(self.rng.integers(256))
+        self.last_D1 = int(self.rng.integers(256))
+
+    def draw_addresses(self, count):
+        rng = self.rng
+        if self.distribution == UNIFORM:
+            return rng.integers(0, self.capacity, count)
+        if self.distribution == SEQUENTIAL:
+            addresses = (self.cursor + np.arange(count)) % self.capacity
+            self.cursor = (self.cursor + count) % self.capacity
+            return addresses
+        if self.zipf_cdf is None:
+            weights = np.arange(1, self.capacity + 1, dtype=np.float64) ** -self.zipf_s
+            self.zipf_cdf = np.cumsum(weights / weights.sum())
+            self.zipf_order = rng.permutation(self.capacity)  # Rank -> address, so hot spots are scattered
+        ranks = np.searchsorted(self.zipf_cdf, rng.random(count), side="right")
+        return self.zipf_order[np.minimum(ranks, self.capacity - 1)]
+
+    def next_chunk(self, n):
+        """
+        Returns:
+            tuple: (ops uint8, addresses int64, data int64) arrays of n requests; data is 0 for reads
+        """
+        rng = self.rng
+        index = np.arange(n)
+        writes = rng.random(n) >= self.read_ratio
+        ops = np.where(writes, WRITE, READ).astype(np.uint8)
+        rewrites = writes & (rng.random(n) < self.rewrite_ratio)
+        fresh = ~rewrites
+        kind = rng.random(n)
+        d0_only = rewrites & (kind < self.d0_only_ratio)
+        d1_only = rewrites & ~d0_only & (kind < self.d0_only_ratio + self.d1_only_ratio)
+
+        addresses = np.zeros(n, dtype=np.int64)
+        addresses[fresh] = self.draw_addresses(int(np.count_nonzero(fresh)))
+        # Rewrites target the last fresh write (or the word carried over from the previous chunk)
+        source = np.maximum.accumulate(np.where(writes & fresh, index, -1))
+        targets = np.where(source >= 0, addresses[source], self.last_address)
+        addresses[rewrites] = targets[rewrites]
+
+        # Each byte comes from the last write that set it: new random bytes, except the kept half of a rewrite
+        new = rng.integers(0, 0x10000, n)
+        source = np.maximum.accumulate(np.where(writes & ~d1_only, index, -1))
+        D0 = np.where(source >= 0, new[source] >> 8, self.last_D0)
+        source = np.maximum.accumulate(np.where(writes & ~d0_only, index, -1))
+        D1 = np.where(source >= 0, new[source] & 0xFF, self.last_D1)
+        data = np.where(writes, (D0 << 8) | D1, 0)
+
+        self.last_address = int(targets[-1])
+        self.last_D0 = int(D0[-1])
+        self.last_D1 = int(D1[-1])
+        return ops, addresses, data
+
+    def chunks(self, num_requests):
+        """
+        Yields (ops, addresses, data) NumPy arrays of up to chunk_size requests, num_requests in total.
+        """
+        remaining = num_requests
+        while remaining > 0:
+            n = min(self.chunk_size, remaining)
+            remaining -= n
+            yield self.next_chunk(n)
+
+    def requests(self, num_requests):
+        """
+        Yields (op, address, data) tuples of Python ints, one chunk converted at a time.
+        """
+        for ops, addresses, data in self.chunks(num_requests):
+            yield from zip(ops.tolist(), addresses.tolist(), data.tolist())
+
+    def apply(self, array, num_requests, write_batch=WRITE_BATCH):
+        """
+        Runs num_requests requests through a RaidArray: writes are queued and drained every write_batch
+        requests, reads are served as they come (after the queued writes, unless the array forwards reads).
+        """
+        if write_batch < 1 or write_batch > array.write_buffer.capacity:
+            raise ValueError(f"write_batch must be 1-{array.write_buffer.capacity}, got {write_batch}.")
+        if self.capacity > array.capacity:
+            raise ValueError(f"Workload capacity {self.capacity} exceeds the array capacity {array.capacity}.")
+        array.write_sys_is_ready = 1
+        array.read_sys_is_ready = 1
+        write_buffer = array.write_buffer
+        forward_reads = array.forward_reads
+
+        def drain_writes():
+            while len(write_buffer) > 0:
+                array.handle_write_request()
+
+        for op, address, data in self.requests(num_requests):
+            if op == WRITE:
+                array.add_write_request(address, data)
+                if len(write_buffer) >= write_batch:
+                    drain_writes()
+            else:
+                if not forward_reads:
+                    drain_writes()
+                array.add_read_request(address)
+                array.handle_read_request()
+        drain_writes()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic workload and run it through the RAID 5 simulator.")
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default=UNIFORM)
+    parser.add_argument("--read-ratio", type=float, default=0.0)
+    parser.add_argument("--rewrite-ratio", type=float, default=0.25)
+    parser.add_argument("--d0-only", type=float, default=0.5, help="fraction of the rewrites changing only D0")
+    parser.add_argument("--d1-only", type=float, default=0.5, help="fraction of the rewrites changing only D1")
+    parser.add_argument("--zipf-s", type=float, default=1.1)
+    parser.add_argument("--disks", type=int, default=5)
+    parser.add_argument("--stripes", type=int, default=65536)
+    parser.add_argument("--generate-only", action="store_true", help="time the generator alone")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    log.set_level(log.SUMMARY)
+    array = RaidArray(num_disks=args.disks, num_stripes=args.stripes)
+    workload = Workload(array.capacity, distribution=args.distribution, read_ratio=args.read_ratio,
+                        rewrite_ratio=args.rewrite_ratio, d0_only_ratio=args.d0_only, d1_only_ratio=args.d1_only,
+                        zipf_s=args.zipf_s, seed=args.seed)
+
+    start = time.perf_counter()
+    if args.generate_only:
+        generated = sum(len(ops) for ops, _, _ in workload.chunks(args.requests))
+        elapsed = time.perf_counter() - start
+        print(f"⚡ Generated {generated:,} requests in {elapsed:.2f} s ({generated / elapsed:,.0f} requests/s)")
+        return
+
+    previous_level = log.set_level(log.QUIET)
+    try:
+        workload.apply(array, args.requests)
+    finally:
+        log.set_level(previous_level)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {args.requests:,} {args.distribution} requests in {elapsed:.2f} s "
+          f"({args.requests / elapsed:,.0f} requests/s)")
+    for disk in range(array.num_disks):
+        print(f"Disk {disk}: {array.read_count_per_disk[disk]:,} reads, {array.write_count_per_disk[disk]:,} writes")
+    print(f"Data block writes skipped: {array.metrics.total(SKIPPED_WRITE):,}")
+
+
+if __name__ == "__main__":
+    main()